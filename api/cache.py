@@ -0,0 +1,233 @@
+## Caché de resultados de /limpiar direccionada por contenido: la clave es un hash
+# de la configuración canónica más los bytes del payload. Un acierto devuelve el
+# reporte (y la descarga completa, si se pidió) sin volver a ejecutar pandas.
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import AsyncIterator, Callable, Optional
+
+from limpieza import LimpiezaConfigSchema
+
+
+def clave_cache(config: LimpiezaConfigSchema, cuerpo: bytes, formato: Optional[str] = None) -> str:
+    """Hash BLAKE2b (128 bits) de la config canónica, el formato de respuesta y el payload."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(json.dumps(config.model_dump(mode="json"), sort_keys=True).encode("utf-8"))
+    h.update(b"\0" + (formato or "json").encode("ascii") + b"\0")
+    h.update(cuerpo)
+    return h.hexdigest()
+
+
+@dataclass
+class EntradaCache:
+    """Respuesta ya serializada: contenido, media type y headers."""
+
+    contenido: bytes
+    media_type: str
+    headers: dict[str, str] = field(default_factory=dict)
+    expira: float = 0.0
+
+    @property
+    def tamano(self) -> int:
+        return len(self.contenido) + sum(len(k) + len(v) for k, v in self.headers.items())
+
+
+# -------------------------------------------------
+# 1) Nivel en disco (opcional)
+# -------------------------------------------------
+class _NivelDisco:
+    """
+    Archivos <clave>.cache con: largo del encabezado (4 bytes), encabezado JSON
+    (media type, headers, expiración) y el contenido. Se respeta 'max_bytes'
+    borrando los archivos más antiguos.
+    """
+
+    def __init__(self, directorio: str | os.PathLike[str], max_bytes: int) -> None:
+        self.directorio = Path(directorio)
+        self.directorio.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+    def _ruta(self, clave: str) -> Path:
+        return self.directorio / f"{clave}.cache"
+
+    def guardar(self, clave: str, entrada: EntradaCache) -> None:
+        if entrada.tamano > self.max_bytes:
+            return
+        encabezado = json.dumps(
+            {"media_type": entrada.media_type, "headers": entrada.headers, "expira": entrada.expira}
+        ).encode("utf-8")
+        temporal = self._ruta(clave).with_suffix(".tmp")
+        with open(temporal, "wb") as f:
+            f.write(struct.pack("<I", len(encabezado)))
+            f.write(encabezado)
+            f.write(entrada.contenido)
+        os.replace(temporal, self._ruta(clave))
+        self._recortar()
+
+    def obtener(self, clave: str) -> Optional[EntradaCache]:
+        ruta = self._ruta(clave)
+        try:
+            datos = ruta.read_bytes()
+        except FileNotFoundError:
+            return None
+
+        (largo,) = struct.unpack_from("<I", datos)
+        encabezado = json.loads(datos[4 : 4 + largo])
+        if encabezado["expira"] < time.time():
+            ruta.unlink(missing_ok=True)
+            return None
+        return EntradaCache(
+            contenido=datos[4 + largo :],
+            media_type=encabezado["media_type"],
+            headers=encabezado["headers"],
+            expira=encabezado["expira"],
+        )
+
+    def _recortar(self) -> None:
+        archivos = sorted(self.directorio.glob("*.cache"), key=lambda r: r.stat().st_mtime)
+        total = sum(r.stat().st_size for r in archivos)
+        for ruta in archivos:
+            if total <= self.max_bytes:
+                break
+            total -= ruta.stat().st_size
+            ruta.unlink(missing_ok=True)
+
+
+# -------------------------------------------------
+# 2) Caché LRU en memoria
+# -------------------------------------------------
+class CacheResultados:
+    """
+    LRU acotada por bytes y con TTL; las entradas desalojadas de memoria pasan
+    al nivel en disco si se configuró 'directorio'.
+
+    - max_bytes: tamaño máximo en memoria (0 desactiva la caché)
+    - ttl_s: segundos de vida de cada entrada
+    - directorio / max_bytes_disco: nivel en disco opcional
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 256 * 1024 * 1024,
+        ttl_s: float = 600.0,
+        directorio: Optional[str | os.PathLike[str]] = None,
+        max_bytes_disco: int = 1024 * 1024 * 1024,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.ttl_s = ttl_s
+        self.disco = _NivelDisco(directorio, max_bytes_disco) if directorio else None
+        self._entradas: OrderedDict[str, EntradaCache] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.aciertos_disco = 0
+        self.fallos = 0
+        self.desalojos = 0
+
+    @classmethod
+    def desde_entorno(cls) -> "CacheResultados":
+        """LIMPIEZA_CACHE_MB, LIMPIEZA_CACHE_TTL_S, LIMPIEZA_CACHE_DIR y LIMPIEZA_CACHE_DISCO_MB."""
+        return cls(
+            max_bytes=int(float(os.environ.get("LIMPIEZA_CACHE_MB", 256)) * 1024 * 1024),
+            ttl_s=float(os.environ.get("LIMPIEZA_CACHE_TTL_S", 600)),
+            directorio=os.environ.get("LIMPIEZA_CACHE_DIR") or None,
+            max_bytes_disco=int(float(os.environ.get("LIMPIEZA_CACHE_DISCO_MB", 1024)) * 1024 * 1024),
+        )
+
+    @property
+    def activa(self) -> bool:
+        return self.max_bytes > 0
+
+    def obtener(self, clave: str) -> Optional[EntradaCache]:
+        ahora = time.time()
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is not None and entrada.expira < ahora:
+                self._quitar(clave)
+                entrada = None
+            if entrada is not None:
+                self._entradas.move_to_end(clave)
+                self.aciertos += 1
+                return entrada
+
+        entrada = self.disco.obtener(clave) if self.disco is not None else None
+        with self._lock:
+            if entrada is None:
+                self.fallos += 1
+                return None
+            self.aciertos_disco += 1
+        self._insertar(clave, entrada)
+        return entrada
+
+    def guardar(self, clave: str, contenido: bytes, media_type: str, headers: Optional[dict[str, str]] = None) -> None:
+        entrada = EntradaCache(contenido, media_type, dict(headers or {}), expira=time.time() + self.ttl_s)
+        if not self.activa or entrada.tamano > self.max_bytes:
+            return
+        self._insertar(clave, entrada)
+
+    def _insertar(self, clave: str, entrada: EntradaCache) -> None:
+        desalojadas = []
+        with self._lock:
+            if clave in self._entradas:
+                self._quitar(clave)
+            self._entradas[clave] = entrada
+            self._bytes += entrada.tamano
+            while self._bytes > self.max_bytes:
+                clave_vieja, vieja = self._entradas.popitem(last=False)
+                self._bytes -= vieja.tamano
+                self.desalojos += 1
+                desalojadas.append((clave_vieja, vieja))
+
+        # Escritura a disco fuera del lock
+        if self.disco is not None:
+            for clave_vieja, vieja in desalojadas:
+                if vieja.expira >= time.time():
+                    self.disco.guardar(clave_vieja, vieja)
+
+    def _quitar(self, clave: str) -> None:
+        self._bytes -= self._entradas.pop(clave).tamano
+
+    def estadisticas(self) -> dict[str, int | float]:
+        with self._lock:
+            consultas = self.aciertos + self.aciertos_disco + self.fallos
+            return {
+                "aciertos": self.aciertos,
+                "aciertos_disco": self.aciertos_disco,
+                "fallos": self.fallos,
+                "tasa_aciertos": round((self.aciertos + self.aciertos_disco) / consultas, 4) if consultas else 0.0,
+                "desalojos": self.desalojos,
+                "entradas": len(self._entradas),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+async def guardar_al_terminar(
+    partes: AsyncIterator[bytes], al_terminar: Callable[[bytes], None], max_bytes: int
+) -> AsyncIterator[bytes]:
+    """
+    Reenvía una respuesta en streaming y, si termina completa y no supera
+    'max_bytes', entrega el contenido total a 'al_terminar' (para la caché).
+    """
+    acumulado: Optional[list[bytes]] = []
+    total = 0
+    async for parte in partes:
+        if acumulado is not None:
+            total += len(parte)
+            if total <= max_bytes:
+                acumulado.append(parte)
+            else:
+                acumulado = None
+        yield parte
+
+    if acumulado is not None:
+        al_terminar(b"".join(acumulado))
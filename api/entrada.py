@@ -0,0 +1,73 @@
+## Lectura de cuerpos crudos para /limpiar/stream: CSV o NDJSON,
+# opcionalmente comprimidos con gzip, sin crear un dict de Python por fila.
+
+from __future__ import annotations
+
+import zlib
+from typing import IO, Optional
+
+import pandas as pd
+from starlette.requests import Request
+
+from limpieza.arrow_io import leer_csv_arrow
+
+try:  # con pyarrow el NDJSON se parsea de forma columnar
+    import pyarrow  # noqa: F401
+
+    MOTOR_JSON = "pyarrow"
+except ImportError:  # pragma: no cover
+    MOTOR_JSON = "ujson"
+
+## Content-Type aceptados y su formato
+FORMATOS = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "application/x-jsonlines": "ndjson",
+}
+
+
+def formato_desde_content_type(content_type: Optional[str]) -> Optional[str]:
+    """'csv', 'ndjson' o None si el Content-Type no es soportado."""
+    if not content_type:
+        return None
+    return FORMATOS.get(content_type.split(";")[0].strip().lower())
+
+
+async def volcar_cuerpo(request: Request, destino: IO[bytes], gzip: bool = False) -> int:
+    """
+    Copia el cuerpo del request por trozos en 'destino', descomprimiendo
+    gzip al vuelo. Retorna el número de bytes escritos (ya descomprimidos).
+    """
+    descompresor = zlib.decompressobj(16 + zlib.MAX_WBITS) if gzip else None
+    escritos = 0
+
+    async for trozo in request.stream():
+        if descompresor is not None:
+            trozo = descompresor.decompress(trozo)
+        escritos += destino.write(trozo)
+
+    if descompresor is not None:
+        escritos += destino.write(descompresor.flush())
+
+    destino.seek(0)
+    return escritos
+
+
+def leer_tabla(archivo: IO[bytes], formato: str, backend: str = "numpy") -> pd.DataFrame:
+    """
+    Parsea el cuerpo con lectores columnares (CSV de pandas/pyarrow, JSON de pyarrow).
+    """
+    if formato == "csv":
+        if backend == "arrow":
+            return leer_csv_arrow(archivo)
+        return pd.read_csv(archivo, encoding="utf-8")
+
+    if MOTOR_JSON == "pyarrow":
+        if backend == "arrow":
+            return pd.read_json(archivo, lines=True, engine="pyarrow", dtype_backend="pyarrow")
+        return pd.read_json(archivo, lines=True, engine="pyarrow")
+
+    return pd.read_json(archivo, lines=True)
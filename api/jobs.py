@@ -0,0 +1,291 @@
+## Trabajos de limpieza asíncronos: cada trabajo corre DataCleaner en un pool
+# acotado de procesos, fuera del proceso de la API (no bloquea el GIL del servidor).
+# Los datos viajan como archivos Arrow IPC (memory-map en el worker), no como
+# DataFrames serializados con pickle: al worker solo se le pasan rutas y la config.
+# Solo las columnas object (tipos mezclados desde JSON) van aparte con pickle, sin
+# convertir, para que el worker limpie exactamente el mismo DataFrame que /limpiar.
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Optional
+from uuid import uuid4
+
+import pandas as pd
+from pydantic import BaseModel, Field
+
+from limpieza import DataCleaner, LimpiezaConfigSchema, LimpiezaEstadoSchema, LimpiezaReporteSchema
+from limpieza.arrow_io import escribir_arrow_ipc, leer_arrow_ipc, requerir_pyarrow
+
+MEDIA_TYPE_ARROW = "application/vnd.apache.arrow.file"
+
+
+## La cola de trabajos está llena (la API responde 429)
+class ColaLlenaError(Exception):
+    pass
+
+
+## se define el contrato de salida de GET /jobs/{id}
+class TrabajoSchema(BaseModel):
+    """Estado de un trabajo de limpieza."""
+
+    id: str = Field(..., description="Identificador del trabajo.")
+    estado: str = Field(
+        ...,
+        description="Estado del trabajo.",
+        pattern="^(pendiente|completado|error)$",
+        examples=["pendiente"],
+    )
+    creado: datetime = Field(..., description="Momento en que se recibió el trabajo (UTC).")
+    finalizado: Optional[datetime] = Field(default=None, description="Momento en que terminó (UTC).")
+    reporte: Optional[LimpiezaReporteSchema] = Field(
+        default=None, description="Reporte de limpieza (cuando el trabajo está completado)."
+    )
+    error: Optional[str] = Field(default=None, description="Mensaje de error (cuando falló).")
+
+
+# -------------------------------------------------
+# 1) Entrada del worker
+# -------------------------------------------------
+def _ruta_objetos(ruta_entrada: str | os.PathLike[str]) -> Path:
+    return Path(ruta_entrada).with_suffix(".pkl")
+
+
+def escribir_entrada(df: pd.DataFrame, ruta_entrada: str | os.PathLike[str]) -> None:
+    """
+    Escribe la entrada de un trabajo: columnas tipadas en Arrow IPC y columnas object
+    (ej: [3, "3", None, "n/d"]) tal cual en '<entrada>.pkl'. Arrow las convertiría
+    a texto y la limpieza cambiaría (ej: otra mediana que en /limpiar).
+    """
+    objetos = [col for col in df.columns if df[col].dtype == object]
+    escribir_arrow_ipc(df.drop(columns=objetos), ruta_entrada)
+    if objetos:
+        pd.to_pickle({"columnas": list(df.columns), "objetos": df[objetos]}, _ruta_objetos(ruta_entrada))
+
+
+def leer_entrada(ruta_entrada: str | os.PathLike[str], backend: str = "numpy") -> pd.DataFrame:
+    """Lee la entrada escrita con escribir_entrada (mismas columnas y orden que el DataFrame original)."""
+    df = leer_arrow_ipc(ruta_entrada, backend=backend)
+    ruta_objetos = _ruta_objetos(ruta_entrada)
+    if not ruta_objetos.exists():
+        return df
+    guardado = pd.read_pickle(ruta_objetos)
+    objetos = guardado["objetos"].set_axis(df.index)
+    return pd.concat([df, objetos], axis=1)[guardado["columnas"]]
+
+
+def borrar_entrada(ruta_entrada: str | os.PathLike[str]) -> None:
+    Path(ruta_entrada).unlink(missing_ok=True)
+    _ruta_objetos(ruta_entrada).unlink(missing_ok=True)
+
+
+# -------------------------------------------------
+# 2) Ejecución en el worker
+# -------------------------------------------------
+def ejecutar_trabajo(
+    ruta_entrada: str,
+    ruta_salida: str,
+    config: dict[str, Any],
+    estado: Optional[dict[str, Any]],
+    formato_preview: str,
+) -> LimpiezaReporteSchema:
+    """
+    Corre en un proceso del pool: lee la entrada (Arrow IPC con memory-map), limpia
+    y escribe la salida en Arrow IPC. Solo el reporte vuelve al proceso de la API.
+    """
+    config_validada = LimpiezaConfigSchema.model_validate(config)
+    if estado is not None:
+        cleaner = DataCleaner(estado=LimpiezaEstadoSchema.model_validate(estado))
+    else:
+        cleaner = DataCleaner(config=config_validada)
+
+    try:
+        df = leer_entrada(ruta_entrada, backend=config_validada.backend)
+        df_out, reporte = cleaner.run_with_report(df, preview_rows=5, formato_preview=formato_preview)
+        escribir_arrow_ipc(df_out, ruta_salida)
+        del df
+    finally:
+        borrar_entrada(ruta_entrada)
+    return reporte
+
+
+# -------------------------------------------------
+# 3) Registro de trabajos
+# -------------------------------------------------
+class GestorTrabajos:
+    """
+    Mantiene el pool de procesos y el estado de los trabajos enviados.
+
+    - max_workers: procesos del pool (LIMPIEZA_JOBS_WORKERS; por defecto min(4, CPUs))
+    - max_pendientes: trabajos en cola o en ejecución antes de rechazar nuevos
+    - directorio_base: dónde se crea la carpeta temporal con entradas y resultados
+      Arrow IPC (LIMPIEZA_JOBS_DIR; por defecto el directorio temporal del sistema)
+    - max_terminados / ttl_s: los trabajos terminados (y sus resultados) se borran
+      pasadas ttl_s segundos o cuando hay más de max_terminados, los más antiguos
+      primero (LIMPIEZA_JOBS_MAX_TERMINADOS, LIMPIEZA_JOBS_TTL_S; 100 y 1 hora)
+
+    Si un worker muere (OOM, segfault), sus trabajos quedan en "error" y el pool
+    se reemplaza en el siguiente envío.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_pendientes: Optional[int] = None,
+        directorio_base: Optional[str | os.PathLike[str]] = None,
+        max_terminados: Optional[int] = None,
+        ttl_s: Optional[float] = None,
+    ) -> None:
+        self.max_workers = max_workers or int(
+            os.environ.get("LIMPIEZA_JOBS_WORKERS", min(4, os.cpu_count() or 1))
+        )
+        self.max_pendientes = max_pendientes or 8 * self.max_workers
+        self.directorio_base = directorio_base or os.environ.get("LIMPIEZA_JOBS_DIR")
+        self.max_terminados = max_terminados or int(os.environ.get("LIMPIEZA_JOBS_MAX_TERMINADOS", 100))
+        self.ttl_s = ttl_s or float(os.environ.get("LIMPIEZA_JOBS_TTL_S", 3600))
+        self._directorio: Optional[Path] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._trabajos: dict[str, TrabajoSchema] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def directorio(self) -> Path:
+        if self._directorio is None:
+            if self.directorio_base:
+                Path(self.directorio_base).mkdir(parents=True, exist_ok=True)
+            self._directorio = Path(tempfile.mkdtemp(prefix="limpieza_jobs_", dir=self.directorio_base))
+        return self._directorio
+
+    def _obtener_pool(self) -> ProcessPoolExecutor:
+        # "spawn": no se hereda el estado (hilos, sockets) del servidor
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._pool
+
+    def _descartar_pool(self, pool: ProcessPoolExecutor) -> None:
+        """Quita un pool roto (murió un worker); el próximo envío crea uno nuevo."""
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _encolar(self, *args: Any) -> Future:
+        pool = self._obtener_pool()
+        try:
+            return pool.submit(ejecutar_trabajo, *args)
+        except BrokenProcessPool:
+            self._descartar_pool(pool)
+            return self._obtener_pool().submit(ejecutar_trabajo, *args)
+
+    def pendientes(self) -> int:
+        with self._lock:
+            return sum(t.estado == "pendiente" for t in self._trabajos.values())
+
+    def enviar(
+        self,
+        df: pd.DataFrame,
+        config: LimpiezaConfigSchema,
+        estado: Optional[LimpiezaEstadoSchema] = None,
+        formato_preview: str = "records",
+    ) -> TrabajoSchema:
+        """
+        Escribe la entrada (escribir_entrada) y encola el trabajo en el pool.
+        Lanza ColaLlenaError si la cola está llena.
+        """
+        requerir_pyarrow()
+        self._purgar()
+        if self.pendientes() >= self.max_pendientes:
+            raise ColaLlenaError(f"Hay {self.max_pendientes} trabajos pendientes; intente más tarde.")
+
+        trabajo = TrabajoSchema(id=uuid4().hex, estado="pendiente", creado=datetime.now(timezone.utc))
+        ruta_entrada = self.ruta_entrada(trabajo.id)
+        escribir_entrada(df, ruta_entrada)
+
+        try:
+            futuro = self._encolar(
+                str(ruta_entrada),
+                str(self.ruta_resultado(trabajo.id)),
+                config.model_dump(),
+                estado.model_dump() if estado is not None else None,
+                formato_preview,
+            )
+        except BaseException:
+            borrar_entrada(ruta_entrada)
+            raise
+
+        # Se registra antes del callback: si el trabajo ya terminó, el callback corre aquí mismo
+        with self._lock:
+            self._trabajos[trabajo.id] = trabajo
+        futuro.add_done_callback(lambda f, id_trabajo=trabajo.id: self._finalizar(id_trabajo, f))
+        return trabajo
+
+    def _finalizar(self, id_trabajo: str, futuro: Future) -> None:
+        error = None if futuro.cancelled() else futuro.exception()
+        with self._lock:
+            trabajo = self._trabajos.get(id_trabajo)
+            if trabajo is None:  # cerrar() ya limpió el registro
+                return
+            trabajo.finalizado = datetime.now(timezone.utc)
+            if futuro.cancelled():
+                trabajo.estado = "error"
+                trabajo.error = "Trabajo cancelado."
+            elif error is None:
+                trabajo.estado = "completado"
+                trabajo.reporte = futuro.result()
+            else:
+                trabajo.estado = "error"
+                trabajo.error = f"{type(error).__name__}: {error}"
+        # Si el worker murió, la entrada no alcanzó a borrarse en ejecutar_trabajo
+        if self._directorio is not None:
+            borrar_entrada(self.ruta_entrada(id_trabajo))
+        self._purgar()
+
+    def _purgar(self) -> None:
+        """Borra los trabajos terminados vencidos (ttl_s) o que exceden max_terminados."""
+        limite = datetime.now(timezone.utc) - timedelta(seconds=self.ttl_s)
+        with self._lock:
+            terminados = sorted(
+                (t for t in self._trabajos.values() if t.finalizado is not None), key=lambda t: t.finalizado
+            )
+            exceso = len(terminados) - self.max_terminados
+            borrar = [t.id for i, t in enumerate(terminados) if i < exceso or t.finalizado < limite]
+            for id_trabajo in borrar:
+                del self._trabajos[id_trabajo]
+        if self._directorio is not None:
+            for id_trabajo in borrar:
+                self.ruta_resultado(id_trabajo).unlink(missing_ok=True)
+
+    def obtener(self, id_trabajo: str) -> Optional[TrabajoSchema]:
+        with self._lock:
+            trabajo = self._trabajos.get(id_trabajo)
+            return trabajo.model_copy() if trabajo is not None else None
+
+    def ruta_entrada(self, id_trabajo: str) -> Path:
+        return self.directorio / f"{id_trabajo}.entrada.arrow"
+
+    def ruta_resultado(self, id_trabajo: str) -> Path:
+        return self.directorio / f"{id_trabajo}.arrow"
+
+    def cerrar(self) -> None:
+        """Detiene el pool y borra los archivos de entrada/resultado."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+        if self._directorio is not None:
+            shutil.rmtree(self._directorio, ignore_errors=True)
+            self._directorio = None
+        with self._lock:
+            self._trabajos.clear()
@@ -4,37 +4,526 @@
 
 from __future__ import annotations
 
-from typing import Any
+import hmac
+import os
+import tempfile
+import zlib
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Annotated, Any, Optional
 
 import pandas as pd
-from fastapi import FastAPI ##para crear la app
-from pydantic import BaseModel, Field
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request ##para crear la app
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, PlainTextResponse, Response
+from pydantic import BaseModel, Field, model_validator
 
-from limpieza import DataCleaner, LimpiezaConfigSchema, LimpiezaReporteSchema
+from api.cache import CacheResultados, clave_cache, guardar_al_terminar
+from api.entrada import FORMATOS, formato_desde_content_type, leer_tabla, volcar_cuerpo
+from api.jobs import MEDIA_TYPE_ARROW, ColaLlenaError, GestorTrabajos, TrabajoSchema
+from api.metricas import MEDIA_TYPE_PROMETHEUS, MetricasAPI, MiddlewareMetricas
+from api.perfilado import ARTEFACTOS, PATRON_MODOS, GestorPerfiles, ReportePerfiladoSchema, parsear_modos
+from api.salida import MEDIA_TYPES, negociar_formato, respuesta_descarga
+from limpieza.arrow_io import leer_arrow_ipc
+from limpieza.dedup import IndiceDedup
+from limpieza.instrumentacion import MedidorEtapas
+from limpieza import DataCleaner, LimpiezaConfigSchema, LimpiezaEstadoSchema, LimpiezaReporteSchema
 
-app = FastAPI(title="API Limpieza - Proyecto")
+## Estados ajustados (DataCleaner.fit) disponibles por id.
+# Se cargan al iniciar desde los JSON de LIMPIEZA_ESTADOS_DIR.
+ESTADOS: dict[str, LimpiezaEstadoSchema] = {}
+
+## Índice persistente de duplicados entre lotes (config.dedup_entre_lotes).
+# Se abre al iniciar desde el archivo LIMPIEZA_DEDUP_INDICE.
+INDICE_DEDUP: Optional[IndiceDedup] = None
+
+## Caché de resultados de /limpiar (LIMPIEZA_CACHE_MB=0 la desactiva).
+CACHE = CacheResultados.desde_entorno()
+
+## Trabajos asíncronos (POST /jobs): pool de procesos creado al primer envío.
+TRABAJOS = GestorTrabajos()
+
+## Métricas en memoria del proceso (GET /metrics, formato Prometheus).
+METRICAS = MetricasAPI()
+
+## Perfiles de /limpiar (solo administradores: header X-Admin-Token = LIMPIEZA_ADMIN_TOKEN).
+PERFILES = GestorPerfiles()
+
+
+def cargar_estados(directorio: str | os.PathLike[str]) -> dict[str, LimpiezaEstadoSchema]:
+    """Lee todos los estados *.json de un directorio."""
+    estados = {}
+    for ruta in sorted(Path(directorio).glob("*.json")):
+        estado = LimpiezaEstadoSchema.model_validate_json(ruta.read_text(encoding="utf-8"))
+        estados[estado.id] = estado
+    return estados
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global INDICE_DEDUP
+
+    directorio = os.environ.get("LIMPIEZA_ESTADOS_DIR")
+    if directorio:
+        ESTADOS.update(cargar_estados(directorio))
+
+    ruta_indice = os.environ.get("LIMPIEZA_DEDUP_INDICE")
+    if ruta_indice:
+        INDICE_DEDUP = IndiceDedup(ruta_indice)
+
+    yield
+
+    TRABAJOS.cerrar()
+    if INDICE_DEDUP is not None:
+        INDICE_DEDUP.cerrar()
+
+
+app = FastAPI(title="API Limpieza - Proyecto", lifespan=lifespan)
+app.add_middleware(MiddlewareMetricas, metricas=METRICAS)
 
 ## se define el contrato de entrada del endpoint
 class LimpiezaRequest(BaseModel):
     """
     Request para la API:
     - config: validado con tu LimpiezaConfigSchema
-    - data: lista de registros (cada registro es un dict)
+    - data: los registros en uno de tres formatos
+        * records:  [{"col": valor, ...}, ...]
+        * columnar: {"col": [valores...], ...}  (con 'columns' opcional para el orden)
+        * split:    [[valores...], ...]          (con 'columns' obligatorio, orient "split" de pandas)
+    - columns: nombres de columnas para los formatos columnar/split
+    - formato_preview: formato del preview de la respuesta (por defecto, el de entrada)
+
+    Los formatos columnar y split no repiten los nombres de columna en cada fila
+    y el DataFrame se arma directamente desde los arreglos, sin un dict por fila.
     """
     config: LimpiezaConfigSchema = Field(default_factory=LimpiezaConfigSchema)
-    data: list[dict[str, Any]] = Field(..., min_length=1)
+    columns: Optional[list[str]] = Field(
+        default=None,
+        description="Nombres de columnas (formatos columnar y split).",
+        examples=[["valor", "area"]],
+    )
+    data: list[dict[str, Any]] | dict[str, list[Any]] | list[list[Any]] = Field(..., min_length=1)
+    index: Optional[list[Any]] = Field(
+        default=None,
+        description="Índice del orient 'split' de pandas; se acepta y se ignora.",
+    )
+    formato_preview: Optional[str] = Field(
+        default=None,
+        description="Formato del preview: records, columnar o split. Por defecto, el de 'data'.",
+        pattern="^(records|columnar|split)$",
+        examples=["columnar"],
+    )
+    etapas: bool = Field(
+        default=False,
+        description="Agrega al reporte el tiempo, las filas y las celdas afectadas por cada etapa.",
+    )
+    etapas_memoria: bool = Field(
+        default=False,
+        description="Con 'etapas', mide también el pico de memoria por etapa (tracemalloc; más lento).",
+    )
+    perfilar: Optional[str] = Field(
+        default=None,
+        description=(
+            "Perfila la limpieza (solo administradores): cprofile, muestreo y/o memoria, "
+            "separados por coma. Equivale al header X-Perfilar."
+        ),
+        pattern=PATRON_MODOS,
+        examples=["cprofile,muestreo"],
+    )
+
+    @property
+    def formato(self) -> str:
+        if isinstance(self.data, dict):
+            return "columnar"
+        if isinstance(self.data[0], dict):
+            return "records"
+        return "split"
+
+    @property
+    def n_filas(self) -> int:
+        if self.formato == "columnar":
+            return len(next(iter(self.data.values())))
+        return len(self.data)
+
+    @model_validator(mode="after")
+    def validar_forma(self) -> "LimpiezaRequest":
+        if self.formato == "columnar":
+            longitudes = {len(valores) for valores in self.data.values()}
+            if len(longitudes) > 1:
+                raise ValueError("En formato columnar todas las columnas deben tener el mismo largo.")
+            if self.columns is not None and set(self.columns) != set(self.data):
+                raise ValueError("'columns' no coincide con las claves de 'data'.")
+            if longitudes == {0}:
+                raise ValueError("'data' no tiene filas.")
+
+        elif self.formato == "split":
+            if self.columns is None:
+                raise ValueError("El formato split requiere 'columns'.")
+            if any(len(fila) != len(self.columns) for fila in self.data):
+                raise ValueError("Cada fila de 'data' debe tener tantos valores como 'columns'.")
+
+        return self
+
+    def a_dataframe(self) -> pd.DataFrame:
+        """DataFrame desde los arreglos recibidos (columnar/split) o los registros."""
+        if self.formato == "records":
+            return pd.DataFrame(self.data)
+        return pd.DataFrame(self.data, columns=self.columns)
+
+
+def buscar_estado(config: LimpiezaConfigSchema) -> LimpiezaEstadoSchema | None:
+    """Estado ajustado indicado por config.estado_id (404 si no existe)."""
+    if config.estado_id is None:
+        return None
+
+    estado = ESTADOS.get(config.estado_id)
+    if estado is None:
+        raise HTTPException(status_code=404, detail=f"Estado '{config.estado_id}' no encontrado.")
+    return estado
+
+
+def crear_cleaner(config: LimpiezaConfigSchema) -> DataCleaner:
+    """
+    Crea el DataCleaner del request: con estado ajustado si se indica estado_id
+    (sin estadísticas en cada request) o con la configuración recibida.
+    """
+    indice_dedup = None
+    if config.dedup_entre_lotes:
+        if INDICE_DEDUP is None:
+            raise HTTPException(
+                status_code=400,
+                detail="dedup_entre_lotes requiere un índice configurado con LIMPIEZA_DEDUP_INDICE.",
+            )
+        indice_dedup = INDICE_DEDUP
+
+    estado = buscar_estado(config)
+    if estado is None:
+        return DataCleaner(config=config, indice_dedup=indice_dedup)
+    return DataCleaner(estado=estado, indice_dedup=indice_dedup)
 
 #
 
-@app.post("/limpiar", response_model=LimpiezaReporteSchema)
-def limpiar(request: LimpiezaRequest) -> LimpiezaReporteSchema:
-    df = pd.DataFrame(request.data)
+## Respuestas alternativas al reporte JSON: el dataset limpio completo
+RESPUESTAS_DESCARGA = {
+    200: {
+        "description": "Reporte JSON o, si se pide un formato de descarga, el dataset limpio completo.",
+        "content": {media_type: {} for media_type in MEDIA_TYPES.values()},
+    }
+}
+
+FormatoDescarga = Annotated[
+    Optional[str],
+    Query(
+        description="Descarga el dataset limpio completo: parquet, arrow (IPC stream) o csv.",
+        pattern="^(parquet|arrow|csv)$",
+    ),
+]
+
+
+def descargar(df_out: pd.DataFrame, formato: str, reporte: LimpiezaReporteSchema, nombre: str) -> Response:
+    """Dataset limpio en streaming; los conteos del reporte van en headers."""
+    try:
+        return respuesta_descarga(
+            df_out,
+            formato,
+            nombre=nombre,
+            headers={
+                "X-Filas-Entrada": str(reporte.n_filas_entrada),
+                "X-Filas-Salida": str(reporte.n_filas_salida),
+            },
+        )
+    except ImportError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+
+
+async def cuerpo_crudo(request: Request) -> bytes:
+    """Bytes del cuerpo tal como llegaron (Starlette ya los leyó para validar el JSON)."""
+    return await request.body()
+
+
+def requerir_admin(token: Optional[str]) -> None:
+    """403 si el token no coincide con LIMPIEZA_ADMIN_TOKEN (o si no está configurado)."""
+    esperado = os.environ.get("LIMPIEZA_ADMIN_TOKEN")
+    if not esperado or token is None or not hmac.compare_digest(token.encode(), esperado.encode()):
+        raise HTTPException(status_code=403, detail="Se requiere un token de administrador (X-Admin-Token).")
+
+
+def crear_medidor(etapas: bool, memoria: bool = False) -> MedidorEtapas:
+    """
+    Medidor de la limpieza: completo si el request pide las etapas en el reporte;
+    si no, solo tiempos (para limpieza_etapa_segundos), sin recorrer los nulos.
+    """
+    if etapas:
+        return MedidorEtapas(memoria=memoria)
+    return MedidorEtapas(conteos=False)
+
+
+def respuesta_cacheada(entrada, estado_cache: str) -> Response:
+    return Response(
+        content=entrada.contenido,
+        media_type=entrada.media_type,
+        headers={**entrada.headers, "X-Cache": estado_cache},
+    )
+
+
+@app.post("/limpiar", response_model=LimpiezaReporteSchema, responses=RESPUESTAS_DESCARGA)
+def limpiar(
+    request: LimpiezaRequest,
+    cuerpo: Annotated[bytes, Depends(cuerpo_crudo)],
+    formato: FormatoDescarga = None,
+    accept: Annotated[Optional[str], Header()] = None,
+    x_perfilar: Annotated[Optional[str], Header(pattern=PATRON_MODOS)] = None,
+    x_admin_token: Annotated[Optional[str], Header()] = None,
+) -> LimpiezaReporteSchema | Response:
+    """
+    Limpia los datos y devuelve el reporte. Con ?formato= o un header Accept de
+    Parquet / Arrow IPC stream / CSV devuelve el dataset limpio completo.
+
+    Las respuestas se guardan en CACHE: si llega de nuevo el mismo payload con la
+    misma configuración, se responde desde la caché sin ejecutar la limpieza.
+
+    Con 'perfilar' (o el header X-Perfilar) y un token de administrador, la limpieza
+    corre bajo el perfilador: el reporte incluye el resumen 'perfil' y los artefactos
+    quedan en GET /perfiles/{id}/{artefacto} (header X-Perfil-Id en las descargas).
+    """
+    modos_perfil = request.perfilar or x_perfilar
+    if modos_perfil:
+        requerir_admin(x_admin_token)
+
+    formato_descarga = negociar_formato(formato, accept)
+    clave = clave_cache(request.config, cuerpo, formato_descarga)
+    # Con dedup entre lotes la respuesta depende de los lotes anteriores; las
+    # métricas por etapa y los perfiles son de cada ejecución: no se cachean
+    usar_cache = (
+        CACHE.activa and not request.config.dedup_entre_lotes and not request.etapas and not modos_perfil
+    )
 
-    cleaner = DataCleaner(config=request.config)
-    _, reporte = cleaner.run_with_report(df, preview_rows=5)
+    METRICAS.observar_payload("/limpiar", request.n_filas, len(cuerpo))
+
+    if usar_cache:
+        entrada = CACHE.obtener(clave)
+        if entrada is not None:
+            return respuesta_cacheada(entrada, "HIT")
+
+    df = request.a_dataframe()
+
+    cleaner = crear_cleaner(request.config)
+    medidor = crear_medidor(request.etapas, request.etapas_memoria)
+    opciones = dict(
+        preview_rows=5,
+        formato_preview=request.formato_preview or request.formato,
+        etapas=request.etapas,
+        memoria=request.etapas and request.etapas_memoria,
+        medidor=medidor,
+    )
+    if modos_perfil:
+        try:
+            (df_out, reporte), perfil = PERFILES.perfilar(
+                parsear_modos(modos_perfil), cleaner.run_with_report, df, **opciones
+            )
+        except RuntimeError as e:
+            raise HTTPException(status_code=429, detail=str(e))
+    else:
+        df_out, reporte = cleaner.run_with_report(df, **opciones)
+    METRICAS.observar_etapas(medidor.etapas)
+
+    if modos_perfil:
+        if formato_descarga is not None:
+            respuesta = descargar(df_out, formato_descarga, reporte, nombre="data_limpia")
+            respuesta.headers["X-Perfil-Id"] = perfil.id
+            return respuesta
+        reporte = ReportePerfiladoSchema(**dict(reporte), perfil=perfil)
+        return Response(content=reporte.model_dump_json(), media_type="application/json")
+
+    if formato_descarga is None:
+        contenido = reporte.model_dump_json().encode("utf-8")
+        if usar_cache:
+            CACHE.guardar(clave, contenido, "application/json")
+        return Response(content=contenido, media_type="application/json", headers={"X-Cache": "MISS"})
+
+    respuesta = descargar(df_out, formato_descarga, reporte, nombre="data_limpia")
+    respuesta.headers["X-Cache"] = "MISS"
+    if usar_cache:
+        headers = {k: v for k, v in respuesta.headers.items() if k.lower() not in ("x-cache", "content-type")}
+        respuesta.body_iterator = guardar_al_terminar(
+            respuesta.body_iterator,
+            lambda contenido: CACHE.guardar(clave, contenido, respuesta.media_type, headers),
+            max_bytes=CACHE.max_bytes,
+        )
+    return respuesta
+
+
+@app.get("/perfiles/{id_perfil}/{artefacto}", response_class=FileResponse)
+def artefacto_perfil(
+    id_perfil: str,
+    artefacto: str,
+    x_admin_token: Annotated[Optional[str], Header()] = None,
+) -> FileResponse:
+    """
+    Artefacto de un perfil de /limpiar (solo administradores): 'pstats' (pstats.Stats,
+    snakeviz), 'colapsado' (pilas para flamegraph.pl o speedscope) o 'memoria'.
+    """
+    requerir_admin(x_admin_token)
+    ruta = PERFILES.ruta_artefacto(id_perfil, artefacto)
+    if ruta is None:
+        raise HTTPException(status_code=404, detail=f"Artefacto '{artefacto}' del perfil '{id_perfil}' no encontrado.")
+    media_type = "application/octet-stream" if artefacto == "pstats" else "text/plain; charset=utf-8"
+    return FileResponse(ruta, media_type=media_type, filename=f"{id_perfil}.{ARTEFACTOS[artefacto]}")
+
+
+@app.get("/cache")
+def estadisticas_cache():
+    """Contadores de la caché de /limpiar (aciertos, fallos, desalojos, bytes)."""
+    return CACHE.estadisticas()
+
+
+## Cuerpos hasta este tamaño se mantienen en memoria; los mayores pasan a disco.
+MAX_CUERPO_EN_MEMORIA = 16 * 1024 * 1024
+
+
+class ParametrosStream(LimpiezaConfigSchema):
+    """Query de /limpiar/stream: la configuración de limpieza más las opciones del reporte."""
+
+    etapas: bool = Field(default=False, description="Agrega al reporte las métricas de cada etapa.")
+
+
+@app.post(
+    "/limpiar/stream",
+    response_model=LimpiezaReporteSchema,
+    responses=RESPUESTAS_DESCARGA,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {tipo: {"schema": {"type": "string"}} for tipo in FORMATOS},
+        }
+    },
+)
+async def limpiar_stream(
+    request: Request,
+    parametros: Annotated[ParametrosStream, Query()],
+) -> LimpiezaReporteSchema | Response:
+    """
+    Igual que /limpiar pero recibe el archivo crudo (CSV o NDJSON, opcionalmente
+    con Content-Encoding: gzip) y la configuración como parámetros de query.
+    El cuerpo se copia por trozos a un archivo temporal y se parsea en columnas,
+    sin construir una lista de dicts. El header Accept permite descargar el
+    dataset limpio completo (Parquet, Arrow IPC stream o CSV).
+    """
+    formato = formato_desde_content_type(request.headers.get("content-type"))
+    if formato is None:
+        raise HTTPException(
+            status_code=415,
+            detail=f"Content-Type no soportado. Use uno de: {', '.join(FORMATOS)}.",
+        )
+
+    config = LimpiezaConfigSchema.model_validate(parametros.model_dump(exclude={"etapas"}))
+    cleaner = crear_cleaner(config)
+    gzip = "gzip" in request.headers.get("content-encoding", "").lower()
+
+    with tempfile.SpooledTemporaryFile(max_size=MAX_CUERPO_EN_MEMORIA) as archivo:
+        try:
+            n_bytes = await volcar_cuerpo(request, archivo, gzip=gzip)
+        except zlib.error as e:
+            raise HTTPException(status_code=400, detail=f"Cuerpo gzip inválido: {e}")
+
+        if n_bytes == 0:
+            raise HTTPException(status_code=422, detail="El cuerpo está vacío.")
+
+        try:
+            df = await run_in_threadpool(leer_tabla, archivo, formato, config.backend)
+        except (ValueError, pd.errors.ParserError) as e:
+            raise HTTPException(status_code=422, detail=f"No se pudo leer el {formato.upper()}: {e}")
+
+    if df.empty:
+        raise HTTPException(status_code=422, detail="El archivo no tiene filas.")
+    METRICAS.observar_payload("/limpiar/stream", len(df), n_bytes)
+
+    medidor = crear_medidor(parametros.etapas)
+    df_out, reporte = await run_in_threadpool(
+        cleaner.run_with_report, df, 5, etapas=parametros.etapas, medidor=medidor
+    )
+    METRICAS.observar_etapas(medidor.etapas)
+
+    formato_descarga = negociar_formato(None, request.headers.get("accept"))
+    if formato_descarga is not None:
+        return descargar(df_out, formato_descarga, reporte, nombre="data_limpia")
 
     return reporte
 
+# -------------------------------------------------
+# Trabajos asíncronos
+# -------------------------------------------------
+@app.post("/jobs", response_model=TrabajoSchema, status_code=202)
+async def crear_trabajo(request: LimpiezaRequest) -> TrabajoSchema:
+    """
+    Encola la limpieza en el pool de procesos y retorna de inmediato el id del trabajo.
+    Consulte el estado en GET /jobs/{id} y el resultado en GET /jobs/{id}/result.
+    """
+    if request.config.dedup_entre_lotes:
+        raise HTTPException(
+            status_code=400,
+            detail="dedup_entre_lotes no está disponible en /jobs: use /limpiar o /limpiar/stream.",
+        )
+
+    estado = buscar_estado(request.config)
+    df = request.a_dataframe()
+
+    try:
+        return await run_in_threadpool(
+            TRABAJOS.enviar,
+            df,
+            request.config,
+            estado,
+            request.formato_preview or request.formato,
+        )
+    except ColaLlenaError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except ImportError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    except (RuntimeError, OSError) as e:
+        raise HTTPException(status_code=503, detail=f"No se pudo encolar el trabajo: {e}")
+
+
+def obtener_trabajo(id_trabajo: str) -> TrabajoSchema:
+    trabajo = TRABAJOS.obtener(id_trabajo)
+    if trabajo is None:
+        raise HTTPException(status_code=404, detail=f"Trabajo '{id_trabajo}' no encontrado.")
+    return trabajo
+
+
+@app.get("/jobs/{id_trabajo}", response_model=TrabajoSchema)
+def estado_trabajo(id_trabajo: str) -> TrabajoSchema:
+    return obtener_trabajo(id_trabajo)
+
+
+@app.get("/jobs/{id_trabajo}/result", response_class=FileResponse, responses=RESPUESTAS_DESCARGA)
+def resultado_trabajo(
+    id_trabajo: str,
+    formato: FormatoDescarga = None,
+    accept: Annotated[Optional[str], Header()] = None,
+) -> Response:
+    """
+    Dataset limpio completo: por defecto el archivo Arrow IPC (Feather v2) del trabajo;
+    con ?formato= o Accept, en Parquet, Arrow IPC stream o CSV.
+    """
+    trabajo = obtener_trabajo(id_trabajo)
+    if trabajo.estado == "error":
+        raise HTTPException(status_code=409, detail=f"El trabajo falló: {trabajo.error}")
+    if trabajo.estado != "completado":
+        raise HTTPException(status_code=409, detail="El trabajo aún no ha terminado.")
+
+    formato_descarga = negociar_formato(formato, accept)
+    if formato_descarga is not None:
+        # Memory-map del resultado: las columnas se leen del archivo a medida que se codifican
+        df_out = leer_arrow_ipc(TRABAJOS.ruta_resultado(id_trabajo), backend="arrow")
+        return descargar(df_out, formato_descarga, trabajo.reporte, nombre=id_trabajo)
+
+    return FileResponse(
+        TRABAJOS.ruta_resultado(id_trabajo),
+        media_type=MEDIA_TYPE_ARROW,
+        filename=f"{id_trabajo}.arrow",
+    )
+
 ## Devuelve un mensaje simple indicando que la API está viva 
 # y que revises /docs
 @app.get("/")
@@ -42,6 +531,20 @@ def root():
     return {"message": "API de limpieza activa. Ve a /docs"}
 
 
+@app.get("/estados")
+def listar_estados():
+    return {"estados": sorted(ESTADOS)}
+
+
 @app.get("/health")
 def health():
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metricas() -> PlainTextResponse:
+    """
+    Métricas en formato de texto de Prometheus: solicitudes por ruta/método/estado,
+    latencia, solicitudes en curso, filas y bytes recibidos y duración por etapa.
+    """
+    return PlainTextResponse(METRICAS.exponer(), media_type=MEDIA_TYPE_PROMETHEUS)
\ No newline at end of file
@@ -0,0 +1,227 @@
+## Métricas de la API en formato de texto de Prometheus (GET /metrics), sin
+# dependencias externas: contadores, gauges e histogramas en memoria del proceso.
+# Cada serie tiene su propio lock y la actualización es una suma, así que el costo
+# por request es de unos pocos microsegundos.
+
+from __future__ import annotations
+
+import bisect
+import math
+import threading
+import time
+from typing import Iterable, Optional, Sequence
+
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from limpieza.schemas import EtapaReporteSchema
+
+MEDIA_TYPE_PROMETHEUS = "text/plain; version=0.0.4; charset=utf-8"
+
+## Buckets por defecto
+BUCKETS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+BUCKETS_FILAS = (10, 100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+BUCKETS_BYTES = tuple(1024 * 4**k for k in range(11))  # 1 KiB ... 1 GiB
+
+
+def _etiquetas(nombres: Sequence[str], valores: Sequence[str], extra: str = "") -> str:
+    pares = [f'{n}="{_escapar(v)}"' for n, v in zip(nombres, valores)]
+    if extra:
+        pares.append(extra)
+    return "{" + ",".join(pares) + "}" if pares else ""
+
+
+def _escapar(valor: str) -> str:
+    return str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _numero(valor: float) -> str:
+    if math.isinf(valor):
+        return "+Inf" if valor > 0 else "-Inf"
+    return repr(float(valor)) if not float(valor).is_integer() else str(int(valor))
+
+
+# -------------------------------------------------
+# 1) Tipos de métrica
+# -------------------------------------------------
+class _Metrica:
+    tipo = ""
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: Sequence[str] = ()) -> None:
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas = tuple(etiquetas)
+        self._series: dict[tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _serie(self, valores: tuple[str, ...]):
+        serie = self._series.get(valores)
+        if serie is None:
+            with self._lock:
+                serie = self._series.setdefault(valores, self._nueva_serie())
+        return serie
+
+    def _nueva_serie(self):
+        raise NotImplementedError
+
+    def exponer(self) -> Iterable[str]:
+        yield f"# HELP {self.nombre} {self.ayuda}"
+        yield f"# TYPE {self.nombre} {self.tipo}"
+        for valores, serie in sorted(self._series.items()):
+            yield from self._lineas(valores, serie)
+
+    def _lineas(self, valores, serie) -> Iterable[str]:
+        raise NotImplementedError
+
+
+class _Valor:
+    __slots__ = ("valor", "lock")
+
+    def __init__(self) -> None:
+        self.valor = 0.0
+        self.lock = threading.Lock()
+
+    def sumar(self, cantidad: float) -> None:
+        with self.lock:
+            self.valor += cantidad
+
+
+class Contador(_Metrica):
+    tipo = "counter"
+
+    def _nueva_serie(self) -> _Valor:
+        return _Valor()
+
+    def incrementar(self, *valores: str, cantidad: float = 1.0) -> None:
+        self._serie(valores).sumar(cantidad)
+
+    def _lineas(self, valores, serie) -> Iterable[str]:
+        yield f"{self.nombre}{_etiquetas(self.etiquetas, valores)} {_numero(serie.valor)}"
+
+
+class Gauge(Contador):
+    tipo = "gauge"
+
+    def decrementar(self, *valores: str, cantidad: float = 1.0) -> None:
+        self._serie(valores).sumar(-cantidad)
+
+
+class _SerieHistograma:
+    __slots__ = ("conteos", "suma", "lock")
+
+    def __init__(self, n_buckets: int) -> None:
+        self.conteos = [0] * (n_buckets + 1)  # el último es +Inf
+        self.suma = 0.0
+        self.lock = threading.Lock()
+
+
+class Histograma(_Metrica):
+    tipo = "histogram"
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: Sequence[str] = (), buckets: Sequence[float] = BUCKETS_LATENCIA) -> None:
+        super().__init__(nombre, ayuda, etiquetas)
+        self.buckets = tuple(sorted(buckets))
+
+    def _nueva_serie(self) -> _SerieHistograma:
+        return _SerieHistograma(len(self.buckets))
+
+    def observar(self, valor: float, *valores: str) -> None:
+        serie = self._serie(valores)
+        i = bisect.bisect_left(self.buckets, valor)
+        with serie.lock:
+            serie.conteos[i] += 1
+            serie.suma += valor
+
+    def _lineas(self, valores, serie) -> Iterable[str]:
+        with serie.lock:
+            conteos, suma = list(serie.conteos), serie.suma
+        acumulado = 0
+        for limite, conteo in zip((*self.buckets, math.inf), conteos):
+            acumulado += conteo
+            le = f'le="{_numero(limite)}"'
+            yield f"{self.nombre}_bucket{_etiquetas(self.etiquetas, valores, le)} {acumulado}"
+        yield f"{self.nombre}_sum{_etiquetas(self.etiquetas, valores)} {_numero(suma)}"
+        yield f"{self.nombre}_count{_etiquetas(self.etiquetas, valores)} {acumulado}"
+
+
+# -------------------------------------------------
+# 2) Métricas de la API
+# -------------------------------------------------
+class MetricasAPI:
+    """Registro de las métricas que expone GET /metrics."""
+
+    def __init__(self) -> None:
+        self.solicitudes = Contador(
+            "limpieza_http_solicitudes_total", "Solicitudes HTTP atendidas.", ("ruta", "metodo", "estado")
+        )
+        self.latencia = Histograma(
+            "limpieza_http_latencia_segundos", "Latencia de las solicitudes HTTP (hasta el último byte).", ("ruta",)
+        )
+        self.en_curso = Gauge("limpieza_http_en_curso", "Solicitudes HTTP en curso.", ("ruta",))
+        self.filas = Histograma(
+            "limpieza_payload_filas", "Filas recibidas por solicitud de limpieza.", ("ruta",), BUCKETS_FILAS
+        )
+        self.bytes = Histograma(
+            "limpieza_payload_bytes", "Bytes del cuerpo por solicitud de limpieza.", ("ruta",), BUCKETS_BYTES
+        )
+        self.etapas = Histograma("limpieza_etapa_segundos", "Duración de cada etapa del pipeline.", ("etapa",))
+        self._metricas = [self.solicitudes, self.latencia, self.en_curso, self.filas, self.bytes, self.etapas]
+
+    def observar_payload(self, ruta: str, filas: int, n_bytes: int) -> None:
+        self.filas.observar(filas, ruta)
+        self.bytes.observar(n_bytes, ruta)
+
+    def observar_etapas(self, etapas: Optional[Iterable[EtapaReporteSchema]]) -> None:
+        for etapa in etapas or ():
+            self.etapas.observar(etapa.tiempo_s, etapa.nombre)
+
+    def exponer(self) -> str:
+        return "\n".join(linea for metrica in self._metricas for linea in metrica.exponer()) + "\n"
+
+
+def plantilla_ruta(scope: Scope) -> str:
+    """
+    Plantilla de la ruta del request (ej: /jobs/{id_trabajo}), no el path concreto:
+    así las etiquetas no crecen con cada id. Paths sin ruta -> 'sin_ruta'.
+    """
+    app = scope.get("app")
+    for route in getattr(getattr(app, "router", None), "routes", ()):
+        coincidencia, _ = route.matches(scope)
+        if coincidencia != Match.NONE:
+            return getattr(route, "path", "sin_ruta")
+    return "sin_ruta"
+
+
+class MiddlewareMetricas:
+    """
+    Middleware ASGI: cuenta solicitudes por ruta, método y estado, mide la latencia
+    hasta el último byte (incluye las respuestas en streaming) y las solicitudes en curso.
+    """
+
+    def __init__(self, app: ASGIApp, metricas: MetricasAPI, excluir: Sequence[str] = ("/metrics",)) -> None:
+        self.app = app
+        self.metricas = metricas
+        self.excluir = set(excluir)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.excluir:
+            await self.app(scope, receive, send)
+            return
+
+        estado = 500  # si la app falla antes de responder
+        ruta = plantilla_ruta(scope)
+        self.metricas.en_curso.incrementar(ruta)
+
+        async def enviar(mensaje: Message) -> None:
+            nonlocal estado
+            if mensaje["type"] == "http.response.start":
+                estado = mensaje["status"]
+            await send(mensaje)
+
+        inicio = time.perf_counter()
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            self.metricas.en_curso.decrementar(ruta)
+            self.metricas.latencia.observar(time.perf_counter() - inicio, ruta)
+            self.metricas.solicitudes.incrementar(ruta, scope["method"], str(estado))
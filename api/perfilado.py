@@ -0,0 +1,295 @@
+## Perfilado bajo demanda de /limpiar (solo administradores): ejecuta la limpieza
+# con cProfile, un muestreador de pilas y/o tracemalloc, guarda los artefactos
+# (pstats, pilas colapsadas para flamegraph, asignaciones de memoria) y devuelve
+# un resumen junto al reporte.
+
+from __future__ import annotations
+
+import cProfile
+import os
+import pstats
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+from typing import Any, Optional
+from uuid import uuid4
+
+from pydantic import BaseModel, Field
+
+from limpieza import LimpiezaReporteSchema
+from limpieza.instrumentacion import BLOQUEO_MEMORIA
+
+MODOS = ("cprofile", "muestreo", "memoria")
+PATRON_MODOS = r"^(cprofile|muestreo|memoria)(,(cprofile|muestreo|memoria))*$"
+
+## Archivo de cada artefacto: <id>.<extensión>
+ARTEFACTOS = {
+    "pstats": "pstats",  # pstats.Stats(ruta) / snakeviz
+    "colapsado": "colapsado.txt",  # flamegraph.pl / speedscope
+    "memoria": "memoria.txt",  # top de asignaciones por línea
+}
+
+INTERVALO_MUESTREO_S = 0.005
+TOP_FUNCIONES = 20
+TOP_ASIGNACIONES = 10
+
+
+## se define el contrato del resumen del perfil
+class FuncionPerfilSchema(BaseModel):
+    funcion: str = Field(..., description="módulo:línea(función).", examples=["limpieza/pipeline.py:120(imputar_nulos)"])
+    llamadas: int = Field(..., ge=0, description="Número de llamadas.")
+    tiempo_propio_s: float = Field(..., ge=0, description="Tiempo en la función sin contar las llamadas internas.")
+    tiempo_acumulado_s: float = Field(..., ge=0, description="Tiempo incluyendo las funciones llamadas.")
+
+
+class AsignacionPerfilSchema(BaseModel):
+    lugar: str = Field(..., description="archivo:línea donde se asignó la memoria.")
+    bytes: int = Field(..., ge=0, description="Memoria aún asignada al terminar.")
+    bloques: int = Field(..., ge=0, description="Bloques asignados.")
+
+
+class PerfilSchema(BaseModel):
+    """Resumen del perfil de una limpieza; los detalles están en los artefactos."""
+
+    id: str = Field(..., description="Identificador del perfil (GET /perfiles/{id}/{artefacto}).")
+    modos: list[str] = Field(..., description="Perfiladores usados.", examples=[["cprofile", "memoria"]])
+    tiempo_s: float = Field(..., ge=0, description="Tiempo de pared de la limpieza perfilada.")
+    funciones: list[FuncionPerfilSchema] = Field(
+        default_factory=list, description="Funciones con mayor tiempo acumulado (cprofile)."
+    )
+    muestras: Optional[int] = Field(default=None, ge=0, description="Pilas muestreadas (muestreo).")
+    memoria_pico_bytes: Optional[int] = Field(default=None, ge=0, description="Pico de memoria (memoria).")
+    asignaciones: list[AsignacionPerfilSchema] = Field(
+        default_factory=list, description="Líneas con más memoria asignada al terminar (memoria)."
+    )
+    artefactos: list[str] = Field(default_factory=list, description="Artefactos descargables.")
+
+
+class ReportePerfiladoSchema(LimpiezaReporteSchema):
+    """Reporte de limpieza más el resumen del perfil."""
+
+    perfil: PerfilSchema
+
+
+def parsear_modos(modos: str) -> list[str]:
+    """'cprofile,memoria' -> ['cprofile', 'memoria'] (sin repetidos, en el orden de MODOS)."""
+    pedidos = {m.strip() for m in modos.split(",") if m.strip()}
+    desconocidos = pedidos - set(MODOS)
+    if desconocidos or not pedidos:
+        raise ValueError(f"Modos de perfilado válidos: {', '.join(MODOS)}.")
+    return [m for m in MODOS if m in pedidos]
+
+
+# -------------------------------------------------
+# 1) Muestreador de pilas
+# -------------------------------------------------
+def _nombre_marco(marco: FrameType) -> str:
+    codigo = marco.f_code
+    return f"{marco.f_globals.get('__name__', '?')}.{codigo.co_qualname}"
+
+
+class MuestreadorPilas:
+    """
+    Cada 'intervalo' segundos toma la pila del hilo perfilado desde otro hilo
+    (sys._current_frames) y cuenta las pilas colapsadas "a;b;c". No instrumenta
+    las llamadas, así que casi no altera los tiempos (a diferencia de cProfile).
+    """
+
+    def __init__(self, id_hilo: int, intervalo: float = INTERVALO_MUESTREO_S) -> None:
+        self.id_hilo = id_hilo
+        self.intervalo = intervalo
+        self.pilas: Counter[str] = Counter()
+        self._detener = threading.Event()
+        self._hilo = threading.Thread(target=self._muestrear, name="muestreador_pilas", daemon=True)
+
+    def _muestrear(self) -> None:
+        while not self._detener.wait(self.intervalo):
+            marco = sys._current_frames().get(self.id_hilo)
+            nombres = []
+            while marco is not None:
+                nombres.append(_nombre_marco(marco))
+                marco = marco.f_back
+            if nombres:
+                self.pilas[";".join(reversed(nombres))] += 1
+
+    def iniciar(self) -> None:
+        self._hilo.start()
+
+    def detener(self) -> None:
+        self._detener.set()
+        self._hilo.join()
+
+    @property
+    def muestras(self) -> int:
+        return sum(self.pilas.values())
+
+    def colapsado(self) -> str:
+        return "".join(f"{pila} {n}\n" for pila, n in self.pilas.most_common())
+
+
+# -------------------------------------------------
+# 2) Perfilador de una ejecución
+# -------------------------------------------------
+class Perfilador:
+    """
+    Context manager que perfila el hilo actual con los modos pedidos:
+    - cprofile: llamadas y tiempos por función (pstats)
+    - muestreo: pilas colapsadas cada INTERVALO_MUESTREO_S (flamegraph)
+    - memoria: tracemalloc (pico y asignaciones por línea; hace la limpieza más lenta)
+
+    Con n_jobs > 1 solo se perfila el hilo del request, no los fragmentos paralelos.
+    """
+
+    def __init__(self, modos: list[str]) -> None:
+        self.modos = modos
+        self.tiempo_s = 0.0
+        self._cprofile: Optional[cProfile.Profile] = None
+        self._muestreador: Optional[MuestreadorPilas] = None
+        self._snapshot: Optional[tracemalloc.Snapshot] = None
+        self._pico_memoria: Optional[int] = None
+        self._inicio_tracemalloc = False
+        self._bloqueado = False
+        self._inicio = 0.0
+
+    def __enter__(self) -> "Perfilador":
+        if "memoria" in self.modos:
+            # Compartido con MedidorEtapas(memoria=True): tracemalloc es global al proceso
+            BLOQUEO_MEMORIA.acquire()
+            self._bloqueado = True
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._inicio_tracemalloc = True
+            tracemalloc.reset_peak()
+        if "muestreo" in self.modos:
+            self._muestreador = MuestreadorPilas(threading.get_ident())
+            self._muestreador.iniciar()
+        if "cprofile" in self.modos:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        self._inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.tiempo_s = time.perf_counter() - self._inicio
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        if self._muestreador is not None:
+            self._muestreador.detener()
+        if "memoria" in self.modos and tracemalloc.is_tracing():
+            self._pico_memoria = tracemalloc.get_traced_memory()[1]
+            self._snapshot = tracemalloc.take_snapshot()
+            if self._inicio_tracemalloc:
+                tracemalloc.stop()
+                self._inicio_tracemalloc = False
+        if self._bloqueado:
+            self._bloqueado = False
+            BLOQUEO_MEMORIA.release()
+
+    def guardar(self, directorio: Path, id_perfil: str) -> PerfilSchema:
+        """Escribe los artefactos en 'directorio' y retorna el resumen."""
+        perfil = PerfilSchema(id=id_perfil, modos=self.modos, tiempo_s=round(self.tiempo_s, 6))
+
+        if self._cprofile is not None:
+            ruta = directorio / f"{id_perfil}.{ARTEFACTOS['pstats']}"
+            self._cprofile.dump_stats(ruta)
+            estadisticas = pstats.Stats(str(ruta)).stats
+            mayores = sorted(estadisticas.items(), key=lambda item: item[1][3], reverse=True)[:TOP_FUNCIONES]
+            perfil.funciones = [
+                FuncionPerfilSchema(
+                    funcion=pstats.func_std_string(funcion),
+                    llamadas=llamadas,
+                    tiempo_propio_s=round(propio, 6),
+                    tiempo_acumulado_s=round(acumulado, 6),
+                )
+                for funcion, (_, llamadas, propio, acumulado, _) in mayores
+            ]
+            perfil.artefactos.append("pstats")
+
+        if self._muestreador is not None:
+            (directorio / f"{id_perfil}.{ARTEFACTOS['colapsado']}").write_text(
+                self._muestreador.colapsado(), encoding="utf-8"
+            )
+            perfil.muestras = self._muestreador.muestras
+            perfil.artefactos.append("colapsado")
+
+        if self._snapshot is not None:
+            lineas = self._snapshot.statistics("lineno")
+            (directorio / f"{id_perfil}.{ARTEFACTOS['memoria']}").write_text(
+                f"pico: {self._pico_memoria} bytes\n" + "".join(f"{linea}\n" for linea in lineas[:100]),
+                encoding="utf-8",
+            )
+            perfil.memoria_pico_bytes = self._pico_memoria
+            perfil.asignaciones = [
+                AsignacionPerfilSchema(lugar=str(linea.traceback[0]), bytes=linea.size, bloques=linea.count)
+                for linea in lineas[:TOP_ASIGNACIONES]
+            ]
+            perfil.artefactos.append("memoria")
+
+        return perfil
+
+
+# -------------------------------------------------
+# 3) Registro de perfiles
+# -------------------------------------------------
+class GestorPerfiles:
+    """
+    Guarda los artefactos de los perfiles en disco y conserva solo los más recientes.
+
+    - directorio_base: dónde se crea la carpeta de perfiles (LIMPIEZA_PERFILES_DIR;
+      por defecto el directorio temporal del sistema)
+    - max_perfiles: perfiles conservados; los más antiguos se borran
+
+    Se perfila un request a la vez: tracemalloc es global al proceso.
+    """
+
+    def __init__(self, directorio_base: Optional[str | os.PathLike[str]] = None, max_perfiles: int = 50) -> None:
+        self.directorio_base = directorio_base or os.environ.get("LIMPIEZA_PERFILES_DIR")
+        self.max_perfiles = max_perfiles
+        self._directorio: Optional[Path] = None
+        self._perfiles: list[str] = []
+        self._ocupado = threading.Lock()
+
+    @property
+    def directorio(self) -> Path:
+        if self._directorio is None:
+            if self.directorio_base:
+                self._directorio = Path(self.directorio_base)
+                self._directorio.mkdir(parents=True, exist_ok=True)
+            else:
+                self._directorio = Path(tempfile.mkdtemp(prefix="limpieza_perfiles_"))
+        return self._directorio
+
+    def perfilar(self, modos: list[str], funcion, *args: Any, **kwargs: Any) -> tuple[Any, PerfilSchema]:
+        """
+        Ejecuta funcion(*args, **kwargs) bajo el perfilador y guarda sus artefactos.
+        Lanza RuntimeError si ya hay un request perfilándose.
+        """
+        if not self._ocupado.acquire(blocking=False):
+            raise RuntimeError("Ya hay una limpieza perfilándose; intente más tarde.")
+        try:
+            with Perfilador(modos) as perfilador:
+                resultado = funcion(*args, **kwargs)
+            id_perfil = uuid4().hex
+            perfil = perfilador.guardar(self.directorio, id_perfil)
+            self._registrar(id_perfil)
+        finally:
+            self._ocupado.release()
+        return resultado, perfil
+
+    def _registrar(self, id_perfil: str) -> None:
+        self._perfiles.append(id_perfil)
+        while len(self._perfiles) > self.max_perfiles:
+            antiguo = self._perfiles.pop(0)
+            for extension in ARTEFACTOS.values():
+                (self.directorio / f"{antiguo}.{extension}").unlink(missing_ok=True)
+
+    def ruta_artefacto(self, id_perfil: str, artefacto: str) -> Optional[Path]:
+        if id_perfil not in self._perfiles or artefacto not in ARTEFACTOS:
+            return None
+        ruta = self.directorio / f"{id_perfil}.{ARTEFACTOS[artefacto]}"
+        return ruta if ruta.exists() else None
@@ -0,0 +1,136 @@
+## Descarga del dataset limpio completo como respuesta en streaming:
+# Parquet, Arrow IPC stream o CSV por bloques. Los bytes se generan por tramos
+# de filas, sin armar una segunda copia completa del DataFrame en memoria.
+
+from __future__ import annotations
+
+from typing import Iterator, Optional
+
+import pandas as pd
+from fastapi.responses import StreamingResponse
+
+from limpieza.arrow_io import iterar_lotes_arrow
+
+try:  # pyarrow es opcional: solo necesario para parquet/arrow
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover
+    pa_ipc = None
+
+## Formato -> media type de la respuesta
+MEDIA_TYPES = {
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "csv": "text/csv",
+}
+
+## Media types aceptados en el header Accept
+_ACCEPT = {
+    "application/vnd.apache.parquet": "parquet",
+    "application/x-parquet": "parquet",
+    "application/vnd.apache.arrow.stream": "arrow",
+    "text/csv": "csv",
+}
+
+_EXTENSIONES = {"parquet": "parquet", "arrow": "arrows", "csv": "csv"}
+
+FILAS_POR_BLOQUE = 65_536
+
+
+def negociar_formato(formato: Optional[str], accept: Optional[str]) -> Optional[str]:
+    """
+    Formato de descarga pedido: el parámetro 'formato' tiene prioridad; si no,
+    el primer media type soportado del header Accept. None -> reporte JSON.
+    """
+    if formato:
+        return formato
+    for parte in (accept or "").split(","):
+        encontrado = _ACCEPT.get(parte.split(";")[0].strip().lower())
+        if encontrado:
+            return encontrado
+    return None
+
+
+# -------------------------------------------------
+# 1) Codificadores por bloques
+# -------------------------------------------------
+class _Destino:
+    """Archivo de solo escritura que acumula lo escrito hasta que se retira."""
+
+    def __init__(self) -> None:
+        self._partes: list[bytes] = []
+        self._posicion = 0
+        self.closed = False
+
+    def write(self, datos) -> int:
+        datos = bytes(datos)
+        self._partes.append(datos)
+        self._posicion += len(datos)
+        return len(datos)
+
+    def tell(self) -> int:
+        return self._posicion
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def retirar(self) -> bytes:
+        datos = b"".join(self._partes)
+        self._partes.clear()
+        return datos
+
+
+def iterar_csv(df: pd.DataFrame, filas_por_bloque: int = FILAS_POR_BLOQUE) -> Iterator[bytes]:
+    for inicio in range(0, max(len(df), 1), filas_por_bloque):
+        tramo = df.iloc[inicio : inicio + filas_por_bloque]
+        yield tramo.to_csv(index=False, header=inicio == 0).encode("utf-8")
+
+
+def iterar_arrow(df: pd.DataFrame, filas_por_bloque: int = FILAS_POR_BLOQUE) -> Iterator[bytes]:
+    esquema, lotes = iterar_lotes_arrow(df, filas_por_bloque)
+    destino = _Destino()
+    with pa_ipc.new_stream(destino, esquema) as escritor:
+        for lote in lotes:
+            escritor.write_batch(lote)
+            yield destino.retirar()
+    yield destino.retirar()
+
+
+def iterar_parquet(df: pd.DataFrame, filas_por_bloque: int = FILAS_POR_BLOQUE) -> Iterator[bytes]:
+    # Cada bloque se escribe como un row group
+    esquema, lotes = iterar_lotes_arrow(df, filas_por_bloque)
+    destino = _Destino()
+    with pq.ParquetWriter(destino, esquema) as escritor:
+        for lote in lotes:
+            escritor.write_batch(lote)
+            yield destino.retirar()
+    yield destino.retirar()
+
+
+_CODIFICADORES = {"parquet": iterar_parquet, "arrow": iterar_arrow, "csv": iterar_csv}
+
+
+# -------------------------------------------------
+# 2) Respuesta
+# -------------------------------------------------
+def respuesta_descarga(
+    df: pd.DataFrame,
+    formato: str,
+    nombre: str = "data_limpia",
+    headers: Optional[dict[str, str]] = None,
+) -> StreamingResponse:
+    """StreamingResponse con el DataFrame completo en el formato indicado."""
+    if formato != "csv" and pa_ipc is None:
+        raise ImportError(f"El formato '{formato}' requiere pyarrow: pip install pyarrow")
+
+    return StreamingResponse(
+        _CODIFICADORES[formato](df),
+        media_type=MEDIA_TYPES[formato],
+        headers={
+            "Content-Disposition": f'attachment; filename="{nombre}.{_EXTENSIONES[formato]}"',
+            **(headers or {}),
+        },
+    )
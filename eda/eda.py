@@ -1,6 +1,15 @@
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 
 
 # -------------------------------------------------
@@ -44,27 +53,58 @@ def histograma_robusto(
     No modifica los datos originales.
     """
 
-    s = serie.dropna()
+    histograma = calcular_histograma(serie, bins, p_low, p_high)
 
-    if len(s) < 2:
+    if histograma is None:
         print(f"{nombre}: no hay suficientes datos para graficar.")
         return
 
+    graficar_histograma(*histograma, nombre, p_low, p_high)
+
+
+def calcular_histograma(
+    serie: pd.Series,
+    bins: int = 30,
+    p_low: float = 0.01,
+    p_high: float = 0.99
+) -> Optional[tuple[np.ndarray, np.ndarray]]:
+    """Conteos y bordes (NumPy) del histograma recortado a p_low–p_high; None si hay menos de 2 datos."""
+    s = serie.dropna()
+
+    if len(s) < 2:
+        return None
+
     # Percentiles para recorte visual
     low = s.quantile(p_low)
     high = s.quantile(p_high)
 
     s_plot = s[(s >= low) & (s <= high)]
 
-    plt.figure()
-    plt.hist(s_plot, bins=bins)
-    plt.title(f"Distribución de {nombre} (p{int(p_low*100)}–p{int(p_high*100)})")
-    plt.xlabel(nombre)
-    plt.ylabel("Frecuencia")
-    plt.tight_layout()
+    return np.histogram(s_plot, bins=bins)
+
+
+def graficar_histograma(
+    conteos: np.ndarray,
+    bordes: np.ndarray,
+    nombre: str,
+    p_low: float = 0.01,
+    p_high: float = 0.99
+) -> None:
+    """Dibuja un histograma ya calculado (conteos por bin y bordes)."""
+    fig, ax = plt.subplots()
+    dibujar_histograma(ax, conteos, bordes, nombre, p_low, p_high)
+    fig.tight_layout()
     plt.show()
 
 
+def dibujar_histograma(ax, conteos, bordes, nombre: str, p_low: float = 0.01, p_high: float = 0.99) -> None:
+    """Dibuja el histograma en unos ejes de matplotlib (interactivos o de una Figure en disco)."""
+    ax.stairs(conteos, bordes, fill=True)
+    ax.set_title(f"Distribución de {nombre} (p{int(p_low*100)}–p{int(p_high*100)})")
+    ax.set_xlabel(nombre)
+    ax.set_ylabel("Frecuencia")
+
+
 # -------------------------------------------------
 # 4. Variables numéricas
 # -------------------------------------------------
@@ -127,22 +167,31 @@ def matriz_correlacion(df: pd.DataFrame, max_cols: int = 12) -> None:
         print("No hay suficientes variables numéricas para correlación.")
         return
 
-    corr = numericas.corr()
+    imprimir_correlacion(numericas.corr(), max_cols)
+
+
+def imprimir_correlacion(corr: pd.DataFrame, max_cols: int = 12) -> None:
+    """Imprime la matriz de correlación y la grafica si no tiene demasiadas columnas."""
     print(corr)
 
     if corr.shape[0] <= max_cols:
-        plt.figure()
-        plt.imshow(corr, aspect="auto")
-        plt.colorbar()
-        plt.xticks(range(corr.shape[1]), corr.columns, rotation=45, ha="right")
-        plt.yticks(range(corr.shape[0]), corr.index)
-        plt.title("Matriz de correlación (Pearson)")
-        plt.tight_layout()
+        fig, ax = plt.subplots()
+        dibujar_correlacion(fig, ax, corr)
+        fig.tight_layout()
         plt.show()
     else:
         print("Demasiadas variables para graficar matriz de correlación.")
 
 
+def dibujar_correlacion(fig, ax, corr: pd.DataFrame) -> None:
+    """Dibuja el mapa de calor de la correlación en unos ejes de matplotlib."""
+    imagen = ax.imshow(corr, aspect="auto")
+    fig.colorbar(imagen, ax=ax)
+    ax.set_xticks(range(corr.shape[1]), corr.columns, rotation=45, ha="right")
+    ax.set_yticks(range(corr.shape[0]), corr.index)
+    ax.set_title("Matriz de correlación (Pearson)")
+
+
 # -------------------------------------------------
 # 7. Ejecutar EDA completo
 # -------------------------------------------------
@@ -152,4 +201,695 @@ def ejecutar_eda(df: pd.DataFrame, graficar: bool = True) -> None:
     analizar_nulos(df)
     analizar_numericas(df, graficar=graficar)
     analizar_categoricas(df)
-    matriz_correlacion(df)
\ No newline at end of file
+    matriz_correlacion(df)
+
+
+# -------------------------------------------------
+# 8. Acumuladores combinables (EDA por bloques)
+# -------------------------------------------------
+# Cada acumulador se actualiza con un bloque y se puede combinar con otro
+# (mismo resultado que procesar los dos bloques juntos), así el CSV se recorre
+# una sola vez, por bloques, sin tenerlo completo en memoria.
+
+class SketchCuantiles:
+    """
+    Sketch KLL de cuantiles: niveles de valores ordenados donde cada valor del
+    nivel h representa 2**h valores originales. Al llenarse un nivel se ordena y
+    se promueve uno de cada dos valores. Error de rango ~1/k; mientras no hay
+    compactaciones (n pequeño) los cuantiles son exactos.
+    """
+
+    def __init__(self, k: int = 2000, semilla: int = 0):
+        self.k = k
+        self.n = 0
+        self.niveles = [np.empty(0)]
+        self._rng = np.random.default_rng(semilla)
+
+    def _capacidad(self, h: int) -> int:
+        return max(2, int(np.ceil(self.k * (2 / 3) ** (len(self.niveles) - 1 - h))))
+
+    def _compactar(self) -> None:
+        h = 0
+        while h < len(self.niveles):
+            nivel = self.niveles[h]
+            if len(nivel) > self._capacidad(h):
+                if h + 1 == len(self.niveles):
+                    self.niveles.append(np.empty(0))
+                nivel = np.sort(nivel)
+                # Con largo impar el último valor se queda en el nivel
+                resto = nivel[len(nivel) - len(nivel) % 2:]
+                promovidos = nivel[self._rng.integers(2): len(nivel) - len(resto): 2]
+                self.niveles[h + 1] = np.concatenate([self.niveles[h + 1], promovidos])
+                self.niveles[h] = resto
+            h += 1
+
+    def actualizar(self, valores: np.ndarray) -> None:
+        valores = valores[~np.isnan(valores)]
+        self.n += len(valores)
+        self.niveles[0] = np.concatenate([self.niveles[0], valores])
+        self._compactar()
+
+    def combinar(self, otro: "SketchCuantiles") -> None:
+        while len(self.niveles) < len(otro.niveles):
+            self.niveles.append(np.empty(0))
+        for h, nivel in enumerate(otro.niveles):
+            self.niveles[h] = np.concatenate([self.niveles[h], nivel])
+        self.n += otro.n
+        self._compactar()
+
+    def cuantiles(self, qs) -> np.ndarray:
+        qs = np.asarray(qs, dtype=float)
+        if self.n == 0:
+            return np.full(qs.shape, np.nan)
+        if len(self.niveles) == 1:
+            # Sin compactaciones: exacto (interpolación lineal, como Series.quantile)
+            return np.quantile(self.niveles[0], qs)
+
+        valores = np.concatenate(self.niveles)
+        pesos = np.concatenate([np.full(len(nivel), 2.0 ** h) for h, nivel in enumerate(self.niveles)])
+        orden = np.argsort(valores, kind="stable")
+        valores, acumulado = valores[orden], np.cumsum(pesos[orden])
+        posiciones = np.searchsorted(acumulado, qs * acumulado[-1], side="left")
+        return valores[np.minimum(posiciones, len(valores) - 1)]
+
+
+class HistogramaFijo:
+    """
+    Histograma de n_bins bins de ancho potencia de 2, alineados a múltiplos del
+    ancho (el bin j cubre [j * ancho, (j + 1) * ancho)). Si los datos no caben en
+    n_bins bins, el ancho se duplica (se suman pares de bins), así que no hace
+    falta conocer el rango antes de leer los datos y dos histogramas se combinan
+    llevándolos al mismo ancho.
+    """
+
+    def __init__(self, n_bins: int = 4096):
+        self.n_bins = n_bins
+        self.ancho = None
+        self.primero = 0  # índice del primer bin guardado
+        self.conteos = np.zeros(n_bins, dtype=np.int64)
+
+    def _ocupados(self) -> np.ndarray:
+        return self.primero + np.flatnonzero(self.conteos)
+
+    def _duplicar(self) -> None:
+        indices = np.arange(self.primero, self.primero + self.n_bins) // 2
+        self.primero //= 2
+        self.conteos = np.bincount(indices - self.primero, weights=self.conteos, minlength=self.n_bins)
+        self.conteos = self.conteos[: self.n_bins].astype(np.int64)
+        self.ancho *= 2
+
+    def _cubrir(self, minimo: float, maximo: float) -> None:
+        """Ajusta ancho y primer bin para que quepan los bins ocupados y [minimo, maximo]."""
+        if self.ancho is None:
+            amplitud = max(maximo - minimo, abs(minimo) * 1e-9, 1e-12)
+            self.ancho = 2.0 ** np.ceil(np.log2(amplitud / (self.n_bins - 1)))
+        while True:
+            ocupados = self._ocupados()
+            bajo = min([int(np.floor(minimo / self.ancho)), *ocupados[:1]])
+            alto = max([int(np.floor(maximo / self.ancho)), *ocupados[-1:]])
+            if alto - bajo < self.n_bins:
+                break
+            self._duplicar()
+        if bajo < self.primero or alto >= self.primero + self.n_bins:
+            desplazados = np.zeros(self.n_bins, dtype=np.int64)
+            desplazados[ocupados - bajo] = self.conteos[ocupados - self.primero]
+            self.primero, self.conteos = bajo, desplazados
+
+    def _sumar(self, indices: np.ndarray, pesos: Optional[np.ndarray] = None) -> None:
+        self.conteos += np.bincount(indices - self.primero, weights=pesos, minlength=self.n_bins).astype(np.int64)
+
+    def actualizar(self, valores: np.ndarray) -> None:
+        valores = valores[np.isfinite(valores)]
+        if len(valores) == 0:
+            return
+        self._cubrir(valores.min(), valores.max())
+        self._sumar(np.floor(valores / self.ancho).astype(np.int64))
+
+    def combinar(self, otro: "HistogramaFijo") -> None:
+        if otro.ancho is None:
+            return
+        otro = otro._copia()
+        if self.ancho is None:
+            self.ancho = otro.ancho
+        while self.ancho < otro.ancho:
+            self._duplicar()
+        while otro.ancho < self.ancho:
+            otro._duplicar()
+        ocupados = otro._ocupados()
+        self._cubrir(ocupados[0] * self.ancho, ocupados[-1] * self.ancho)
+        # _cubrir pudo duplicar el ancho de este histograma
+        while otro.ancho < self.ancho:
+            otro._duplicar()
+        ocupados = otro._ocupados()
+        self._sumar(ocupados, otro.conteos[ocupados - otro.primero])
+
+    def _copia(self) -> "HistogramaFijo":
+        copia = HistogramaFijo(self.n_bins)
+        copia.ancho, copia.primero, copia.conteos = self.ancho, self.primero, self.conteos.copy()
+        return copia
+
+    def rebinear(self, bajo: float, alto: float, bins: int = 30) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Histograma de 'bins' bins en [bajo, alto] a partir de los bins finos: cada
+        bin fino reparte su conteo según la parte de su ancho que cae en cada bin
+        (valores uniformes dentro del bin fino). Solo los bins finos cortados por
+        un borde se reparten de forma aproximada.
+        """
+        bordes = np.linspace(bajo, alto, bins + 1)
+        if self.ancho is None:
+            return np.zeros(bins, dtype=np.int64), bordes
+        # Conteo acumulado hasta cada borde, interpolado dentro del bin fino que lo contiene
+        acumulado = np.concatenate([[0], np.cumsum(self.conteos)])
+        posicion = np.clip(bordes / self.ancho - self.primero, 0, self.n_bins)
+        indice = np.minimum(np.floor(posicion).astype(np.int64), self.n_bins - 1)
+        hasta_borde = acumulado[indice] + (posicion - indice) * self.conteos[indice]
+        return np.rint(np.diff(hasta_borde)).astype(np.int64), bordes
+
+
+class DistribucionNumerica:
+    """
+    Distribución de una columna numérica: conteos exactos por valor mientras haya
+    a lo más 'max_exactos' valores distintos (cuantiles e histograma idénticos a
+    pandas) y, para columnas de muchos valores, el sketch KLL y el histograma fijo.
+    """
+
+    def __init__(self, max_exactos: int = 100_000, k: int = 2000, n_bins: int = 4096, semilla: int = 0):
+        self.max_exactos = max_exactos
+        self.exactos: Optional[pd.Series] = pd.Series(dtype="int64")
+        self.sketch = SketchCuantiles(k, semilla)
+        self.histograma = HistogramaFijo(n_bins)
+
+    def _sumar_exactos(self, conteos: Optional[pd.Series]) -> None:
+        if self.exactos is None or conteos is None:
+            self.exactos = None
+            return
+        self.exactos = self.exactos.add(conteos, fill_value=0).astype("int64")
+        if len(self.exactos) > self.max_exactos:
+            self.exactos = None
+
+    def actualizar(self, valores: np.ndarray) -> None:
+        valores = valores[~np.isnan(valores)]
+        if self.exactos is not None:
+            self._sumar_exactos(pd.Series(valores).value_counts())
+        self.sketch.actualizar(valores)
+        self.histograma.actualizar(valores)
+
+    def combinar(self, otro: "DistribucionNumerica") -> None:
+        self._sumar_exactos(otro.exactos)
+        self.sketch.combinar(otro.sketch)
+        self.histograma.combinar(otro.histograma)
+
+    def cuantiles(self, qs) -> np.ndarray:
+        qs = np.asarray(qs, dtype=float)
+        if self.exactos is None:
+            return self.sketch.cuantiles(qs)
+        if len(self.exactos) == 0:
+            return np.full(qs.shape, np.nan)
+        # Interpolación lineal entre las posiciones floor/ceil de (n - 1) * q, como Series.quantile
+        valores = self.exactos.index.to_numpy(dtype="float64")
+        acumulado = np.cumsum(self.exactos.to_numpy())
+        posicion = (acumulado[-1] - 1) * qs
+        abajo = valores[np.searchsorted(acumulado, np.floor(posicion), side="right")]
+        arriba = valores[np.searchsorted(acumulado, np.ceil(posicion), side="right")]
+        return abajo + (arriba - abajo) * (posicion - np.floor(posicion))
+
+    def histograma_recortado(self, bajo: float, alto: float, bins: int = 30) -> tuple[np.ndarray, np.ndarray]:
+        """Histograma de los valores en [bajo, alto], con el rango de esos valores (como plt.hist)."""
+        if self.exactos is None:
+            return self.histograma.rebinear(bajo, alto, bins)
+        valores = self.exactos.index.to_numpy(dtype="float64")
+        dentro = (valores >= bajo) & (valores <= alto)
+        conteos, bordes = np.histogram(valores[dentro], bins=bins, weights=self.exactos.to_numpy()[dentro])
+        return conteos.astype(np.int64), bordes
+
+
+class FrecuentesMisraGries:
+    """
+    Conteos de categorías con a lo más 'capacidad' valores (Misra-Gries combinable):
+    si hay más, se resta a todos el conteo del valor capacidad+1 y se descartan los
+    que quedan en cero. Con menos valores distintos que 'capacidad' los conteos son
+    exactos; si no, cada conteo subestima a lo más 'error'.
+    """
+
+    def __init__(self, capacidad: int = 10_000):
+        self.capacidad = capacidad
+        self.conteos = pd.Series(dtype="int64")
+        self.error = 0
+
+    def _podar(self) -> None:
+        if len(self.conteos) <= self.capacidad:
+            return
+        corte = int(np.sort(self.conteos.to_numpy())[::-1][self.capacidad])
+        self.conteos = self.conteos[self.conteos > corte] - corte
+        self.error += corte
+
+    def _sumar(self, conteos: pd.Series) -> None:
+        # Conserva el orden de primera aparición (como value_counts en los empates)
+        existentes = conteos.index.isin(self.conteos.index)
+        self.conteos = pd.concat([
+            self.conteos + conteos[existentes].reindex(self.conteos.index, fill_value=0),
+            conteos[~existentes],
+        ]).astype("int64")
+        self._podar()
+
+    def actualizar(self, serie: pd.Series) -> None:
+        self._sumar(serie.value_counts(dropna=False, sort=False))
+
+    def combinar(self, otro: "FrecuentesMisraGries") -> None:
+        self.error += otro.error
+        self._sumar(otro.conteos)
+
+
+class ComomentosPareados:
+    """
+    Medias, co-momentos y momentos de segundo orden por par de columnas, solo
+    sobre las filas donde ambas tienen valor (como DataFrame.corr). Los bloques
+    se combinan con las fórmulas de Chan et al.
+    """
+
+    def __init__(self, n_columnas: int):
+        forma = (n_columnas, n_columnas)
+        self.n = np.zeros(forma)
+        self.media_x = np.zeros(forma)
+        self.media_y = np.zeros(forma)
+        self.comomento = np.zeros(forma)
+        self.m2_x = np.zeros(forma)
+        self.m2_y = np.zeros(forma)
+
+    def actualizar(self, matriz: np.ndarray) -> None:
+        presentes = ~np.isnan(matriz)
+        # Se centra cada columna en su media del bloque para no perder precisión
+        n_columna = presentes.sum(axis=0)
+        centro = np.where(presentes, matriz, 0.0).sum(axis=0) / np.maximum(n_columna, 1)
+        z = np.where(presentes, matriz - centro, 0.0)
+        m = presentes.astype(float)
+
+        otro = ComomentosPareados(matriz.shape[1])
+        otro.n = m.T @ m
+        suma_x = z.T @ m  # [i, j]: suma de la columna i donde j tiene valor
+        suma_y = suma_x.T
+        with np.errstate(invalid="ignore", divide="ignore"):
+            otro.media_x = np.where(otro.n > 0, suma_x / otro.n, 0.0)
+            otro.media_y = np.where(otro.n > 0, suma_y / otro.n, 0.0)
+        otro.comomento = z.T @ z - otro.media_x * suma_y
+        otro.m2_x = (z * z).T @ m - otro.media_x * suma_x
+        otro.m2_y = otro.m2_x.T
+        otro.media_x += centro[:, None]
+        otro.media_y += centro[None, :]
+        self.combinar(otro)
+
+    def combinar(self, otro: "ComomentosPareados") -> None:
+        n = self.n + otro.n
+        with np.errstate(invalid="ignore", divide="ignore"):
+            peso = np.where(n > 0, self.n * otro.n / n, 0.0)
+            fraccion = np.where(n > 0, otro.n / n, 0.0)
+        delta_x = otro.media_x - self.media_x
+        delta_y = otro.media_y - self.media_y
+
+        self.comomento = self.comomento + otro.comomento + delta_x * delta_y * peso
+        self.m2_x = self.m2_x + otro.m2_x + delta_x ** 2 * peso
+        self.m2_y = self.m2_y + otro.m2_y + delta_y ** 2 * peso
+        self.media_x = self.media_x + delta_x * fraccion
+        self.media_y = self.media_y + delta_y * fraccion
+        self.n = n
+
+    def correlacion(self) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            corr = self.comomento / np.sqrt(self.m2_x * self.m2_y)
+        corr[self.n < 2] = np.nan
+        return np.clip(corr, -1.0, 1.0)
+
+
+# -------------------------------------------------
+# 9. Resumen EDA en una pasada
+# -------------------------------------------------
+class ResumenEDA:
+    """
+    Estadísticas del EDA acumuladas bloque a bloque (una sola lectura del CSV):
+    - dimensiones, dtypes y nulos por columna
+    - numéricas: conteo, media y varianza (Welford), mín/máx, y cuantiles e
+      histograma p1–p99 exactos (hasta max_exactos valores distintos) o con un
+      sketch KLL y un histograma de bins fijos
+    - categóricas: categorías más frecuentes (Misra-Gries)
+    - correlación de Pearson por pares (co-momentos combinables)
+
+    El tipo de cada columna (numérica o categórica) se decide con el primer bloque;
+    en los siguientes, los valores de una columna numérica que no son números
+    cuentan como nulos.
+    """
+
+    def __init__(
+        self,
+        max_exactos: int = 100_000,
+        k_cuantiles: int = 2000,
+        bins_histograma: int = 4096,
+        capacidad_frecuentes: int = 10_000,
+    ):
+        self.max_exactos = max_exactos
+        self.k_cuantiles = k_cuantiles
+        self.bins_histograma = bins_histograma
+        self.capacidad_frecuentes = capacidad_frecuentes
+        self.n_filas = 0
+        self.columnas: list = []
+        self.dtypes: pd.Series = pd.Series(dtype=object)
+        self.nulos: pd.Series = pd.Series(dtype="int64")
+        self.numericas: list = []
+        self.categoricas: list = []
+
+    def _iniciar(self, bloque: pd.DataFrame) -> None:
+        self.columnas = list(bloque.columns)
+        self.dtypes = bloque.dtypes.copy()
+        self.nulos = pd.Series(0, index=bloque.columns, dtype="int64")
+        self.numericas = list(bloque.select_dtypes(include=[np.number]).columns)
+        self.categoricas = list(bloque.select_dtypes(include=["object", "string", "category"]).columns)
+
+        p = len(self.numericas)
+        self.n = np.zeros(p)
+        self.media = np.zeros(p)
+        self.m2 = np.zeros(p)
+        self.minimo = np.full(p, np.inf)
+        self.maximo = np.full(p, -np.inf)
+        self.distribuciones = [
+            DistribucionNumerica(self.max_exactos, self.k_cuantiles, self.bins_histograma, semilla=i) for i in range(p)
+        ]
+        self.frecuentes = {col: FrecuentesMisraGries(self.capacidad_frecuentes) for col in self.categoricas}
+        self.comomentos = ComomentosPareados(p)
+
+    def actualizar(self, bloque: pd.DataFrame) -> None:
+        if not self.columnas:
+            self._iniciar(bloque)
+        self.n_filas += len(bloque)
+        self.nulos = self.nulos.add(bloque.isna().sum(), fill_value=0).astype("int64")
+        self._actualizar_dtypes(bloque)
+
+        if self.numericas:
+            matriz = np.column_stack(
+                [pd.to_numeric(bloque[col], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+                 for col in self.numericas]
+            )
+            self._actualizar_momentos(matriz)
+            for j, distribucion in enumerate(self.distribuciones):
+                distribucion.actualizar(matriz[:, j])
+            self.comomentos.actualizar(matriz)
+
+        for col in self.categoricas:
+            self.frecuentes[col].actualizar(bloque[col])
+
+    def _actualizar_dtypes(self, bloque: pd.DataFrame) -> None:
+        for col in self.columnas:
+            self.dtypes[col] = _combinar_dtypes(self.dtypes[col], bloque[col].dtype)
+
+    def _actualizar_momentos(self, matriz: np.ndarray) -> None:
+        presentes = ~np.isnan(matriz)
+        n_b = presentes.sum(axis=0).astype(float)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            media_b = np.where(n_b > 0, np.nansum(matriz, axis=0) / n_b, 0.0)
+        m2_b = np.nansum((matriz - media_b) ** 2, axis=0)
+        if presentes.any():
+            self.minimo = np.fmin(self.minimo, np.nanmin(np.where(presentes, matriz, np.inf), axis=0))
+            self.maximo = np.fmax(self.maximo, np.nanmax(np.where(presentes, matriz, -np.inf), axis=0))
+        self._combinar_momentos(n_b, media_b, m2_b)
+
+    def _combinar_momentos(self, n_b: np.ndarray, media_b: np.ndarray, m2_b: np.ndarray) -> None:
+        n = self.n + n_b
+        delta = media_b - self.media
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self.media = np.where(n > 0, self.media + delta * n_b / n, 0.0)
+            self.m2 = np.where(n > 0, self.m2 + m2_b + delta ** 2 * self.n * n_b / n, 0.0)
+        self.n = n
+
+    def combinar(self, otro: "ResumenEDA") -> None:
+        """Suma el resumen de otras filas con las mismas columnas (ej: otro archivo o proceso)."""
+        if not otro.columnas:
+            return
+        if not self.columnas:
+            self.__dict__.update(otro.__dict__)
+            return
+        self.n_filas += otro.n_filas
+        self.nulos = self.nulos.add(otro.nulos, fill_value=0).astype("int64")
+        for col in self.columnas:
+            self.dtypes[col] = _combinar_dtypes(self.dtypes[col], otro.dtypes[col])
+        self.minimo = np.fmin(self.minimo, otro.minimo)
+        self.maximo = np.fmax(self.maximo, otro.maximo)
+        self._combinar_momentos(otro.n, otro.media, otro.m2)
+        for distribucion, otra in zip(self.distribuciones, otro.distribuciones):
+            distribucion.combinar(otra)
+        self.comomentos.combinar(otro.comomentos)
+        for col in self.categoricas:
+            self.frecuentes[col].combinar(otro.frecuentes[col])
+
+    # --- Resultados con la misma forma que pandas ---
+    def describir(self, col) -> pd.Series:
+        """Equivalente a df[col].describe() (cuartiles del sketch KLL)."""
+        j = self.numericas.index(col)
+        n = self.n[j]
+        std = np.sqrt(self.m2[j] / (n - 1)) if n > 1 else np.nan
+        q25, q50, q75 = self.distribuciones[j].cuantiles([0.25, 0.5, 0.75])
+        valores = [n, self.media[j] if n else np.nan, std,
+                   self.minimo[j] if n else np.nan, q25, q50, q75, self.maximo[j] if n else np.nan]
+        return pd.Series(valores, index=["count", "mean", "std", "min", "25%", "50%", "75%", "max"], name=col)
+
+    def histograma(
+        self, col, bins: int = 30, p_low: float = 0.01, p_high: float = 0.99
+    ) -> tuple[np.ndarray, np.ndarray] | None:
+        """Conteos y bordes del histograma recortado a [p_low, p_high] (None si hay menos de 2 datos)."""
+        j = self.numericas.index(col)
+        if self.n[j] < 2:
+            return None
+        bajo, alto = self.distribuciones[j].cuantiles([p_low, p_high])
+        return self.distribuciones[j].histograma_recortado(bajo, alto, bins)
+
+    def valores_frecuentes(self, col, top: int = 10) -> pd.Series:
+        """Equivalente a df[col].value_counts(dropna=False).head(top)."""
+        # Mismo orden previo que value_counts (primera aparición, nulos incluidos): mismos empates
+        conteos = self.frecuentes[col].conteos.sort_values(ascending=False, kind="stable").head(top)
+        conteos.index.name = col
+        conteos.name = "count"
+        return conteos
+
+    def correlacion(self) -> pd.DataFrame:
+        return pd.DataFrame(self.comomentos.correlacion(), index=self.numericas, columns=self.numericas)
+
+
+def _combinar_dtypes(anterior, nuevo):
+    """dtype de una columna con bloques de dos tipos (ej: int64 + float64 -> float64)."""
+    if anterior == nuevo:
+        return anterior
+    if pd.api.types.is_numeric_dtype(anterior) and pd.api.types.is_numeric_dtype(nuevo):
+        return np.result_type(anterior, nuevo)
+    return np.dtype(object)
+
+
+def resumir_bloques(bloques, **opciones) -> ResumenEDA:
+    """ResumenEDA a partir de un iterable de DataFrames."""
+    resumen = ResumenEDA(**opciones)
+    for bloque in bloques:
+        resumen.actualizar(bloque)
+    return resumen
+
+
+def resumir_csv(ruta: str, chunksize: int = 100_000, **opciones) -> ResumenEDA:
+    """Lee el CSV una sola vez, por bloques de 'chunksize' filas, y retorna su ResumenEDA."""
+    with pd.read_csv(ruta, chunksize=chunksize) as lector:
+        return resumir_bloques(lector, **opciones)
+
+
+# -------------------------------------------------
+# 10. EDA completo por bloques
+# -------------------------------------------------
+def ejecutar_eda_por_bloques(
+    ruta: str, graficar: bool = True, chunksize: int = 100_000, top: int = 10
+) -> ResumenEDA:
+    """
+    Mismo reporte que ejecutar_eda, pero leyendo el CSV una sola vez por bloques:
+    sirve para archivos que no caben en memoria. Los cuartiles, el recorte p1–p99
+    y el histograma son exactos mientras la columna tenga hasta 100.000 valores
+    distintos; con más, los cuartiles y el recorte vienen de un sketch (error de
+    rango ~0,1%) y el histograma de bins finos (HistogramaFijo.rebinear: solo los
+    bins finos cortados por un borde se reparten de forma aproximada). El resto
+    de las cifras es exacto.
+    """
+    resumen = resumir_csv(ruta, chunksize=chunksize)
+
+    print("\n=== INFORMACIÓN GENERAL ===")
+    print("Dimensiones (filas, columnas):", (resumen.n_filas, len(resumen.columnas)))
+    print("\nTipos de datos:")
+    print(resumen.dtypes)
+
+    print("\n=== VALORES NULOS ===")
+    nulos = resumen.nulos[resumen.nulos > 0].sort_values(ascending=False)
+    print("No hay valores nulos." if len(nulos) == 0 else nulos)
+
+    print("\n=== VARIABLES NUMÉRICAS ===")
+    if not resumen.numericas:
+        print("No hay variables numéricas.")
+    for col in resumen.numericas:
+        print(f"\n--- {col} ---")
+        print(resumen.describir(col))
+        if graficar:
+            histograma = resumen.histograma(col)
+            if histograma is None:
+                print(f"{col}: no hay suficientes datos para graficar.")
+            else:
+                graficar_histograma(*histograma, col)
+
+    print("\n=== VARIABLES CATEGÓRICAS ===")
+    if not resumen.categoricas:
+        print("No hay variables categóricas.")
+    for col in resumen.categoricas:
+        print(f"\n--- {col} ---")
+        print(resumen.valores_frecuentes(col, top))
+
+    print("\n=== MATRIZ DE CORRELACIÓN ===")
+    if len(resumen.numericas) < 2:
+        print("No hay suficientes variables numéricas para correlación.")
+    else:
+        imprimir_correlacion(resumen.correlacion())
+
+    return resumen
+
+
+# -------------------------------------------------
+# 11. Artefactos en lote (sin ventanas, con caché)
+# -------------------------------------------------
+# Los histogramas y el mapa de correlación se guardan como PNG dibujando sobre
+# matplotlib.figure.Figure (lienzo Agg, no interactivo; no usa pyplot), en
+# procesos paralelos. Los bins se calculan antes con NumPy y el manifiesto guarda
+# un hash del CSV y de cada columna: lo que no cambió no se recalcula ni se redibuja.
+
+MANIFIESTO = "manifiesto.json"
+
+
+def hash_archivo(ruta: str, bloque: int = 1 << 20) -> str:
+    """SHA-256 del contenido del archivo (leído por bloques)."""
+    h = hashlib.sha256()
+    with open(ruta, "rb") as f:
+        for datos in iter(lambda: f.read(bloque), b""):
+            h.update(datos)
+    return h.hexdigest()
+
+
+def hash_columna(serie: pd.Series) -> str:
+    """SHA-256 de los valores y el dtype de la columna (no depende del resto del CSV)."""
+    h = hashlib.sha256(str(serie.dtype).encode())
+    h.update(pd.util.hash_pandas_object(serie, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def _nombre_archivo(col: str) -> str:
+    return "histograma_" + re.sub(r"[^\w.-]+", "_", col) + ".png"
+
+
+def _guardar_artefacto(tarea: tuple) -> str:
+    """Dibuja y guarda un artefacto: ('histograma', ruta, conteos, bordes, col, p_low, p_high) o ('correlacion', ruta, corr)."""
+    tipo, ruta, *datos = tarea
+    fig = Figure()
+    ax = fig.subplots()
+    if tipo == "histograma":
+        dibujar_histograma(ax, *datos)
+    else:
+        dibujar_correlacion(fig, ax, *datos)
+    fig.tight_layout()
+    fig.savefig(ruta)
+    return ruta
+
+
+def generar_artefactos(
+    ruta_csv: str,
+    directorio: str = "artefactos_eda",
+    bins: int = 30,
+    p_low: float = 0.01,
+    p_high: float = 0.99,
+    max_cols: int = 12,
+    n_jobs: Optional[int] = None,
+) -> dict:
+    """
+    Guarda en 'directorio' un histograma robusto por columna numérica y el mapa de
+    correlación, sin abrir ventanas. Con el mismo CSV (mismo hash) y los mismos
+    parámetros no se lee el archivo; si cambió, solo se redibujan las columnas
+    cuyo contenido cambió (y la correlación si cambió alguna numérica).
+
+    - n_jobs: procesos para dibujar (None = todos los núcleos, 1 = en este proceso)
+
+    Retorna el manifiesto: hashes, archivo de cada artefacto y listas
+    'dibujados' / 'reutilizados' de esta ejecución.
+    """
+    salida = Path(directorio)
+    salida.mkdir(parents=True, exist_ok=True)
+    ruta_manifiesto = salida / MANIFIESTO
+    anterior = json.loads(ruta_manifiesto.read_text(encoding="utf-8")) if ruta_manifiesto.exists() else {}
+
+    parametros = {"bins": bins, "p_low": p_low, "p_high": p_high, "max_cols": max_cols}
+    hash_csv = hash_archivo(ruta_csv)
+    artefactos_previos = anterior.get("artefactos", {})
+
+    def vigente(nombre: str, clave: str) -> bool:
+        previo = artefactos_previos.get(nombre)
+        return previo is not None and previo["hash"] == clave and (salida / previo["archivo"]).exists()
+
+    # Mismo CSV y parámetros: no se lee el archivo
+    if (
+        anterior.get("csv_sha256") == hash_csv
+        and anterior.get("parametros") == parametros
+        and all(vigente(nombre, a["hash"]) for nombre, a in artefactos_previos.items())
+    ):
+        return {**anterior, "dibujados": [], "reutilizados": list(artefactos_previos)}
+
+    df = pd.read_csv(ruta_csv)
+    numericas = df.select_dtypes(include=[np.number])
+    clave_parametros = json.dumps(parametros, sort_keys=True)
+
+    artefactos: dict[str, dict] = {}
+    tareas = []
+    dibujados = []
+    hashes = []
+    for col in numericas.columns:
+        h = hash_columna(numericas[col])
+        hashes.append(h)
+        clave = hashlib.sha256(f"{col}|{h}|{clave_parametros}".encode()).hexdigest()
+        nombre = f"histograma:{col}"
+        if vigente(nombre, clave):
+            artefactos[nombre] = artefactos_previos[nombre]
+            continue
+        histograma = calcular_histograma(numericas[col], bins, p_low, p_high)
+        if histograma is None:
+            continue
+        archivo = _nombre_archivo(col)
+        artefactos[nombre] = {"hash": clave, "archivo": archivo}
+        tareas.append(("histograma", str(salida / archivo), *histograma, col, p_low, p_high))
+        dibujados.append(nombre)
+
+    if 2 <= numericas.shape[1] <= max_cols:
+        clave = hashlib.sha256("|".join([*numericas.columns, *hashes]).encode()).hexdigest()
+        if vigente("correlacion", clave):
+            artefactos["correlacion"] = artefactos_previos["correlacion"]
+        else:
+            artefactos["correlacion"] = {"hash": clave, "archivo": "correlacion.png"}
+            tareas.append(("correlacion", str(salida / "correlacion.png"), numericas.corr()))
+            dibujados.append("correlacion")
+
+    n_procesos = min(n_jobs or os.cpu_count() or 1, len(tareas))
+    if n_procesos > 1:
+        with ProcessPoolExecutor(max_workers=n_procesos) as ejecutor:
+            list(ejecutor.map(_guardar_artefacto, tareas))
+    else:
+        for tarea in tareas:
+            _guardar_artefacto(tarea)
+
+    # Artefactos de columnas que ya no existen
+    archivos = {a["archivo"] for a in artefactos.values()}
+    for previo in artefactos_previos.values():
+        if previo["archivo"] not in archivos:
+            (salida / previo["archivo"]).unlink(missing_ok=True)
+
+    manifiesto = {"csv_sha256": hash_csv, "parametros": parametros, "artefactos": artefactos}
+    ruta_manifiesto.write_text(json.dumps(manifiesto, indent=2, ensure_ascii=False), encoding="utf-8")
+    return {**manifiesto, "dibujados": dibujados, "reutilizados": [n for n in artefactos if n not in dibujados]}
+
+
+if __name__ == "__main__":
+    # python eda/eda.py data_limpia.csv [directorio]
+    import sys
+
+    resultado = generar_artefactos(sys.argv[1], *sys.argv[2:3])
+    print(f"Dibujados: {len(resultado['dibujados'])}, reutilizados: {len(resultado['reutilizados'])}")
@@ -2,7 +2,7 @@
 
 from .pipeline import limpiar_dataframe ## pipeline funcional 
 from .cleaner import DataCleaner        ## Clases 
-from .schemas import LimpiezaConfigSchema, LimpiezaReporteSchema  ## contratos Pydantic
+from .schemas import LimpiezaConfigSchema, LimpiezaEstadoSchema, LimpiezaReporteSchema  ## contratos Pydantic
 
 
 ## Con __all__ se define, mediante una lista,
@@ -11,5 +11,6 @@ __all__ = [
     "limpiar_dataframe",
     "DataCleaner",
     "LimpiezaConfigSchema",
+    "LimpiezaEstadoSchema",
     "LimpiezaReporteSchema",
 ]
\ No newline at end of file
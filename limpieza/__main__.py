@@ -0,0 +1,7 @@
+## python -m limpieza: limpieza en lote de varios CSV (ver lote.py).
+
+import sys
+
+from .lote import main
+
+sys.exit(main())
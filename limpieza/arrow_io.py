@@ -0,0 +1,146 @@
+## Lectura/escritura para el backend Arrow: las columnas se mantienen como
+# arreglos Arrow (pd.ArrowDtype) desde la lectura hasta Parquet/Arrow IPC.
+
+from __future__ import annotations
+
+import os
+from typing import Any, Iterator, Union
+
+import numpy as np
+import pandas as pd
+
+try:  # pyarrow es opcional (solo necesario para backend="arrow")
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover
+    pa = None
+
+Ruta = Union[str, "os.PathLike[str]"]
+
+
+def requerir_pyarrow() -> None:
+    """Lanza ImportError con un mensaje claro si pyarrow no está instalado."""
+    if pa is None:
+        raise ImportError("El backend 'arrow' requiere pyarrow: pip install pyarrow")
+
+
+# -------------------------------------------------
+# 1) Conversión DataFrame <-> Arrow
+# -------------------------------------------------
+def a_arrow(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Retorna un DataFrame con todas las columnas como pd.ArrowDtype.
+
+    Las columnas que ya son Arrow (incluido el dtype str de pandas 3 con pyarrow)
+    y las numéricas sin nulos se convierten sin copiar datos.
+    """
+    requerir_pyarrow()
+    tabla = pa.Table.from_pandas(df, preserve_index=False)
+    df_arrow = tabla.to_pandas(types_mapper=pd.ArrowDtype)
+    df_arrow.index = df.index
+    return df_arrow
+
+
+def como_arrow(valores: Any, referencia: pd.Series) -> pd.Series:
+    """
+    Serie pd.ArrowDtype con el índice y nombre de 'referencia' (NaN -> null).
+    """
+    arreglo = pa.array(np.asarray(valores), from_pandas=True)
+    return pd.Series(pd.arrays.ArrowExtensionArray(arreglo), index=referencia.index, name=referencia.name)
+
+
+def _tipos_object(df: pd.DataFrame) -> dict[str, Any]:
+    """
+    Tipo Arrow de cada columna object (se infiere de a una columna a la vez).
+    None marca columnas con tipos mezclados (ej. números y textos desde JSON),
+    que se escriben como texto.
+    """
+    tipos = {}
+    for col in df.columns:
+        if df[col].dtype == object:
+            try:
+                tipos[col] = pa.array(df[col], from_pandas=True).type
+            except (pa.ArrowInvalid, pa.ArrowTypeError, OverflowError):
+                tipos[col] = None
+    return tipos
+
+
+def a_tabla(df: pd.DataFrame) -> "pa.Table":
+    """
+    Tabla Arrow del DataFrame limpio (sin índice); sin copia para columnas Arrow.
+    Las columnas object con tipos mezclados se escriben como texto.
+    """
+    requerir_pyarrow()
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, OverflowError):
+        mixtas = {col: "str" for col, tipo in _tipos_object(df).items() if tipo is None}
+        return pa.Table.from_pandas(df.astype(mixtas), preserve_index=False)
+
+
+def iterar_lotes_arrow(
+    df: pd.DataFrame, filas_por_lote: int = 65_536
+) -> tuple["pa.Schema", Iterator["pa.RecordBatch"]]:
+    """
+    Esquema Arrow del DataFrame y un iterador de RecordBatch por tramos de filas.
+    Cada tramo se convierte por separado: nunca se arma una segunda copia completa
+    de las columnas NumPy/object (las columnas Arrow se recortan sin copiar).
+    """
+    requerir_pyarrow()
+    tipos = _tipos_object(df)
+    mixtas = {col: "str" for col, tipo in tipos.items() if tipo is None}
+
+    # Esquema sin datos para columnas tipadas; las object usan el tipo inferido
+    esquema = pa.Schema.from_pandas(df.head(0).astype(mixtas), preserve_index=False)
+    for col, tipo in tipos.items():
+        if tipo is not None:
+            esquema = esquema.set(esquema.get_field_index(col), pa.field(col, tipo))
+
+    def lotes() -> Iterator["pa.RecordBatch"]:
+        for inicio in range(0, len(df), filas_por_lote):
+            tramo = df.iloc[inicio : inicio + filas_por_lote].astype(mixtas)
+            yield pa.RecordBatch.from_pandas(tramo, schema=esquema, preserve_index=False)
+
+    return esquema, lotes()
+
+
+# -------------------------------------------------
+# 2) Lectura
+# -------------------------------------------------
+def leer_csv_arrow(ruta: Ruta, **kwargs: Any) -> pd.DataFrame:
+    """
+    Lee un CSV con el motor multihilo de pyarrow y columnas pd.ArrowDtype
+    (sin pasar por object/NumPy).
+    """
+    requerir_pyarrow()
+    return pd.read_csv(ruta, engine="pyarrow", dtype_backend="pyarrow", **kwargs)
+
+
+def leer_arrow_ipc(ruta: Ruta, backend: str = "numpy") -> pd.DataFrame:
+    """
+    Lee un archivo Arrow IPC con memory-map. Con backend="arrow" las columnas
+    quedan como pd.ArrowDtype apuntando al archivo mapeado (sin copiar).
+    """
+    requerir_pyarrow()
+    with pa.memory_map(os.fspath(ruta), "r") as origen:
+        tabla = pa_ipc.open_file(origen).read_all()
+    if backend == "arrow":
+        return tabla.to_pandas(types_mapper=pd.ArrowDtype)
+    return tabla.to_pandas()
+
+
+# -------------------------------------------------
+# 3) Escritura
+# -------------------------------------------------
+def escribir_parquet(df: pd.DataFrame, ruta: Ruta, **kwargs: Any) -> None:
+    """Escribe el DataFrame limpio en Parquet reutilizando los buffers Arrow."""
+    pq.write_table(a_tabla(df), ruta, **kwargs)
+
+
+def escribir_arrow_ipc(df: pd.DataFrame, ruta: Ruta) -> None:
+    """Escribe el DataFrame limpio en formato Arrow IPC (archivo Feather v2)."""
+    tabla = a_tabla(df)
+    with pa.OSFile(os.fspath(ruta), "wb") as destino:
+        with pa_ipc.new_file(destino, tabla.schema) as escritor:
+            escritor.write_table(tabla)
@@ -0,0 +1,128 @@
+## Carga de CSV guiada por la configuración de la limpieza: lector CSV de pyarrow
+# (por bloques, con lectura anticipada en otro hilo) que lee solo las columnas
+# pedidas, deja como texto las monetarias y de texto, y convierte las numéricas
+# mientras parsea. Ninguna columna pasa por dtype object.
+
+from __future__ import annotations
+
+import os
+from typing import Any, Mapping, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .arrow_io import requerir_pyarrow
+from .pipeline import FALSOS, VERDADEROS, mapear_nombres_columnas
+from .schemas import LimpiezaConfigSchema
+
+try:  # pyarrow es opcional (solo necesario para este lector)
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # pragma: no cover
+    pa = None
+
+Ruta = Union[str, "os.PathLike[str]"]
+
+## Bloques de 4 MiB: menos bloques que unir sin subir la memoria pico
+TAMANO_BLOQUE = 4 << 20
+
+## Los mismos nulos que pd.read_csv (los booleanos, en pipeline.py)
+NULOS_EXTRA = ("None", "<NA>")
+
+
+def _columnas_a_leer(encabezado: list[str], config: LimpiezaConfigSchema) -> list[str]:
+    """Columnas originales del CSV cuyo nombre estandarizado está en config.columnas_lectura."""
+    if config.columnas_lectura is None:
+        return encabezado
+    mapeo = mapear_nombres_columnas(encabezado)
+    faltantes = set(config.columnas_lectura) - set(mapeo.values())
+    if faltantes:
+        raise ValueError(f"Columnas de columnas_lectura que no están en el CSV: {', '.join(sorted(faltantes))}.")
+    return [col for col in encabezado if mapeo[col] in config.columnas_lectura]
+
+
+def _tipos_texto(columnas: list[str], config: LimpiezaConfigSchema) -> dict[str, Any]:
+    """Monetarias y columnas de texto se leen como texto (sin inferir números ni fechas)."""
+    texto = set(config.columnas_monetarias or []) | set(config.columnas_texto or [])
+    mapeo = mapear_nombres_columnas(columnas)
+    return {col: pa.string() for col in columnas if mapeo[col] in texto}
+
+
+def _opciones(columnas: list[str], tipos: dict[str, Any], usar_hilos: bool) -> dict[str, Any]:
+    return {
+        "read_options": pa_csv.ReadOptions(use_threads=usar_hilos, block_size=TAMANO_BLOQUE),
+        "convert_options": pa_csv.ConvertOptions(
+            include_columns=columnas,
+            column_types=tipos,
+            null_values=[*pa_csv.ConvertOptions().null_values, *NULOS_EXTRA],
+            true_values=list(VERDADEROS),
+            false_values=list(FALSOS),
+            strings_can_be_null=True,
+        ),
+    }
+
+
+def leer_csv_limpieza(
+    ruta: Ruta,
+    config: Optional[LimpiezaConfigSchema | Mapping[str, Any]] = None,
+    backend: Optional[str] = None,
+    usar_hilos: bool = True,
+) -> pd.DataFrame:
+    """
+    Lee un CSV para limpiarlo con DataCleaner(config), con el lector de pyarrow:
+
+    - solo las columnas de config.columnas_lectura (nombres estandarizados; None = todas)
+    - columnas_monetarias y columnas_texto como texto; las demás con su tipo inferido
+      (números, booleanos) mientras se parsea
+    - fechas como texto y los mismos nulos que pd.read_csv ("", "NA", "None", ...)
+    - backend: 'numpy' (str/int64/float64) o 'arrow' (pd.ArrowDtype); por defecto el de config
+
+    El archivo se lee por bloques con los tipos del primer bloque, así la memoria
+    pico es la tabla más un bloque. Si una fila posterior no cabe en ese tipo
+    ("3.5" o "n/d" en la fila 100.000 de una columna de enteros), se relee completo
+    infiriendo con todas las filas, y la columna queda en float64 o texto como en
+    pd.read_csv.
+
+    Los nombres de columna son los del archivo (la limpieza los estandariza).
+    """
+    requerir_pyarrow()
+    if config is None:
+        config = LimpiezaConfigSchema()
+    elif not isinstance(config, LimpiezaConfigSchema):
+        config = LimpiezaConfigSchema.model_validate(config)
+
+    ruta = os.fspath(ruta)
+    encabezado = list(pd.read_csv(ruta, encoding="utf-8", nrows=0).columns)
+    columnas = _columnas_a_leer(encabezado, config)
+    tipos = _tipos_texto(columnas, config)
+
+    # Las fechas que infiere pyarrow se leen como texto, igual que pd.read_csv
+    with pa_csv.open_csv(ruta, **_opciones(columnas, tipos, usar_hilos=False)) as lector:
+        esquema = lector.schema
+    tipos.update({campo.name: pa.string() for campo in esquema if pa.types.is_temporal(campo.type)})
+
+    try:
+        with pa_csv.open_csv(ruta, **_opciones(columnas, tipos, usar_hilos)) as lector:
+            tabla = lector.read_all()
+    except pa.ArrowInvalid:
+        # Un valor fuera del tipo del primer bloque: inferencia con todo el archivo
+        tabla = pa_csv.read_csv(ruta, **_opciones(columnas, tipos, usar_hilos))
+        fechas = {campo.name: pa.string() for campo in tabla.schema if pa.types.is_temporal(campo.type)}
+        if fechas:  # columna vacía en el primer bloque y con fechas después
+            tabla = pa_csv.read_csv(ruta, **_opciones(columnas, {**tipos, **fechas}, usar_hilos))
+
+    # Columnas sin ningún valor: float64, como pd.read_csv (pyarrow las deja de tipo null)
+    for i, campo in enumerate(tabla.schema):
+        if pa.types.is_null(campo.type):
+            tabla = tabla.set_column(i, campo.name, tabla.column(i).cast(pa.float64()))
+
+    if (backend or config.backend) == "arrow":
+        return tabla.to_pandas(types_mapper=pd.ArrowDtype, split_blocks=True, self_destruct=True)
+    # Booleanas con nulos: object con NaN (pyarrow deja None), como pd.read_csv
+    booleanas = [
+        campo.name for campo in tabla.schema if pa.types.is_boolean(campo.type) and tabla[campo.name].null_count
+    ]
+    df = tabla.to_pandas(split_blocks=True, self_destruct=True)
+    for col in booleanas:
+        df[col] = df[col].fillna(np.nan)
+    return df
@@ -0,0 +1,220 @@
+## Detección de casi duplicados (avisos republicados con pequeños cambios) con
+# firmas MinHash sobre shingles de la descripción y LSH por bandas, con bloqueo
+# por barrio/UPZ. Evita comparar todos los pares: cada fila solo se compara con
+# sus vecinas dentro de un mismo balde, en tiempo casi lineal.
+
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+from .monetario import _buffers_utf8, parsear_monetario
+
+## Parámetros de las firmas
+N_PERMUTACIONES = 64
+LARGO_SHINGLE = 4
+## Vecinos que se comparan con cada fila dentro de un balde ordenado por valor/área
+VENTANA_VECINOS = 8
+
+_MULT_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MULT_2 = np.uint64(0x94D049BB133111EB)
+_BASE_SHINGLE = np.uint64(0x100000001B3)
+
+
+def _mezclar(h: np.ndarray) -> np.ndarray:
+    """Finalizador splitmix64: dispersa los bits de un hash uint64."""
+    with np.errstate(over="ignore"):
+        h = (h ^ (h >> np.uint64(30))) * _MULT_1
+        h = (h ^ (h >> np.uint64(27))) * _MULT_2
+        return h ^ (h >> np.uint64(31))
+
+
+# -------------------------------------------------
+# 1) Shingles y firmas MinHash
+# -------------------------------------------------
+def _shingles(textos: pd.Series, k: int = LARGO_SHINGLE) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Hash de cada shingle de k bytes (texto normalizado) y la fila a la que pertenece,
+    calculados sobre el buffer UTF-8 de toda la columna a la vez.
+    """
+    normalizados = textos.str.lower().str.replace(r"\s+", " ", regex=True).str.strip()
+    datos, offsets = _buffers_utf8(normalizados)
+    datos = datos[offsets[0] : offsets[-1]].astype(np.uint64)
+    offsets = offsets - offsets[0]
+    longitudes = np.diff(offsets)
+
+    n_ventanas = max(len(datos) - k + 1, 0)
+    h = np.zeros(n_ventanas, dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for j in range(k):
+            h = h * _BASE_SHINGLE + datos[j : j + n_ventanas]
+
+    # Solo las ventanas que caen completas dentro de una fila
+    por_fila = np.maximum(longitudes - k + 1, 0)
+    fila = np.repeat(np.arange(len(por_fila)), por_fila)
+    desplazamiento = np.arange(len(fila)) - np.repeat(np.cumsum(por_fila) - por_fila, por_fila)
+    return h[offsets[:-1][fila] + desplazamiento], fila
+
+
+def firmas_minhash(textos: pd.Series, n_permutaciones: int = N_PERMUTACIONES) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Firma MinHash (n_permutaciones x uint32) de cada texto.
+    Retorna (firmas, validas): 'validas' es False para textos sin shingles (muy cortos).
+    """
+    hashes, fila = _shingles(textos)
+    n = len(textos)
+    firmas = np.full((n, n_permutaciones), np.iinfo(np.uint32).max, dtype=np.uint32)
+    validas = np.zeros(n, dtype=bool)
+    if len(hashes) == 0:
+        return firmas, validas
+
+    filas_con_shingles, inicios = np.unique(fila, return_index=True)
+    validas[filas_con_shingles] = True
+
+    semillas = _mezclar(np.arange(1, n_permutaciones + 1, dtype=np.uint64))
+    for i, semilla in enumerate(semillas):
+        permutado = (_mezclar(hashes ^ semilla) >> np.uint64(32)).astype(np.uint32)
+        firmas[filas_con_shingles, i] = np.minimum.reduceat(permutado, inicios)
+
+    return firmas, validas
+
+
+def filas_por_banda(umbral: float, n_permutaciones: int = N_PERMUTACIONES) -> int:
+    """
+    Filas por banda r (con b = n_permutaciones // r bandas) cuyo umbral LSH
+    (1/b)^(1/r) queda justo por debajo del umbral pedido: se prefiere exhaustividad,
+    porque los candidatos se verifican después con la similitud estimada.
+    """
+    objetivo = 0.85 * umbral
+    mejor, mejor_dif = 1, np.inf
+    for r in range(1, n_permutaciones + 1):
+        b = n_permutaciones // r
+        dif = abs((1 / b) ** (1 / r) - objetivo)
+        if dif < mejor_dif:
+            mejor, mejor_dif = r, dif
+    return mejor
+
+
+# -------------------------------------------------
+# 2) Candidatos, verificación y grupos
+# -------------------------------------------------
+def _componentes(n: int, origen: np.ndarray, destino: np.ndarray) -> np.ndarray:
+    """
+    Componentes conexas por propagación de etiquetas: cada fila queda con la
+    posición más baja de su grupo (la primera aparición).
+    """
+    etiquetas = np.arange(n)
+    while True:
+        minimo = np.minimum(etiquetas[origen], etiquetas[destino])
+        anteriores = etiquetas.copy()
+        np.minimum.at(etiquetas, origen, minimo)
+        np.minimum.at(etiquetas, destino, minimo)
+        etiquetas = etiquetas[etiquetas]  # salto de punteros
+        if np.array_equal(etiquetas, anteriores):
+            return etiquetas
+
+
+def _valores_numericos(serie: pd.Series) -> np.ndarray:
+    """
+    float64 de la columna. Si aún es texto, lo que no sea un número simple
+    (p. ej. "$ 360.000.000") se parsea como monetario.
+    """
+    valores = pd.to_numeric(serie, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+    if not pd.api.types.is_numeric_dtype(serie.dtype):
+        faltantes = np.isnan(valores)
+        if faltantes.any():
+            monetarios = parsear_monetario(serie[faltantes])[0]
+            valores[faltantes] = monetarios.to_numpy(dtype=np.float64, na_value=np.nan)
+    return valores
+
+
+def _cercanos(a: np.ndarray, b: np.ndarray, tolerancia: float) -> np.ndarray:
+    """Diferencia relativa <= tolerancia (un valor faltante no descarta el par)."""
+    with np.errstate(invalid="ignore"):
+        ok = np.abs(a - b) <= tolerancia * np.maximum(np.abs(a), np.abs(b))
+    return ok | np.isnan(a) | np.isnan(b)
+
+
+def grupos_casi_duplicados(
+    df: pd.DataFrame,
+    umbral: float = 0.8,
+    tolerancia: float = 0.05,
+    columna_texto: str = "descripcion",
+    columnas_bloque: Sequence[str] = ("barrio", "upz"),
+    columnas_numericas: Sequence[str] = ("valor", "area"),
+    ventana: int = VENTANA_VECINOS,
+) -> np.ndarray:
+    """
+    Grupo de casi duplicados de cada fila: la posición de la primera fila del grupo
+    (una fila sin casi duplicados es su propio grupo).
+
+    Dos filas son casi duplicadas si están en el mismo bloque (barrio/UPZ), la
+    similitud de Jaccard estimada de sus descripciones es >= umbral y los valores
+    de columnas_numericas difieren a lo más en 'tolerancia' (relativa). Los pares
+    candidatos salen de LSH (mismo balde en alguna banda) y, dentro de cada balde,
+    de las 'ventana' filas vecinas en orden de valor/área.
+    """
+    n = len(df)
+    if n < 2 or columna_texto not in df.columns:
+        return np.arange(n)
+
+    # Firmas por descripción única (los avisos suelen repetir plantillas)
+    codigos, unicos = pd.factorize(df[columna_texto].astype("str"), use_na_sentinel=True)
+    firmas_unicas, validas_unicas = firmas_minhash(pd.Series(unicos, dtype="str"))
+    validas = (codigos >= 0) & validas_unicas[np.maximum(codigos, 0)]
+
+    bloque_cols = [c for c in columnas_bloque if c in df.columns]
+    if bloque_cols:
+        bloque = pd.util.hash_pandas_object(df[bloque_cols], index=False).to_numpy(dtype=np.uint64)
+    else:
+        bloque = np.zeros(n, dtype=np.uint64)
+
+    numericas = [_valores_numericos(df[c]) for c in columnas_numericas if c in df.columns]
+
+    r = filas_por_banda(umbral)
+    n_bandas = N_PERMUTACIONES // r
+    filas = np.flatnonzero(validas)
+    cod = codigos[filas]
+    orden_numerico = [v[filas] for v in reversed(numericas)]
+
+    origen, destino = [], []
+    for banda in range(n_bandas):
+        # Clave de la banda por descripción única, combinada con el bloque de cada fila
+        clave_unica = np.zeros(len(unicos), dtype=np.uint64)
+        for columna in firmas_unicas[:, banda * r : (banda + 1) * r].T:
+            clave_unica = _mezclar(clave_unica ^ columna.astype(np.uint64))
+        balde = _mezclar(clave_unica[cod] ^ bloque[filas])
+
+        # Vecindario ordenado: dentro de cada balde (ordenado por valor/área) cada fila
+        # se compara con las 'ventana' siguientes, no con todo el balde
+        orden = np.lexsort([*orden_numerico, balde])
+        for d in range(1, ventana + 1):
+            mismo = balde[orden[d:]] == balde[orden[:-d]]
+            if not mismo.any():
+                break
+            a, b = filas[orden[:-d][mismo]], filas[orden[d:][mismo]]
+            # Filtros baratos antes de acumular: mismo bloque y valores cercanos
+            ok = bloque[a] == bloque[b]
+            for valores in numericas:
+                ok &= _cercanos(valores[a], valores[b], tolerancia)
+            origen.append(np.minimum(a[ok], b[ok]))
+            destino.append(np.maximum(a[ok], b[ok]))
+
+    # Un mismo par aparece en varias bandas: se verifica una sola vez
+    pares = np.unique(np.concatenate(origen) * np.int64(n) + np.concatenate(destino)) if origen else []
+    if len(pares) == 0:
+        return np.arange(n)
+    origen, destino = pares // n, pares % n
+
+    # Similitud estimada por par de descripciones únicas (no por par de filas)
+    pares_texto, inverso = np.unique(
+        codigos[origen].astype(np.int64) * len(unicos) + codigos[destino], return_inverse=True
+    )
+    similitud = (
+        firmas_unicas[pares_texto // len(unicos)] == firmas_unicas[pares_texto % len(unicos)]
+    ).mean(axis=1)
+    ok = similitud[inverso] >= umbral
+
+    return _componentes(n, origen[ok], destino[ok])
@@ -0,0 +1,650 @@
+## Limpieza por bloques (out-of-core): permite limpiar archivos que no caben
+# en memoria obteniendo el mismo resultado que el pipeline en memoria.
+
+from __future__ import annotations
+
+import math
+import os
+from typing import Any, Callable, Iterable, Iterator, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .dedup import IndiceDedup, hash_filas_normalizadas
+from .inferencia import cota_no_numerica, decidir_por_muestreo
+from .pipeline import (
+    BOOLEANOS,
+    a_booleano,
+    a_numerico,
+    convertir_vacios_a_nan,
+    estandarizar_nombres_columnas,
+    limpiar_columnas_monetarias,
+    normalizar_texto,
+)
+from .schemas import LimpiezaConfigSchema, LimpiezaEstadoSchema
+
+## Una fuente puede ser la ruta de un CSV, una función que retorne los bloques
+# o un iterable re-iterable (ej: lista de DataFrames).
+FuenteBloques = Union[
+    str,
+    "os.PathLike[str]",
+    Callable[[], Iterable[pd.DataFrame]],
+    Iterable[pd.DataFrame],
+]
+
+
+# -------------------------------------------------
+# 1) Lectura de bloques
+# -------------------------------------------------
+def _es_ruta(fuente: Any) -> bool:
+    return isinstance(fuente, (str, os.PathLike))
+
+
+def iterar_bloques(fuente: FuenteBloques, chunksize: int = 100_000) -> Iterator[pd.DataFrame]:
+    """
+    Retorna un iterador nuevo sobre los bloques de la fuente.
+
+    - Ruta CSV: se lee con chunksize y todas las columnas como texto
+      (los tipos se infieren después sobre el archivo completo).
+    - Función: se llama en cada pasada para obtener un iterador nuevo.
+    - Iterable: debe poder recorrerse más de una vez (ej: lista).
+    """
+    if _es_ruta(fuente):
+        return _leer_csv_por_bloques(fuente, chunksize)
+
+    if callable(fuente):
+        return (bloque.copy() for bloque in fuente())
+
+    if iter(fuente) is fuente:
+        raise TypeError(
+            "La limpieza por bloques necesita dos pasadas: use una ruta, "
+            "una función que retorne el iterador o una lista de bloques."
+        )
+
+    return (bloque.copy() for bloque in fuente)
+
+
+def _leer_csv_por_bloques(ruta: Any, chunksize: int) -> Iterator[pd.DataFrame]:
+    with pd.read_csv(ruta, encoding="utf-8", dtype=str, chunksize=chunksize) as lector:
+        yield from lector
+
+
+# -------------------------------------------------
+# 2) Duplicados entre bloques
+# -------------------------------------------------
+def hash_filas(df: pd.DataFrame) -> np.ndarray:
+    """
+    Calcula un hash de 64 bits por fila (sin incluir el índice), el mismo que
+    usa el índice persistente de duplicados entre lotes.
+    """
+    return hash_filas_normalizadas(df)
+
+
+class IndiceHashes:
+    """
+    Conjunto de hashes de 64 bits guardado en tramos ordenados (uint64).
+
+    Usa ~8 bytes por fila única y fusiona tramos de tamaño similar,
+    por lo que siempre hay O(log n) tramos que consultar.
+    """
+
+    def __init__(self) -> None:
+        self._tramos: list[np.ndarray] = []
+
+    def __len__(self) -> int:
+        return sum(len(tramo) for tramo in self._tramos)
+
+    def contiene(self, hashes: np.ndarray) -> np.ndarray:
+        encontrados = np.zeros(len(hashes), dtype=bool)
+
+        for tramo in self._tramos:
+            pos = np.searchsorted(tramo, hashes)
+            pos[pos == len(tramo)] = 0
+            encontrados |= tramo[pos] == hashes
+
+        return encontrados
+
+    def agregar(self, hashes: np.ndarray) -> None:
+        if len(hashes) == 0:
+            return
+
+        self._tramos.append(np.unique(hashes))
+
+        # Fusionar mientras el último tramo sea comparable al anterior
+        while len(self._tramos) >= 2 and len(self._tramos[-2]) <= 2 * len(self._tramos[-1]):
+            ultimo = self._tramos.pop()
+            self._tramos[-1] = np.union1d(self._tramos[-1], ultimo)
+
+
+def marcar_duplicados(hashes: np.ndarray, indice: IndiceHashes) -> np.ndarray:
+    """
+    Marca filas repetidas dentro del bloque o ya vistas en bloques anteriores,
+    y registra en el índice las filas nuevas.
+    """
+    duplicadas = pd.Series(hashes).duplicated(keep="first").to_numpy() | indice.contiene(hashes)
+    indice.agregar(hashes[~duplicadas])
+    return duplicadas
+
+
+def _preparar_bloque(
+    bloque: pd.DataFrame,
+    indice: IndiceHashes,
+    mapeo: Optional[dict[str, str]] = None,
+    indice_dedup: Optional[IndiceDedup] = None,
+    nuevos_dedup: Optional[list[np.ndarray]] = None,
+    columnas_texto: Optional[Iterable[str]] = None,
+) -> pd.DataFrame:
+    """
+    Pasos 1-3 del pipeline sobre un bloque (nombres, vacíos, texto normalizado y
+    duplicados globales). Con 'indice_dedup' también se descartan las filas vistas
+    en lotes anteriores; el índice solo se consulta y los hashes de las filas que
+    quedan se agregan a 'nuevos_dedup' (si se pasa) para IndiceDedup.registrar().
+    """
+    estandarizar_nombres_columnas(bloque, mapeo)
+    convertir_vacios_a_nan(bloque)
+    if columnas_texto:
+        normalizar_texto(bloque, columnas_texto)
+
+    hashes = hash_filas(bloque)
+    duplicadas = marcar_duplicados(hashes, indice)
+    if indice_dedup is not None:
+        duplicadas[~duplicadas] = indice_dedup.contiene(hashes[~duplicadas])
+        if nuevos_dedup is not None:
+            nuevos_dedup.append(hashes[~duplicadas])
+    if duplicadas.any():
+        bloque = bloque.loc[~duplicadas]
+
+    return bloque
+
+
+# -------------------------------------------------
+# 3) Estadísticas acumuladas (pasada 1)
+# -------------------------------------------------
+def columnas_no_numericas(partes: list[pd.DataFrame], config: LimpiezaConfigSchema) -> set[str]:
+    """
+    Columnas texto que la muestra de la columna completa (las partes en orden)
+    descarta como numéricas, igual que convertir_a_numerico_seguro en run(): no
+    hace falta convertirlas completas para ajustar el estado.
+    """
+    if config.columnas_numericas_objetivo is not None or not partes:
+        return set()
+    monetarias = set(config.columnas_monetarias or [])
+    candidatas = partes[0].select_dtypes(include=["object", "string"]).columns.difference(monetarias)
+    no_numericas = set()
+    for col in candidatas:
+        serie = partes[0][col] if len(partes) == 1 else pd.concat([parte[col] for parte in partes])
+        if decidir_por_muestreo(serie, config.umbral_conversion, a_numerico) is False:
+            no_numericas.add(col)
+    return no_numericas
+
+
+def _sumar_conteos(acumulado: Optional[pd.Series], serie: pd.Series) -> pd.Series:
+    conteos = serie.value_counts(dropna=True)
+    if acumulado is None:
+        return conteos
+    return acumulado.add(conteos, fill_value=0)
+
+
+def _combinar_conteos(a: Optional[pd.Series], b: Optional[pd.Series]) -> Optional[pd.Series]:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return a.add(b, fill_value=0)
+
+
+def _mediana_desde_conteos(conteos: Optional[pd.Series]) -> float:
+    """
+    Mediana exacta a partir de conteos por valor (igual a Series.median()).
+    """
+    if conteos is None or conteos.sum() == 0:
+        return np.nan
+
+    conteos = conteos.sort_index()
+    acumulado = conteos.cumsum().to_numpy()
+    valores = conteos.index.to_numpy(dtype=float)
+    total = int(acumulado[-1])
+
+    k = (total - 1) // 2
+    a = valores[np.searchsorted(acumulado, k, side="right")]
+    if total % 2 == 1:
+        return float(a)
+
+    b = valores[np.searchsorted(acumulado, k + 1, side="right")]
+    return float((a + b) / 2)
+
+
+def _moda_desde_conteos(conteos: Optional[pd.Series]) -> Any:
+    """
+    Moda a partir de conteos; en empate gana el menor valor (igual a Series.mode()).
+    """
+    if conteos is None or len(conteos) == 0:
+        return "desconocido"
+
+    empatados = conteos[conteos == conteos.max()].index
+    return empatados.sort_values()[0]
+
+
+def _conteos_a_lista(conteos: Optional[pd.Series]) -> Optional[list[list[Any]]]:
+    """Conteos por valor -> [[valor, conteo], ...] serializable a JSON."""
+    if conteos is None:
+        return None
+    return [[_valor_nativo(valor), int(n)] for valor, n in conteos.items()]
+
+
+def _conteos_desde_lista(pares: Optional[list[list[Any]]]) -> Optional[pd.Series]:
+    if pares is None:
+        return None
+    if not pares:
+        return pd.Series(dtype="int64")
+    valores, conteos = zip(*pares)
+    return pd.Series(conteos, index=list(valores), dtype="int64")
+
+
+def _valor_nativo(valor: Any) -> Any:
+    """
+    Convierte escalares NumPy a tipos de Python serializables (NaN -> None).
+    """
+    if isinstance(valor, np.generic):
+        valor = valor.item()
+    if isinstance(valor, float) and np.isnan(valor):
+        return None
+    return valor
+
+
+class _EstadisticaNumerica:
+    """Acumula lo necesario para la imputación numérica y el dtype final."""
+
+    def __init__(self, estrategia_num: str) -> None:
+        self.estrategia_num = estrategia_num
+        self.conteos: Optional[pd.Series] = None
+        self.suma = 0.0
+        self.n = 0
+        self.es_float = False
+
+    def actualizar(self, serie: pd.Series) -> None:
+        if len(serie) == 0:
+            return
+
+        self.es_float |= pd.api.types.is_float_dtype(serie)
+
+        if self.estrategia_num == "mean":
+            self.suma += float(serie.sum())
+            self.n += int(serie.notna().sum())
+        else:
+            self.conteos = _sumar_conteos(self.conteos, serie)
+
+    def combinar(self, otro: "_EstadisticaNumerica") -> None:
+        self.es_float |= otro.es_float
+        self.suma += otro.suma
+        self.n += otro.n
+        self.conteos = _combinar_conteos(self.conteos, otro.conteos)
+
+    def relleno(self) -> float:
+        if self.estrategia_num == "mean":
+            return self.suma / self.n if self.n > 0 else np.nan
+        return _mediana_desde_conteos(self.conteos)
+
+    def a_dict(self) -> dict[str, Any]:
+        return {
+            "conteos": _conteos_a_lista(self.conteos),
+            "suma": self.suma,
+            "n": self.n,
+            "es_float": self.es_float,
+        }
+
+    def cargar(self, datos: dict[str, Any]) -> None:
+        self.conteos = _conteos_desde_lista(datos["conteos"])
+        self.suma = datos["suma"]
+        self.n = datos["n"]
+        self.es_float = datos["es_float"]
+
+
+class _EstadisticaColumna:
+    """
+    Estadísticas de una columna bajo una interpretación de tipos
+    (leída como texto o inferida como numérica o booleana).
+    """
+
+    def __init__(self, estrategia_num: str) -> None:
+        self.es_numerica: Optional[bool] = None
+        self.es_booleana = False
+        self.numerica = _EstadisticaNumerica(estrategia_num)
+        self.convertida = _EstadisticaNumerica(estrategia_num)
+        self.conteos_texto: Optional[pd.Series] = None
+        self.convertibles = 0
+        # Bloques que la muestra descartó como numéricos: filas y cota de sus convertibles
+        self.filas_omitidas = 0
+        self.convertibles_max = 0
+
+    def reiniciar_conversion(self) -> None:
+        self.convertida = _EstadisticaNumerica(self.numerica.estrategia_num)
+        self.convertibles = self.filas_omitidas = self.convertibles_max = 0
+
+    def combinar(self, otro: "_EstadisticaColumna") -> None:
+        if otro.es_numerica is not None:
+            self.es_numerica = otro.es_numerica
+        self.es_booleana |= otro.es_booleana
+        self.numerica.combinar(otro.numerica)
+        self.convertida.combinar(otro.convertida)
+        self.conteos_texto = _combinar_conteos(self.conteos_texto, otro.conteos_texto)
+        self.convertibles += otro.convertibles
+        self.filas_omitidas += otro.filas_omitidas
+        self.convertibles_max += otro.convertibles_max
+
+    def a_dict(self) -> dict[str, Any]:
+        return {
+            "es_numerica": self.es_numerica,
+            "es_booleana": self.es_booleana,
+            "numerica": self.numerica.a_dict(),
+            "convertida": self.convertida.a_dict(),
+            "conteos_texto": _conteos_a_lista(self.conteos_texto),
+            "convertibles": self.convertibles,
+            "filas_omitidas": self.filas_omitidas,
+            "convertibles_max": self.convertibles_max,
+        }
+
+    def cargar(self, datos: dict[str, Any]) -> None:
+        self.es_numerica = datos["es_numerica"]
+        self.es_booleana = datos["es_booleana"]
+        self.numerica.cargar(datos["numerica"])
+        self.convertida.cargar(datos["convertida"])
+        self.conteos_texto = _conteos_desde_lista(datos["conteos_texto"])
+        self.convertibles = datos["convertibles"]
+        self.filas_omitidas = datos.get("filas_omitidas", 0)
+        self.convertibles_max = datos.get("convertibles_max", 0)
+
+
+class AcumuladorLimpieza:
+    """
+    Recorre bloques ya preparados y acumula, de forma exacta:
+    - el tipo con que pandas leería cada columna del CSV completo (numérica,
+      booleana o texto; una booleana con nulos queda object, como en pd.read_csv)
+    - la proporción convertible de cada columna texto (umbral_conversion)
+    - conteos o sumas para medianas/medias y modas
+
+    Solo se convierten completas las columnas texto que pueden ser numéricas:
+    - 'no_numericas': columnas ya descartadas con la muestra de la columna completa
+      (columnas_no_numericas, como convertir_a_numerico_seguro en run())
+    - muestreo=True: cada bloque se muestrea (inferencia.py); de un bloque claramente
+      no numérico se guarda solo una cota de sus convertibles. Si al final la cota no
+      basta para decidir, pendientes() indica las columnas que hay que medir completas
+      con otra pasada (reiniciar_conversion + medir_conversion)
+
+    El resultado es un LimpiezaEstadoSchema que se aplica con transform().
+    """
+
+    def __init__(
+        self,
+        config: LimpiezaConfigSchema,
+        inferir_tipos: bool,
+        muestreo: bool = False,
+        no_numericas: Iterable[str] = (),
+    ) -> None:
+        self.config = config
+        self.inferir_tipos = inferir_tipos
+        self.muestreo = muestreo
+        self.no_numericas = set(no_numericas)
+        self.n_filas = 0
+        self.columnas: Optional[list[str]] = None
+        self.leida_numerica: dict[str, bool] = {}
+        self.leida_booleana: dict[str, bool] = {}
+        self.booleana_con_nulos: dict[str, bool] = {}
+        self._estadisticas: dict[tuple[str, bool], _EstadisticaColumna] = {}
+
+    def _estadistica(self, col: str, inferida: bool) -> _EstadisticaColumna:
+        clave = (col, inferida)
+        if clave not in self._estadisticas:
+            self._estadisticas[clave] = _EstadisticaColumna(self.config.estrategia_num)
+        return self._estadisticas[clave]
+
+    def _lectura(self, col: str) -> str:
+        """Tipo con que se lee la columna hasta ahora (numérica gana: una columna vacía es float64)."""
+        if self.leida_numerica[col]:
+            return "numerica"
+        return "booleana" if self.leida_booleana[col] else "texto"
+
+    def actualizar(self, bloque: pd.DataFrame) -> None:
+        if self.columnas is None:
+            self.columnas = list(bloque.columns)
+            self.leida_numerica = {col: self.inferir_tipos for col in self.columnas}
+            self.leida_booleana = {col: self.inferir_tipos for col in self.columnas}
+            self.booleana_con_nulos = {col: False for col in self.columnas}
+
+        self.n_filas += len(bloque)
+
+        for col in bloque.columns:
+            serie = bloque[col]
+            inferida = None
+
+            if self.leida_numerica[col]:
+                inferida = a_numerico(serie)
+                if (inferida.notna() != serie.notna()).any():
+                    # Las estadísticas inferidas hasta ahora son de bloques sin valores
+                    self.leida_numerica[col] = False
+                    self._estadisticas.pop((col, True), None)
+                    inferida = None
+
+            if self.leida_booleana[col]:
+                presentes = serie.dropna()
+                if not presentes.isin(list(BOOLEANOS)).all():
+                    self.leida_booleana[col] = False
+                    if inferida is None:
+                        self._estadisticas.pop((col, True), None)
+                else:
+                    self.booleana_con_nulos[col] |= len(presentes) < len(serie)
+                    if inferida is None:
+                        # Como object (True/False/NaN): si la columna no tiene nulos, estado() la deja bool
+                        inferida = a_booleano(serie, con_nulos=True)
+
+            # La conversión de la inferencia es la misma que mide la lectura como texto
+            convertida = inferida if self.leida_numerica[col] else None
+            self._actualizar_columna(col, serie, inferida=False, convertida=convertida)
+            if inferida is not None:
+                self._actualizar_columna(col, inferida, inferida=True)
+
+    def combinar(self, otro: "AcumuladorLimpieza") -> None:
+        """
+        Suma las estadísticas de otro acumulador que recorrió las filas siguientes
+        (fragmentos disjuntos, en orden). El estado resultante es el mismo que si
+        un solo acumulador hubiera visto todas las filas.
+        """
+        if otro.columnas is None:
+            return
+        if self.columnas is None:
+            self.columnas = list(otro.columnas)
+            self.leida_numerica = dict(otro.leida_numerica)
+            self.leida_booleana = dict(otro.leida_booleana)
+            self.booleana_con_nulos = dict(otro.booleana_con_nulos)
+
+        self.n_filas += otro.n_filas
+
+        # Las estadísticas inferidas de cada lado valen solo si se leyó con el tipo final
+        lectura_otro = {col: otro._lectura(col) for col in otro.columnas}
+        for col in otro.columnas:
+            lectura = self._lectura(col)
+            self.leida_numerica[col] &= otro.leida_numerica[col]
+            self.leida_booleana[col] &= otro.leida_booleana[col]
+            self.booleana_con_nulos[col] |= otro.booleana_con_nulos[col]
+            if self._lectura(col) != lectura:
+                self._estadisticas.pop((col, True), None)
+
+        for (col, inferida), est in otro._estadisticas.items():
+            if inferida and lectura_otro[col] != self._lectura(col):
+                continue
+            self._estadistica(col, inferida).combinar(est)
+
+    def a_dict(self) -> dict[str, Any]:
+        """
+        Estadísticas acumuladas serializables a JSON (modo incremental): con
+        desde_dict() se sigue acumulando en otra ejecución como si no se hubiera cortado.
+        """
+        return {
+            "inferir_tipos": self.inferir_tipos,
+            "muestreo": self.muestreo,
+            "n_filas": self.n_filas,
+            "columnas": self.columnas,
+            "leida_numerica": self.leida_numerica,
+            "leida_booleana": self.leida_booleana,
+            "booleana_con_nulos": self.booleana_con_nulos,
+            "estadisticas": [
+                {"columna": col, "inferida": inferida, **est.a_dict()}
+                for (col, inferida), est in self._estadisticas.items()
+            ],
+        }
+
+    @classmethod
+    def desde_dict(cls, config: LimpiezaConfigSchema, datos: dict[str, Any]) -> "AcumuladorLimpieza":
+        acumulador = cls(config, inferir_tipos=datos["inferir_tipos"], muestreo=datos.get("muestreo", False))
+        acumulador.n_filas = datos["n_filas"]
+        acumulador.columnas = datos["columnas"]
+        acumulador.leida_numerica = dict(datos["leida_numerica"])
+        # Checkpoints anteriores a la inferencia de booleanas: esas columnas siguen como texto
+        acumulador.leida_booleana = dict(datos.get("leida_booleana") or dict.fromkeys(acumulador.leida_numerica, False))
+        acumulador.booleana_con_nulos = dict(
+            datos.get("booleana_con_nulos") or dict.fromkeys(acumulador.leida_numerica, False)
+        )
+        for est in datos["estadisticas"]:
+            acumulador._estadistica(est["columna"], est["inferida"]).cargar(est)
+        return acumulador
+
+    def _actualizar_columna(
+        self, col: str, serie: pd.Series, inferida: bool, convertida: Optional[pd.Series] = None
+    ) -> None:
+        """
+        Replica los pasos 4-6 del pipeline sobre una columna y acumula estadísticas.
+        'convertida' es a_numerico(serie) si ya se calculó.
+        """
+        config = self.config
+        est = self._estadistica(col, inferida)
+
+        if config.columnas_monetarias and col in config.columnas_monetarias:
+            parcial = serie.to_frame()
+            limpiar_columnas_monetarias(parcial, [col])
+            serie = parcial[col]
+            convertida = None
+
+        objetivo = config.columnas_numericas_objetivo
+        if objetivo is not None and col in objetivo:
+            serie = a_numerico(serie)
+
+        # Las booleanas (ej: 'casi_duplicado') no se imputan ni se convierten, como en run()
+        if pd.api.types.is_bool_dtype(serie):
+            est.es_booleana = True
+            return
+
+        if pd.api.types.is_numeric_dtype(serie):
+            est.es_numerica = True
+            est.numerica.actualizar(serie)
+            return
+
+        est.es_numerica = False
+        if config.estrategia_cat == "moda":
+            est.conteos_texto = _sumar_conteos(est.conteos_texto, serie)
+
+        if objetivo is None and col not in self.no_numericas:
+            cota = None
+            if self.muestreo and convertida is None:
+                cota = cota_no_numerica(serie, config.umbral_conversion, a_numerico)
+            if cota is not None:
+                est.filas_omitidas += len(serie)
+                est.convertibles_max += math.ceil(cota * len(serie))
+            else:
+                self._sumar_convertida(est, serie, convertida)
+
+    @staticmethod
+    def _sumar_convertida(
+        est: _EstadisticaColumna, serie: pd.Series, convertida: Optional[pd.Series] = None
+    ) -> None:
+        if convertida is None:
+            convertida = a_numerico(serie)
+        est.convertibles += int(convertida.notna().sum())
+        est.convertida.actualizar(convertida)
+
+    def _estadistica_final(self, col: str) -> _EstadisticaColumna:
+        return self._estadistica(col, self._lectura(col) != "texto")
+
+    def pendientes(self) -> list[str]:
+        """
+        Columnas con bloques omitidos por muestreo cuya cota no basta para decidir
+        la conversión: hay que medirlas completas antes de llamar a estado().
+        """
+        if self.n_filas == 0:
+            return []
+        pendientes = []
+        for col in self.columnas or []:
+            est = self._estadistica_final(col)
+            if est.filas_omitidas and not est.es_numerica and not est.es_booleana:
+                if (est.convertibles + est.convertibles_max) / self.n_filas >= self.config.umbral_conversion:
+                    pendientes.append(col)
+        return pendientes
+
+    def reiniciar_conversion(self, columnas: Iterable[str]) -> None:
+        """Descarta lo acumulado de la conversión de 'columnas' para medirlas de nuevo con medir_conversion()."""
+        for col in columnas:
+            self._estadistica_final(col).reiniciar_conversion()
+
+    def medir_conversion(self, bloque: pd.DataFrame, columnas: Iterable[str]) -> None:
+        """Conversión completa de 'columnas' en un bloque ya preparado (pasada extra de pendientes())."""
+        for col in columnas:
+            serie = bloque[col]
+            if self._lectura(col) == "booleana":
+                serie = a_booleano(serie, con_nulos=True)
+            self._sumar_convertida(self._estadistica_final(col), serie)
+
+    def estado(self, columnas: Optional[dict[str, str]] = None) -> LimpiezaEstadoSchema:
+        """
+        Decide conversiones, valores de relleno y dtypes finales.
+        """
+        pendientes = self.pendientes()
+        if pendientes:
+            raise ValueError(f"Columnas sin medir por completo (pendientes()): {', '.join(pendientes)}.")
+        config = self.config
+        plan: dict[str, Any] = {
+            "inferidas": [],
+            "booleanas": [],
+            "convertir": [],
+            "rellenos": {},
+            "tipos": {},
+        }
+
+        for col in self.columnas or []:
+            lectura = self._lectura(col)
+            if lectura == "numerica":
+                plan["inferidas"].append(col)
+            elif lectura == "booleana":
+                plan["booleanas"].append(col)
+                if not self.booleana_con_nulos[col]:
+                    continue  # bool sin nulos: no se imputa ni se convierte, como en run()
+
+            est = self._estadistica(col, lectura != "texto")
+            if est.es_booleana:
+                continue
+            objetivo = config.columnas_numericas_objetivo
+
+            if objetivo is not None and col in objetivo:
+                plan["convertir"].append(col)
+
+            if est.es_numerica:
+                numerica = est.numerica
+            else:
+                ratio_ok = est.convertibles / self.n_filas if self.n_filas > 0 else np.nan
+                numerica = est.convertida if objetivo is None and ratio_ok >= config.umbral_conversion else None
+
+                if numerica is not None:
+                    plan["convertir"].append(col)
+
+            if numerica is not None:
+                plan["rellenos"][col] = _valor_nativo(numerica.relleno())
+                plan["tipos"][col] = "float64" if numerica.es_float else "int64"
+            elif config.estrategia_cat == "moda":
+                plan["rellenos"][col] = _valor_nativo(_moda_desde_conteos(est.conteos_texto))
+            else:
+                plan["rellenos"][col] = config.estrategia_cat
+
+        return LimpiezaEstadoSchema(
+            config=config,
+            n_filas_ajuste=self.n_filas,
+            columnas=columnas or {},
+            **plan,
+        )
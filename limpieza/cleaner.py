@@ -3,19 +3,55 @@
 
 
 from __future__ import annotations
-from typing import Any, Mapping, Optional
+from contextlib import nullcontext
+from typing import Any, Callable, Iterator, Mapping, Optional
+import numpy as np
 import pandas as pd
 
+from .arrow_io import a_arrow
+from .chunked import (
+    AcumuladorLimpieza,
+    FuenteBloques,
+    IndiceHashes,
+    _es_ruta,
+    _preparar_bloque,
+    columnas_no_numericas,
+    iterar_bloques,
+)
 
+from .dedup import IndiceDedup, descartar_vistos
+from .instrumentacion import MedidorEtapas, etapa
+from .paralelo import limpiar_en_paralelo, numero_de_workers
 from .pipeline import (
+    aplicar_estado,
+    compactar_tipos,
     convertir_a_numerico_seguro,
     convertir_vacios_a_nan,
+    eliminar_casi_duplicados,
     eliminar_duplicados,
     estandarizar_nombres_columnas,
     imputar_nulos,
     limpiar_columnas_monetarias,
+    mapear_nombres_columnas,
+    normalizar_texto,
 )
-from .schemas import LimpiezaConfigSchema, LimpiezaReporteSchema
+from .schemas import LimpiezaConfigSchema, LimpiezaEstadoSchema, LimpiezaReporteSchema
+
+
+def construir_preview(df: pd.DataFrame, formato: str = "records") -> list[dict[str, Any]] | dict[str, Any]:
+    """
+    Muestra del DataFrame en el mismo formato que acepta la API:
+    - records:  [{col: valor, ...}, ...]
+    - columnar: {"columns": [...], "data": {col: [...]}}
+    - split:    {"columns": [...], "data": [[...], ...]}
+    """
+    if formato == "records":
+        return df.to_dict(orient="records")
+    if formato == "columnar":
+        return {"columns": list(df.columns), "data": df.to_dict(orient="list")}
+    if formato == "split":
+        return {"columns": list(df.columns), "data": df.to_dict(orient="split", index=False)["data"]}
+    raise ValueError(f"formato_preview inválido: '{formato}' (use records, columnar o split).")
 
 
 class DataCleaner:
@@ -23,51 +59,360 @@ class DataCleaner:
     Encapsula el pipeline de limpieza en una clase con configuración validada por Pydantic.
     """
 
-    def __init__(self, config: Optional[LimpiezaConfigSchema | Mapping[str, Any]] = None) -> None:
-        if config is None:
+    def __init__(
+        self,
+        config: Optional[LimpiezaConfigSchema | Mapping[str, Any]] = None,
+        estado: Optional[LimpiezaEstadoSchema] = None,
+        indice_dedup: Optional[IndiceDedup] = None,
+    ) -> None:
+        if estado is not None:
+            self.config = estado.config
+        elif config is None:
             self.config = LimpiezaConfigSchema()
         elif isinstance(config, LimpiezaConfigSchema):
             self.config = config
         else:
             self.config = LimpiezaConfigSchema.model_validate(config)
 
+        self.estado = estado
+        # Índice persistente: descarta filas ya vistas en lotes anteriores
+        self.indice_dedup = indice_dedup
+
+    def _copia_de_trabajo(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Copia sobre la que trabaja el pipeline. Con backend="arrow" se convierte
+        a pd.ArrowDtype sin copiar buffers: las etapas reemplazan columnas
+        (los arreglos Arrow son inmutables), así que el original no cambia.
+
+        Con backend="numpy" la copia es superficial: con Copy-on-Write (pandas 3)
+        las etapas que modifican columnas o filas copian solo lo que cambian, en
+        lugar de duplicar todo el DataFrame al empezar.
+        """
+        if self.config.backend == "arrow":
+            return a_arrow(df)
+        return df.copy(deep=False)
+
+    def _bloques(self, fuente: FuenteBloques, chunksize: int) -> Iterator[pd.DataFrame]:
+        bloques = iterar_bloques(fuente, chunksize)
+        if self.config.backend == "arrow":
+            return (a_arrow(bloque) for bloque in bloques)
+        return bloques
+
+    def _quitar_casi_duplicados(self, df_work: pd.DataFrame) -> None:
+        """Paso 3b (opcional): avisos casi duplicados, después de los duplicados exactos."""
+        if self.config.casi_duplicados is not None:
+            eliminar_casi_duplicados(
+                df_work,
+                accion=self.config.casi_duplicados,
+                umbral=self.config.umbral_similitud,
+                tolerancia=self.config.tolerancia_casi_duplicados,
+            )
+
+    def _en_paralelo(
+        self, n_workers: int, estado: Optional[LimpiezaEstadoSchema], nuevos_dedup: list[np.ndarray]
+    ) -> Callable[[pd.DataFrame], pd.DataFrame]:
+        def limpiar(df_work: pd.DataFrame) -> pd.DataFrame:
+            return limpiar_en_paralelo(df_work, self.config, n_workers, estado, self.indice_dedup, nuevos_dedup)[0]
+
+        return limpiar
+
+    def _registrar_vistos(self, df_work: pd.DataFrame, nuevos_dedup: list[np.ndarray]) -> pd.DataFrame:
+        """
+        Con índice de duplicados, registra las filas del lote una vez que la limpieza
+        terminó bien: si una etapa falla, reintentar el lote no las descarta como vistas.
+        """
+        if self.indice_dedup is not None:
+            self.indice_dedup.registrar(nuevos_dedup)
+        return df_work
+
+    def _compactar(
+        self, ejecutar: Callable[..., pd.DataFrame], df_work: pd.DataFrame, memoria: Optional[dict[str, int]]
+    ) -> pd.DataFrame:
+        """Paso 7 (opcional): tipos compactos; 'memoria' recibe los bytes antes/después."""
+        if not self.config.compacto:
+            return df_work
+        return ejecutar("compactar_tipos", compactar_tipos, df_work, memoria=memoria)
+
+    def _normalizar_texto(self, ejecutar: Callable[..., pd.DataFrame], df_work: pd.DataFrame) -> pd.DataFrame:
+        """Paso 2b (opcional): valores de texto normalizados, antes de buscar duplicados."""
+        if not self.config.columnas_texto:
+            return df_work
+        return ejecutar("normalizar_texto", normalizar_texto, df_work, self.config.columnas_texto)
+
+    def _pasos_deduplicacion(
+        self, ejecutar: Callable[..., pd.DataFrame], df_work: pd.DataFrame, nuevos_dedup: list[np.ndarray]
+    ) -> pd.DataFrame:
+        """
+        Paso 3: duplicados exactos, filas de lotes anteriores y casi duplicados.
+        Los hashes de las filas nuevas quedan en 'nuevos_dedup' (ver _registrar_vistos).
+        """
+        df_work = ejecutar("eliminar_duplicados", eliminar_duplicados, df_work)
+        if self.indice_dedup is not None:
+            df_work = ejecutar("descartar_vistos", descartar_vistos, df_work, self.indice_dedup, nuevos=nuevos_dedup)
+        if self.config.casi_duplicados is not None:
+            df_work = ejecutar("eliminar_casi_duplicados", self._quitar_casi_duplicados, df_work)
+        return df_work
+
     def run(self, df: pd.DataFrame) -> pd.DataFrame:
-        df_work = df.copy()
+        return self._run(df, None)
+
+    def _run(
+        self, df: pd.DataFrame, medidor: Optional[MedidorEtapas], memoria: Optional[dict[str, int]] = None
+    ) -> pd.DataFrame:
+        ejecutar = etapa(medidor)
+        nuevos_dedup: list[np.ndarray] = []
+        n_workers = numero_de_workers(self.config.n_jobs, len(df))
+        if n_workers > 1:
+            # Las etapas corren por fragmento: se mide el conjunto
+            df_work = ejecutar(
+                "limpiar_en_paralelo", self._en_paralelo(n_workers, None, nuevos_dedup), self._copia_de_trabajo(df)
+            )
+            return self._registrar_vistos(self._compactar(ejecutar, df_work, memoria), nuevos_dedup)
 
-        estandarizar_nombres_columnas(df_work)
-        convertir_vacios_a_nan(df_work)
-        eliminar_duplicados(df_work)
+        df_work = self._copia_de_trabajo(df)
+
+        df_work = ejecutar("estandarizar_nombres_columnas", estandarizar_nombres_columnas, df_work)
+        df_work = ejecutar("convertir_vacios_a_nan", convertir_vacios_a_nan, df_work)
+        df_work = self._normalizar_texto(ejecutar, df_work)
+        df_work = self._pasos_deduplicacion(ejecutar, df_work, nuevos_dedup)
 
         if self.config.columnas_monetarias:
-            limpiar_columnas_monetarias(df_work, self.config.columnas_monetarias)
+            df_work = ejecutar(
+                "limpiar_columnas_monetarias", limpiar_columnas_monetarias, df_work, self.config.columnas_monetarias
+            )
 
-        convertir_a_numerico_seguro(
+        df_work = ejecutar(
+            "convertir_a_numerico_seguro",
+            convertir_a_numerico_seguro,
             df_work,
             columnas_objetivo=self.config.columnas_numericas_objetivo,
             umbral_conversion=self.config.umbral_conversion,
         )
 
-        imputar_nulos(
+        df_work = ejecutar(
+            "imputar_nulos",
+            imputar_nulos,
             df_work,
             estrategia_num=self.config.estrategia_num,
             estrategia_cat=self.config.estrategia_cat,
         )
 
-        return df_work
+        return self._registrar_vistos(self._compactar(ejecutar, df_work, memoria), nuevos_dedup)
+
+    def fit(self, df: pd.DataFrame, estado_id: Optional[str] = None) -> LimpiezaEstadoSchema:
+        """
+        Calcula el estado ajustado (mapeo de columnas, conversiones y rellenos)
+        y lo guarda en self.estado. Es serializable con model_dump_json().
+        """
+        columnas = mapear_nombres_columnas(df.columns)
+        # Con índice de duplicados solo se consulta: se actualiza en transform()
+        df_work = _preparar_bloque(
+            self._copia_de_trabajo(df),
+            IndiceHashes(),
+            columnas,
+            self.indice_dedup,
+            columnas_texto=self.config.columnas_texto,
+        )
+        self._quitar_casi_duplicados(df_work)
+        # La columna completa está en memoria: se decide con la muestra, como en run()
+        acumulador = AcumuladorLimpieza(
+            self.config,
+            inferir_tipos=False,
+            no_numericas=columnas_no_numericas([df_work], self.config),
+        )
+        acumulador.actualizar(df_work)
+
+        self.estado = acumulador.estado(columnas)
+        if estado_id is not None:
+            self.estado.id = estado_id
+        return self.estado
+
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Limpia df en una sola pasada usando el estado ajustado, sin recalcular estadísticas.
+        """
+        return self._transform(df, None)
+
+    def _transform(
+        self, df: pd.DataFrame, medidor: Optional[MedidorEtapas], memoria: Optional[dict[str, int]] = None
+    ) -> pd.DataFrame:
+        if self.estado is None:
+            raise ValueError("DataCleaner no tiene estado ajustado: llame a fit() o pase estado=.")
+
+        ejecutar = etapa(medidor)
+        nuevos_dedup: list[np.ndarray] = []
+        n_workers = numero_de_workers(self.config.n_jobs, len(df))
+        if n_workers > 1:
+            df_work = ejecutar(
+                "limpiar_en_paralelo",
+                self._en_paralelo(n_workers, self.estado, nuevos_dedup),
+                self._copia_de_trabajo(df),
+            )
+            return self._registrar_vistos(self._compactar(ejecutar, df_work, memoria), nuevos_dedup)
+
+        df_work = self._copia_de_trabajo(df)
+
+        df_work = ejecutar("estandarizar_nombres_columnas", estandarizar_nombres_columnas, df_work, self.estado.columnas)
+        df_work = ejecutar("convertir_vacios_a_nan", convertir_vacios_a_nan, df_work)
+        df_work = self._normalizar_texto(ejecutar, df_work)
+        df_work = self._pasos_deduplicacion(ejecutar, df_work, nuevos_dedup)
+        df_work = ejecutar("aplicar_estado", aplicar_estado, df_work, self.estado)
+
+        return self._registrar_vistos(self._compactar(ejecutar, df_work, memoria), nuevos_dedup)
 
     def run_with_report(
-        self, df: pd.DataFrame, preview_rows: int = 5
+        self,
+        df: pd.DataFrame,
+        preview_rows: int = 5,
+        formato_preview: str = "records",
+        etapas: bool = False,
+        memoria: bool = False,
+        medidor: Optional[MedidorEtapas] = None,
     ) -> tuple[pd.DataFrame, LimpiezaReporteSchema]:
+        """
+        Ejecuta la limpieza y arma el reporte. 'formato_preview' define la forma
+        de la muestra: 'records' (lista de dicts), 'columnar' o 'split'.
+
+        etapas=True agrega al reporte el tiempo, las filas y las celdas afectadas
+        por cada etapa; memoria=True suma el pico de memoria por etapa (tracemalloc,
+        con un costo notable). Sin etapas no hay ninguna medición adicional.
+        Con config.compacto el reporte incluye la memoria antes y después de compactar.
+
+        'medidor' permite pasar un MedidorEtapas propio (ej: solo tiempos para las
+        métricas de la API); sus etapas van al reporte solo si etapas=True.
+        """
         n_in = len(df)
-        df_out = self.run(df)
+        if medidor is None and (etapas or memoria):
+            medidor = MedidorEtapas(memoria=memoria)
+        bytes_memoria: dict[str, int] = {}
+        with medidor or nullcontext():
+            if self.estado is not None:
+                df_out = self._transform(df, medidor, bytes_memoria)
+            else:
+                df_out = self._run(df, medidor, bytes_memoria)
         n_out = len(df_out)
 
-        preview = df_out.head(preview_rows).to_dict(orient="records") if preview_rows > 0 else []
+        preview = construir_preview(df_out.head(max(preview_rows, 0)), formato_preview)
 
         reporte = LimpiezaReporteSchema(
             n_filas_entrada=n_in,
             n_filas_salida=n_out,
             columnas=list(df_out.columns),
             preview=preview,
+            memoria_antes_bytes=bytes_memoria.get("antes"),
+            memoria_despues_bytes=bytes_memoria.get("despues"),
+            etapas=medidor.etapas if medidor is not None and (etapas or memoria) else None,
         )
-        return df_out, reporte
\ No newline at end of file
+        return df_out, reporte
+
+    def run_chunked(self, fuente: FuenteBloques, chunksize: int = 100_000) -> Iterator[pd.DataFrame]:
+        """
+        Limpia la fuente por bloques sin cargarla completa en memoria.
+
+        - Pasada 1: acumula tipos, proporciones convertibles y valores de relleno
+          de esta fuente. Se omite solo si el cleaner tiene un estado (estado= o
+          fit()/fit_chunked()); el de la pasada 1 no se guarda en self.estado, así
+          que cada llamada se ajusta a su propia fuente.
+        - Pasada 2: aplica esas decisiones globales bloque a bloque.
+
+        El resultado concatenado coincide con run() sobre los datos completos.
+        La memoria depende de chunksize y de la cardinalidad de las columnas
+        (conteos para medianas/modas, 8 bytes por fila única para duplicados).
+        """
+        estado = self.estado if self.estado is not None else self._ajustar_por_bloques(fuente, chunksize)
+        return self._transform_por_bloques(fuente, chunksize, estado)
+
+    def _validar_por_bloques(self) -> None:
+        # Ambas opciones necesitan ver todas las filas: grupos entre bloques y
+        # tipos/categorías iguales en todos los bloques
+        if self.config.casi_duplicados is not None:
+            raise ValueError("casi_duplicados no está disponible por bloques: use run() o fit()/transform().")
+        if self.config.compacto:
+            raise ValueError("compacto no está disponible por bloques: use run() o fit()/transform().")
+
+    def fit_chunked(
+        self,
+        fuente: FuenteBloques,
+        chunksize: int = 100_000,
+        acumulador: Optional[AcumuladorLimpieza] = None,
+    ) -> LimpiezaEstadoSchema:
+        """
+        Equivalente a fit() recorriendo la fuente por bloques (pasada 1 de run_chunked).
+
+        'acumulador' continúa las estadísticas de ejecuciones anteriores (modo
+        incremental): el estado resultante es el de todas las filas vistas.
+        """
+        self.estado = self._ajustar_por_bloques(fuente, chunksize, acumulador)
+        return self.estado
+
+    def _ajustar_por_bloques(
+        self,
+        fuente: FuenteBloques,
+        chunksize: int,
+        acumulador: Optional[AcumuladorLimpieza] = None,
+    ) -> LimpiezaEstadoSchema:
+        self._validar_por_bloques()
+
+        if acumulador is None:
+            acumulador = AcumuladorLimpieza(self.config, inferir_tipos=_es_ruta(fuente), muestreo=True)
+        columnas: Optional[dict[str, str]] = None
+
+        def preparados() -> Iterator[pd.DataFrame]:
+            nonlocal columnas
+            indice = IndiceHashes()
+            for bloque in self._bloques(fuente, chunksize):
+                if columnas is None:
+                    columnas = mapear_nombres_columnas(bloque.columns)
+                yield _preparar_bloque(
+                    bloque,
+                    indice,
+                    columnas,
+                    self.indice_dedup,
+                    columnas_texto=self.config.columnas_texto,
+                )
+
+        for bloque in preparados():
+            acumulador.actualizar(bloque)
+
+        # Columnas con bloques descartados por muestreo pero cerca del umbral en total:
+        # una pasada más solo para medir su conversión completa
+        pendientes = acumulador.pendientes()
+        if pendientes:
+            acumulador.reiniciar_conversion(pendientes)
+            for bloque in preparados():
+                acumulador.medir_conversion(bloque, pendientes)
+
+        return acumulador.estado(columnas)
+
+    def _transform_por_bloques(
+        self,
+        fuente: FuenteBloques,
+        chunksize: int,
+        estado: Optional[LimpiezaEstadoSchema] = None,
+        nuevos_dedup: Optional[list[np.ndarray]] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Pasada 2 por bloques. Las filas nuevas se registran en el índice de duplicados
+        al terminar la iteración; con 'nuevos_dedup' sus hashes se dejan ahí y el
+        llamador las registra cuando guardó la salida.
+        """
+        self._validar_por_bloques()
+
+        estado = estado or self.estado
+        indice = IndiceHashes()
+        pendientes: list[np.ndarray] = [] if nuevos_dedup is None else nuevos_dedup
+
+        for bloque in self._bloques(fuente, chunksize):
+            bloque = _preparar_bloque(
+                bloque,
+                indice,
+                estado.columnas,
+                self.indice_dedup,
+                pendientes,
+                columnas_texto=self.config.columnas_texto,
+            )
+            aplicar_estado(bloque, estado)
+            yield bloque
+
+        if self.indice_dedup is not None and nuevos_dedup is None:
+            self.indice_dedup.registrar(pendientes)
@@ -0,0 +1,260 @@
+## Índice persistente de duplicados entre lotes: un conjunto de hashes de 64 bits
+# por fila, guardado en una tabla hash (direccionamiento abierto) sobre un archivo
+# con memory-map, con un filtro de Bloom opcional en memoria delante.
+# Detecta filas ya vistas en llamadas anteriores a /limpiar o en CSV de otros días.
+
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+Ruta = Union[str, "os.PathLike[str]"]
+
+## Encabezado del archivo (4 x uint64): firma, versión, capacidad, número de hashes.
+_FIRMA = 0x4C494D5044454455  # "LIMPDEDU"
+_VERSION = 1
+_ENCABEZADO = 4
+
+_CARGA_MAXIMA = 0.7
+_BITS_BLOOM_POR_HASH = 10
+_FUNCIONES_BLOOM = 7
+
+
+def hash_filas_normalizadas(df: pd.DataFrame) -> np.ndarray:
+    """
+    Hash de 64 bits por fila sobre las columnas ya normalizadas (nombres estándar
+    y vacíos como NaN), en orden alfabético para que no dependa del orden de llegada.
+    El 0 se reserva para las casillas vacías de la tabla.
+    """
+    hashes = pd.util.hash_pandas_object(df[sorted(df.columns)], index=False).to_numpy(dtype=np.uint64)
+    return np.where(hashes == 0, np.uint64(1), hashes)
+
+
+def _potencia_de_2(n: int) -> int:
+    return 1 << max(int(n) - 1, 1).bit_length()
+
+
+# -------------------------------------------------
+# 1) Filtro de Bloom
+# -------------------------------------------------
+class FiltroBloom:
+    """
+    Filtro de Bloom en memoria (~1,25 bytes por hash, ~1% de falsos positivos).
+    Las posiciones salen del mismo hash de 64 bits (doble hashing).
+    """
+
+    def __init__(self, capacidad: int) -> None:
+        self.n_bits = _potencia_de_2(capacidad * _BITS_BLOOM_POR_HASH)
+        self.bits = np.zeros(self.n_bits // 8, dtype=np.uint8)
+
+    def _posiciones(self, hashes: np.ndarray) -> np.ndarray:
+        h1 = hashes & np.uint64(0xFFFFFFFF)
+        h2 = (hashes >> np.uint64(32)) | np.uint64(1)
+        i = np.arange(_FUNCIONES_BLOOM, dtype=np.uint64)
+        return ((h1[:, None] + i * h2[:, None]) & np.uint64(self.n_bits - 1)).astype(np.int64)
+
+    def agregar(self, hashes: np.ndarray) -> None:
+        pos = self._posiciones(hashes).ravel()
+        np.bitwise_or.at(self.bits, pos >> 3, (1 << (pos & 7)).astype(np.uint8))
+
+    def puede_contener(self, hashes: np.ndarray) -> np.ndarray:
+        pos = self._posiciones(hashes)
+        return ((self.bits[pos >> 3] >> (pos & 7)) & 1).all(axis=1).astype(bool)
+
+
+# -------------------------------------------------
+# 2) Tabla hash persistente
+# -------------------------------------------------
+class IndiceDedup:
+    """
+    Conjunto persistente de hashes de fila para descartar duplicados entre lotes.
+
+    - Tabla de direccionamiento abierto (sondeo lineal) en un archivo con memory-map:
+      consultas O(1) por fila, vectorizadas con NumPy
+    - 11-23 bytes por fila única en disco (carga entre 0,35 y 0,7); crece duplicando la capacidad
+    - bloom=True: filtro de Bloom en memoria (1,5-3 bytes por fila) delante de la tabla;
+      las filas nuevas (la mayoría) se descartan sin leer el archivo
+
+    Es seguro entre hilos de un mismo proceso; no comparta el archivo entre procesos.
+    """
+
+    def __init__(self, ruta: Ruta, capacidad_inicial: int = 1 << 16, bloom: bool = True) -> None:
+        self.ruta = Path(ruta)
+        self._lock = threading.Lock()
+
+        if not self.ruta.exists():
+            self._crear(self.ruta, _potencia_de_2(capacidad_inicial))
+        self._abrir()
+
+        self.bloom: Optional[FiltroBloom] = None
+        if bloom:
+            self.bloom = FiltroBloom(self._max_hashes(self.capacidad))
+            self.bloom.agregar(self._hashes_guardados())
+
+    # ---- archivo ----
+    @staticmethod
+    def _crear(ruta: Path, capacidad: int) -> np.memmap:
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        datos = np.memmap(ruta, dtype=np.uint64, mode="w+", shape=(_ENCABEZADO + capacidad,))
+        datos[:_ENCABEZADO] = [_FIRMA, _VERSION, capacidad, 0]
+        return datos
+
+    def _abrir(self) -> None:
+        self._datos = np.memmap(self.ruta, dtype=np.uint64, mode="r+")
+        firma, version, capacidad, _ = self._datos[:_ENCABEZADO]
+        if firma != _FIRMA or version != _VERSION or len(self._datos) != _ENCABEZADO + capacidad:
+            raise ValueError(f"'{self.ruta}' no es un índice de duplicados válido.")
+        self._tabla = self._datos[_ENCABEZADO:]
+
+    @staticmethod
+    def _max_hashes(capacidad: int) -> int:
+        return int(_CARGA_MAXIMA * capacidad)
+
+    @property
+    def capacidad(self) -> int:
+        return len(self._tabla)
+
+    def __len__(self) -> int:
+        return int(self._datos[3])
+
+    def _hashes_guardados(self) -> np.ndarray:
+        return self._tabla[self._tabla != 0]
+
+    # ---- sondeo lineal vectorizado ----
+    @staticmethod
+    def _buscar(tabla: np.ndarray, hashes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Retorna (encontrados, casilla_vacia): si cada hash está en la tabla y,
+        si no está, la primera casilla vacía de su secuencia de sondeo.
+        """
+        mascara = len(tabla) - 1
+        pos = (hashes & np.uint64(mascara)).astype(np.int64)
+        encontrados = np.zeros(len(hashes), dtype=bool)
+        casilla_vacia = np.full(len(hashes), -1, dtype=np.int64)
+        pendientes = np.arange(len(hashes))
+
+        while len(pendientes):
+            valores = tabla[pos[pendientes]]
+            coincide = valores == hashes[pendientes]
+            vacia = valores == 0
+
+            encontrados[pendientes[coincide]] = True
+            casilla_vacia[pendientes[vacia]] = pos[pendientes[vacia]]
+
+            pendientes = pendientes[~(coincide | vacia)]
+            pos[pendientes] = (pos[pendientes] + 1) & mascara
+
+        return encontrados, casilla_vacia
+
+    @classmethod
+    def _insertar(cls, tabla: np.ndarray, nuevos: np.ndarray) -> None:
+        """Inserta hashes únicos que no están en la tabla."""
+        while len(nuevos):
+            _, casillas = cls._buscar(tabla, nuevos)
+            # Si varios hashes apuntan a la misma casilla vacía, entra el primero
+            # y los demás siguen sondeando en la próxima vuelta
+            _, primeros = np.unique(casillas, return_index=True)
+            tabla[casillas[primeros]] = nuevos[primeros]
+            quedan = np.ones(len(nuevos), dtype=bool)
+            quedan[primeros] = False
+            nuevos = nuevos[quedan]
+
+    def _crecer(self, minimo: int) -> None:
+        """
+        Reconstruye la tabla con capacidad suficiente para 'minimo' hashes en un
+        archivo temporal y lo reemplaza al terminar (el índice nunca queda a medias).
+        """
+        capacidad = self.capacidad
+        while minimo > self._max_hashes(capacidad):
+            capacidad *= 2
+
+        guardados = self._hashes_guardados()
+        temporal = self.ruta.with_suffix(self.ruta.suffix + ".tmp")
+        nuevo = self._crear(temporal, capacidad)
+        self._insertar(nuevo[_ENCABEZADO:], guardados)
+        nuevo[3] = len(guardados)
+        nuevo.flush()
+        del nuevo
+
+        os.replace(temporal, self.ruta)
+        self._abrir()
+
+        if self.bloom is not None:
+            self.bloom = FiltroBloom(self._max_hashes(capacidad))
+            self.bloom.agregar(guardados)
+
+    # ---- API pública ----
+    def contiene(self, hashes: np.ndarray) -> np.ndarray:
+        """Marca los hashes que ya están en el índice."""
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        with self._lock:
+            return self._contiene(hashes)
+
+    def _contiene(self, hashes: np.ndarray) -> np.ndarray:
+        encontrados = np.zeros(len(hashes), dtype=bool)
+        candidatos = np.arange(len(hashes))
+        if self.bloom is not None:
+            candidatos = candidatos[self.bloom.puede_contener(hashes)]
+        if len(candidatos):
+            encontrados[candidatos] = self._buscar(self._tabla, hashes[candidatos])[0]
+        return encontrados
+
+    def marcar_vistos(self, hashes: np.ndarray, actualizar: bool = True) -> np.ndarray:
+        """
+        Marca las filas ya vistas en lotes anteriores y, si 'actualizar',
+        registra las demás. Consulta y registro son una sola operación atómica.
+        """
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        with self._lock:
+            vistos = self._contiene(hashes)
+            if actualizar:
+                nuevos = np.unique(hashes[~vistos])
+                if len(nuevos):
+                    if len(self) + len(nuevos) > self._max_hashes(self.capacidad):
+                        self._crecer(len(self) + len(nuevos))
+                    self._insertar(self._tabla, nuevos)
+                    self._datos[3] += len(nuevos)
+                    if self.bloom is not None:
+                        self.bloom.agregar(nuevos)
+                    self._datos.flush()
+            return vistos
+
+    def registrar(self, partes: Iterable[np.ndarray]) -> None:
+        """
+        Registra los hashes de filas ya limpiadas (ej: los que junta _preparar_bloque
+        con 'nuevos_dedup'). Se llama cuando el lote terminó bien, para que un fallo
+        a mitad de camino no deje filas registradas que nunca se escribieron.
+        """
+        partes = [np.asarray(parte, dtype=np.uint64) for parte in partes]
+        if partes:
+            self.marcar_vistos(np.concatenate(partes))
+
+    def cerrar(self) -> None:
+        with self._lock:
+            self._datos.flush()
+
+
+def descartar_vistos(
+    df: pd.DataFrame,
+    indice: IndiceDedup,
+    actualizar: bool = True,
+    nuevos: Optional[list[np.ndarray]] = None,
+) -> pd.DataFrame:
+    """
+    Quita de df las filas ya registradas en el índice (lotes anteriores)
+    y registra las restantes si 'actualizar'. Con 'nuevos' el índice solo se
+    consulta: los hashes de las filas restantes se agregan a la lista para
+    registrarlos con IndiceDedup.registrar() cuando el lote termine bien.
+    """
+    if len(df) == 0:
+        return df
+    hashes = hash_filas_normalizadas(df)
+    vistos = indice.marcar_vistos(hashes, actualizar=actualizar and nuevos is None)
+    if nuevos is not None:
+        nuevos.append(hashes[~vistos])
+    return df.loc[~vistos] if vistos.any() else df
@@ -0,0 +1,321 @@
+## Limpieza incremental de un CSV al que solo se agregan filas (ej: avisos nuevos
+# cada noche): un punto de control guarda el byte hasta donde se limpió, el estado
+# en uso, las estadísticas acumuladas y el índice de duplicados, y cada ejecución
+# limpia solo la cola nueva. El tiempo es proporcional a las filas nuevas.
+
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+from pathlib import Path
+from typing import Any, Iterator, Mapping, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .arrow_io import a_tabla, requerir_pyarrow
+from .chunked import AcumuladorLimpieza
+from .cleaner import DataCleaner
+from .dedup import IndiceDedup
+from .schemas import (
+    CheckpointIncrementalSchema,
+    IncrementalReporteSchema,
+    LimpiezaConfigSchema,
+    LimpiezaEstadoSchema,
+)
+
+try:  # pyarrow es opcional: solo para la salida en partes Parquet
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover
+    pq = None
+
+Ruta = Union[str, "os.PathLike[str]"]
+
+BYTES_HUELLA = 1 << 20
+_BLOQUE_LECTURA = 1 << 16
+
+
+# -------------------------------------------------
+# 1) Lectura de la cola del CSV
+# -------------------------------------------------
+class _LectorAcotado(io.RawIOBase):
+    """Lee a lo más 'n' bytes de un archivo ya posicionado (la cola sin la última línea incompleta)."""
+
+    def __init__(self, archivo: io.BufferedReader, n: int) -> None:
+        self.archivo = archivo
+        self.restantes = n
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, destino: Any) -> int:
+        if self.restantes <= 0:
+            return 0
+        vista = memoryview(destino)[: self.restantes]
+        n = self.archivo.readinto(vista)
+        self.restantes -= n
+        return n
+
+
+def _inicio_datos(ruta: Ruta) -> int:
+    """Byte donde empiezan las filas (después del encabezado)."""
+    with open(ruta, "rb") as f:
+        f.readline()
+        return f.tell()
+
+
+def _fin_ultima_linea(ruta: Ruta, inicio: int) -> int:
+    """
+    Byte siguiente al último salto de línea después de 'inicio': una fila que se
+    está escribiendo (sin salto de línea final) se deja para la próxima ejecución.
+    """
+    with open(ruta, "rb") as f:
+        fin = f.seek(0, os.SEEK_END)
+        while fin > inicio:
+            desde = max(inicio, fin - _BLOQUE_LECTURA)
+            f.seek(desde)
+            pos = f.read(fin - desde).rfind(b"\n")
+            if pos >= 0:
+                return desde + pos + 1
+            fin = desde
+    return inicio
+
+
+def huella_archivo(ruta: Ruta, offset: int) -> str:
+    """SHA-256 de los primeros min(offset, 1 MiB) bytes: cambia si el archivo se reescribió."""
+    with open(ruta, "rb") as f:
+        return hashlib.sha256(f.read(min(offset, BYTES_HUELLA))).hexdigest()
+
+
+def leer_tramo_csv(
+    ruta: Ruta, encabezado: list[str], inicio: int, fin: int, chunksize: int = 100_000
+) -> Iterator[pd.DataFrame]:
+    """Bloques (todas las columnas como texto) de las filas entre los bytes inicio y fin."""
+    if fin <= inicio:
+        return
+    with open(ruta, "rb") as f:
+        f.seek(inicio)
+        tramo = io.BufferedReader(_LectorAcotado(f, fin - inicio))
+        with pd.read_csv(
+            tramo, encoding="utf-8", dtype=str, header=None, names=encabezado, chunksize=chunksize
+        ) as lector:
+            yield from lector
+
+
+# -------------------------------------------------
+# 2) Deriva de los rellenos
+# -------------------------------------------------
+def deriva_rellenos(actual: LimpiezaEstadoSchema, nuevo: LimpiezaEstadoSchema) -> float:
+    """
+    Máxima deriva entre los rellenos del estado en uso y los recalculados:
+    cambio relativo para los numéricos y 1 si cambió un relleno categórico.
+    """
+    deriva = 0.0
+    for col, valor in nuevo.rellenos.items():
+        previo = actual.rellenos.get(col)
+        numericos = all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in (valor, previo))
+        if numericos:
+            deriva = max(deriva, abs(valor - previo) / max(abs(previo), 1e-12))
+        elif valor != previo:
+            deriva = max(deriva, 1.0)
+    return deriva
+
+
+def _cambio_de_tipos(actual: LimpiezaEstadoSchema, nuevo: LimpiezaEstadoSchema) -> bool:
+    tipos_actuales = (actual.inferidas, actual.booleanas, actual.convertir, actual.tipos)
+    return tipos_actuales != (nuevo.inferidas, nuevo.booleanas, nuevo.convertir, nuevo.tipos)
+
+
+# -------------------------------------------------
+# 3) Salida: CSV al que se agregan filas o partes Parquet
+# -------------------------------------------------
+def _es_salida_csv(salida: Ruta) -> bool:
+    return Path(salida).suffix.lower() == ".csv"
+
+
+def _escribir_csv(bloques: Iterator[pd.DataFrame], salida: Path, reemplazar: bool) -> int:
+    """Agrega los bloques a 'salida'; si algo falla, el archivo vuelve a su tamaño anterior."""
+    filas = 0
+    encabezado = reemplazar or not salida.exists()
+    modo = "w" if reemplazar else "a"
+    tamano_previo = 0 if encabezado else salida.stat().st_size
+    try:
+        for bloque in bloques:
+            bloque.to_csv(salida, mode=modo, header=encabezado, index=False, encoding="utf-8")
+            filas += len(bloque)
+            encabezado, modo = False, "a"
+    except BaseException:
+        if salida.exists():
+            with open(salida, "r+b") as archivo:
+                archivo.truncate(tamano_previo)
+        raise
+    return filas
+
+
+def _escribir_parte(bloques: Iterator[pd.DataFrame], ruta: Path) -> int:
+    """Escribe los bloques en una parte Parquet nueva (se descarta si no hay filas)."""
+    requerir_pyarrow()
+    filas = 0
+    escritor = None
+    temporal = ruta.with_suffix(".tmp")
+    try:
+        for bloque in bloques:
+            if len(bloque) == 0:
+                continue
+            tabla = a_tabla(bloque)
+            if escritor is None:
+                escritor = pq.ParquetWriter(temporal, tabla.schema)
+            escritor.write_table(tabla.cast(escritor.schema))
+            filas += len(bloque)
+    except BaseException:
+        if escritor is not None:
+            escritor.close()
+        temporal.unlink(missing_ok=True)
+        raise
+    if escritor is not None:
+        escritor.close()
+        os.replace(temporal, ruta)
+    return filas
+
+
+# -------------------------------------------------
+# 4) Ejecución incremental
+# -------------------------------------------------
+def _guardar_checkpoint(ruta: Path, checkpoint: CheckpointIncrementalSchema) -> None:
+    temporal = ruta.with_suffix(ruta.suffix + ".tmp")
+    temporal.write_text(checkpoint.model_dump_json(), encoding="utf-8")
+    os.replace(temporal, ruta)
+
+
+def _reiniciar(ruta_checkpoint: Path, ruta_dedup: Path, salida: Path) -> None:
+    ruta_checkpoint.unlink(missing_ok=True)
+    ruta_dedup.unlink(missing_ok=True)
+    if not _es_salida_csv(salida) and salida.is_dir():
+        for parte in salida.glob("parte-*.parquet"):
+            parte.unlink()
+
+
+def limpiar_incremental(
+    ruta_csv: Ruta,
+    salida: Ruta,
+    checkpoint: Ruta,
+    config: Optional[LimpiezaConfigSchema | Mapping[str, Any]] = None,
+    chunksize: int = 100_000,
+    umbral_deriva: float = 0.05,
+    reiniciar: bool = False,
+) -> IncrementalReporteSchema:
+    """
+    Limpia solo las filas agregadas a 'ruta_csv' desde la ejecución anterior.
+
+    - Sin checkpoint (o reiniciar=True) se limpia el archivo completo, igual que run_chunked
+    - salida '.csv': las filas limpias se agregan al final; otra ruta es un
+      directorio donde cada ejecución escribe una parte 'parte-00001.parquet'
+    - Las estadísticas de imputación se acumulan con cada cola; los rellenos del
+      estado solo se recalculan si su deriva supera 'umbral_deriva' (o si cambian
+      los tipos, ej: texto en una columna numérica). Las filas ya escritas no cambian
+    - Los duplicados se descartan contra todas las filas anteriores (IndiceDedup
+      en '<checkpoint>.dedup'). Las filas de la cola se registran en el índice solo
+      después de escribir la salida, junto con el checkpoint: si la ejecución falla,
+      la siguiente vuelve a limpiar la misma cola sin perder filas
+
+    El archivo solo debe crecer por el final; si se reescribió (cambia el
+    encabezado o el inicio) se lanza ValueError: use reiniciar=True.
+    """
+    salida = Path(salida)
+    ruta_checkpoint = Path(checkpoint)
+    ruta_dedup = ruta_checkpoint.with_name(ruta_checkpoint.name + ".dedup")
+    if reiniciar or not ruta_checkpoint.exists():
+        _reiniciar(ruta_checkpoint, ruta_dedup, salida)
+
+    encabezado = list(pd.read_csv(ruta_csv, encoding="utf-8", nrows=0).columns)
+    previo: Optional[CheckpointIncrementalSchema] = None
+    if ruta_checkpoint.exists():
+        previo = CheckpointIncrementalSchema.model_validate_json(ruta_checkpoint.read_text(encoding="utf-8"))
+        if config is not None and LimpiezaConfigSchema.model_validate(config) != previo.estado.config:
+            raise ValueError("La configuración no coincide con la del checkpoint: use reiniciar=True.")
+        if (
+            encabezado != previo.encabezado
+            or os.path.getsize(ruta_csv) < previo.offset_bytes
+            or huella_archivo(ruta_csv, previo.offset_bytes) != previo.huella
+        ):
+            raise ValueError(f"'{ruta_csv}' no es una extensión del archivo ya procesado: use reiniciar=True.")
+
+    inicio = previo.offset_bytes if previo is not None else _inicio_datos(ruta_csv)
+    fin = _fin_ultima_linea(ruta_csv, inicio)
+    if previo is not None and fin == inicio:
+        return IncrementalReporteSchema(
+            filas_leidas=0, filas_escritas=0, filas_totales=previo.filas_leidas, offset_bytes=inicio
+        )
+
+    def tramo() -> Iterator[pd.DataFrame]:
+        return leer_tramo_csv(ruta_csv, encabezado, inicio, fin, chunksize)
+
+    filas_leidas = 0
+
+    def tramo_contado() -> Iterator[pd.DataFrame]:
+        nonlocal filas_leidas
+        for bloque in tramo():
+            filas_leidas += len(bloque)
+            yield bloque
+
+    indice_dedup = IndiceDedup(ruta_dedup)
+    try:
+        # Pasada 1: estadísticas de la cola sumadas a las acumuladas
+        if previo is None:
+            cleaner = DataCleaner(config, indice_dedup=indice_dedup)
+            # Sin muestreo: una pasada extra no podría releer las colas de ejecuciones anteriores
+            acumulador = AcumuladorLimpieza(cleaner.config, inferir_tipos=True, muestreo=False)
+        else:
+            cleaner = DataCleaner(estado=previo.estado, indice_dedup=indice_dedup)
+            acumulador = AcumuladorLimpieza.desde_dict(cleaner.config, previo.estadisticas)
+        candidato = cleaner.fit_chunked(tramo_contado, chunksize, acumulador)
+
+        reporte = IncrementalReporteSchema(filas_leidas=0, filas_escritas=0, filas_totales=0, offset_bytes=fin)
+        if previo is None:
+            reporte.reajustado, reporte.motivo = True, "inicial"
+        else:
+            reporte.deriva = round(deriva_rellenos(previo.estado, candidato), 6)
+            if _cambio_de_tipos(previo.estado, candidato):
+                reporte.reajustado, reporte.motivo = True, "tipos"
+            elif reporte.deriva > umbral_deriva:
+                reporte.reajustado, reporte.motivo = True, "deriva"
+            else:
+                cleaner.estado = previo.estado
+
+        # Pasada 2: la cola limpia con el estado en uso (sus filas se registran al final)
+        nuevos_dedup: list[np.ndarray] = []
+        bloques = cleaner._transform_por_bloques(tramo, chunksize, nuevos_dedup=nuevos_dedup)
+        partes = previo.partes if previo is not None else 0
+        if _es_salida_csv(salida):
+            filas_escritas = _escribir_csv(bloques, salida, reemplazar=previo is None)
+        else:
+            salida.mkdir(parents=True, exist_ok=True)
+            ruta_parte = salida / f"parte-{partes + 1:05d}.parquet"
+            filas_escritas = _escribir_parte(bloques, ruta_parte)
+            if filas_escritas:
+                partes += 1
+                reporte.parte = str(ruta_parte)
+
+        reporte.filas_leidas = filas_leidas
+        reporte.filas_escritas = filas_escritas
+        reporte.filas_totales = (previo.filas_leidas if previo is not None else 0) + reporte.filas_leidas
+
+        # La salida ya está escrita: se registran sus filas y se avanza el checkpoint
+        indice_dedup.registrar(nuevos_dedup)
+        _guardar_checkpoint(
+            ruta_checkpoint,
+            CheckpointIncrementalSchema(
+                encabezado=encabezado,
+                offset_bytes=fin,
+                huella=huella_archivo(ruta_csv, fin),
+                filas_leidas=reporte.filas_totales,
+                filas_escritas=(previo.filas_escritas if previo is not None else 0) + filas_escritas,
+                partes=partes,
+                estado=cleaner.estado,
+                estadisticas=acumulador.a_dict(),
+            ),
+        )
+    finally:
+        indice_dedup.cerrar()
+    return reporte
@@ -0,0 +1,83 @@
+## Inferencia de tipos por muestreo para convertir_a_numerico_seguro: decide si una
+# columna texto es numérica (proporción convertible >= umbral_conversion) con una
+# muestra estratificada creciente y corta apenas la decisión es clara. Solo cerca
+# del umbral se recorre la columna completa. No hay caché entre lotes: la decisión
+# depende de los datos, y el costo que importa (convertir completa una columna
+# numérica) no se puede evitar.
+
+from __future__ import annotations
+
+import math
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+## Tamaños de muestra sucesivos (filas) y probabilidad de error por decisión
+TAMANOS_MUESTRA = (256, 1024, 4096, 16384)
+PROBABILIDAD_ERROR = 1e-6
+
+
+def _margen(n: int) -> float:
+    """Cota de Hoeffding: |proporción muestral - proporción real| <= margen con prob. 1 - PROBABILIDAD_ERROR."""
+    return math.sqrt(math.log(2 / PROBABILIDAD_ERROR) / (2 * n))
+
+
+def muestra_estratificada(n_filas: int, tamano: int, semilla: int = 0) -> np.ndarray:
+    """
+    Posiciones de una muestra con una fila al azar de cada uno de 'tamano' tramos
+    contiguos del mismo largo (cubre toda la columna aunque venga ordenada).
+    """
+    limites = np.linspace(0, n_filas, tamano + 1)
+    rng = np.random.default_rng(semilla)
+    posiciones = np.floor(limites[:-1] + rng.random(tamano) * np.diff(limites)).astype(np.int64)
+    return np.minimum(posiciones, n_filas - 1)
+
+
+def _proporcion_muestral(serie: pd.Series, tamano: int, convertir: Callable[[pd.Series], pd.Series]) -> float:
+    muestra = serie.iloc[muestra_estratificada(len(serie), tamano)]
+    return float(convertir(muestra).notna().mean())
+
+
+def _prueba_secuencial(
+    serie: pd.Series,
+    umbral: float,
+    convertir: Callable[[pd.Series], pd.Series],
+    tamanos: tuple[int, ...],
+) -> tuple[Optional[bool], float]:
+    """Decisión de decidir_por_muestreo y cota superior de la proporción convertible (1.0 si no se decidió False)."""
+    for tamano in tamanos:
+        if tamano * 2 > len(serie):
+            return None, 1.0
+        proporcion = _proporcion_muestral(serie, tamano, convertir)
+        margen = _margen(tamano)
+        if proporcion - margen >= umbral:
+            return True, 1.0
+        if proporcion + margen < umbral:
+            return False, proporcion + margen
+    return None, 1.0
+
+
+def decidir_por_muestreo(
+    serie: pd.Series,
+    umbral: float,
+    convertir: Callable[[pd.Series], pd.Series],
+    tamanos: tuple[int, ...] = TAMANOS_MUESTRA,
+) -> Optional[bool]:
+    """
+    True/False si la muestra basta para decidir si la proporción convertible de
+    'serie' supera 'umbral'; None si está demasiado cerca (hay que medir completa).
+    """
+    return _prueba_secuencial(serie, umbral, convertir, tamanos)[0]
+
+
+def cota_no_numerica(
+    serie: pd.Series, umbral: float, convertir: Callable[[pd.Series], pd.Series]
+) -> Optional[float]:
+    """
+    Cota superior de la proporción convertible de 'serie' si la muestra basta para
+    decir que está bajo 'umbral' (con probabilidad 1 - PROBABILIDAD_ERROR); None si no.
+    La limpieza por bloques la usa para no convertir completos los bloques de texto.
+    """
+    decision, cota = _prueba_secuencial(serie, umbral, convertir, TAMANOS_MUESTRA)
+    return cota if decision is False else None
@@ -0,0 +1,112 @@
+## Medición por etapa del pipeline (tiempo, filas, celdas afectadas y, opcional,
+# pico de memoria con tracemalloc) para la sección 'etapas' del reporte.
+# Sin medidor las etapas se llaman directamente, sin costo adicional.
+
+from __future__ import annotations
+
+import threading
+import time
+import tracemalloc
+from typing import Any, Callable, Optional
+
+import pandas as pd
+
+from .schemas import EtapaReporteSchema
+
+## tracemalloc es global al proceso (start/stop/reset_peak): las mediciones de
+# memoria se ejecutan de a una. Reentrante: un perfil con memoria puede contener
+# un MedidorEtapas(memoria=True) en el mismo hilo.
+BLOQUEO_MEMORIA = threading.RLock()
+
+
+def ejecutar_etapa(nombre: str, funcion: Callable[..., Any], df: pd.DataFrame, *args: Any, **kwargs: Any) -> pd.DataFrame:
+    """
+    Ejecuta una etapa sin medir. Las etapas modifican df en el lugar (retornan None)
+    o retornan un DataFrame nuevo (ej: descartar_vistos); se retorna el resultante.
+    """
+    resultado = funcion(df, *args, **kwargs)
+    return df if resultado is None else resultado
+
+
+class MedidorEtapas:
+    """
+    Registra una EtapaReporteSchema por cada etapa ejecutada con ejecutar():
+    - tiempo de pared y filas de entrada/salida (filas_eliminadas)
+    - celdas que pasan a nulo (vacíos, conversiones fallidas) y nulos rellenados,
+      comparando los nulos por columna antes y después (solo si no cambian las filas)
+    - memoria=True: pico de memoria asignada por Python/NumPy durante la etapa (tracemalloc).
+      Mientras dura la medición se toma BLOQUEO_MEMORIA: dos limpiezas con memoria en hilos
+      distintos (requests concurrentes) se ejecutan una después de la otra. El pico incluye
+      lo que asignen a la vez otros hilos que no miden memoria
+    - conteos=False: solo tiempo y filas, sin recorrer los nulos (ej: métricas de la API)
+    """
+
+    def __init__(self, memoria: bool = False, conteos: bool = True) -> None:
+        self.memoria = memoria
+        self.conteos = conteos
+        self.etapas: list[EtapaReporteSchema] = []
+        self._inicio_tracemalloc = False
+        self._bloqueado = False
+
+    def __enter__(self) -> "MedidorEtapas":
+        if self.memoria:
+            BLOQUEO_MEMORIA.acquire()
+            self._bloqueado = True
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._inicio_tracemalloc = True
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        if self._inicio_tracemalloc:
+            tracemalloc.stop()
+            self._inicio_tracemalloc = False
+        if self._bloqueado:
+            self._bloqueado = False
+            BLOQUEO_MEMORIA.release()
+
+    def ejecutar(
+        self, nombre: str, funcion: Callable[..., Any], df: pd.DataFrame, *args: Any, **kwargs: Any
+    ) -> pd.DataFrame:
+        filas_entrada = len(df)
+        nulos_entrada = df.isna().sum() if self.conteos else None
+
+        memoria_base = 0
+        if self.memoria and tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            memoria_base = tracemalloc.get_traced_memory()[0]
+
+        inicio = time.perf_counter()
+        df = ejecutar_etapa(nombre, funcion, df, *args, **kwargs)
+        tiempo = time.perf_counter() - inicio
+
+        memoria_pico = None
+        if self.memoria and tracemalloc.is_tracing():
+            memoria_pico = max(tracemalloc.get_traced_memory()[1] - memoria_base, 0)
+
+        # Solo se comparan nulos si la etapa no cambió filas ni columnas
+        # (por posición: la primera etapa renombra las columnas)
+        celdas_a_nulo = nulos_rellenados = 0
+        if nulos_entrada is not None and len(df) == filas_entrada and df.shape[1] == len(nulos_entrada):
+            diferencia = df.isna().sum().to_numpy() - nulos_entrada.to_numpy()
+            celdas_a_nulo = int(diferencia[diferencia > 0].sum())
+            nulos_rellenados = int(-diferencia[diferencia < 0].sum())
+
+        self.etapas.append(
+            EtapaReporteSchema(
+                nombre=nombre,
+                tiempo_s=round(tiempo, 6),
+                filas_entrada=filas_entrada,
+                filas_salida=len(df),
+                filas_eliminadas=filas_entrada - len(df),
+                celdas_a_nulo=celdas_a_nulo,
+                nulos_rellenados=nulos_rellenados,
+                memoria_pico_bytes=memoria_pico,
+            )
+        )
+        return df
+
+
+def etapa(medidor: Optional[MedidorEtapas]) -> Callable[..., pd.DataFrame]:
+    """Función para ejecutar etapas: la del medidor o, sin medidor, la directa."""
+    return medidor.ejecutar if medidor is not None else ejecutar_etapa
@@ -0,0 +1,331 @@
+## Limpieza en lote de varios CSV (exportaciones de distintos portales): cada archivo
+# se limpia por bloques en un pool de procesos y se escribe en un dataset Parquet
+# particionado por tipo y localidad (tipo=Casa/localidad=CHAPINERO/...), con un
+# reporte combinado de la ejecución. Uso: python -m limpieza --help
+
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Iterator, Optional, Sequence, Union
+
+import pandas as pd
+from pydantic import ValidationError
+
+from .arrow_io import a_tabla, requerir_pyarrow
+from .chunked import AcumuladorLimpieza, IndiceHashes, _leer_csv_por_bloques, _preparar_bloque
+from .cleaner import DataCleaner, construir_preview
+from .pipeline import mapear_nombres_columnas, mapear_unicos
+from .schemas import LimpiezaConfigSchema, LimpiezaEstadoSchema, LimpiezaReporteSchema
+
+try:  # pyarrow es opcional: solo necesario para escribir el dataset Parquet
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover
+    pq = None
+
+Ruta = Union[str, "os.PathLike[str]"]
+
+PARTICIONES = ("tipo", "localidad")
+## Cada proceso se reemplaza después de este número de archivos: la memoria que
+# pandas/NumPy no devuelven al sistema no se acumula durante toda la ejecución.
+ARCHIVOS_POR_PROCESO = 8
+
+
+# -------------------------------------------------
+# 1) Partición por localidad
+# -------------------------------------------------
+def localidad_upz(upz: pd.Series) -> pd.Series:
+    """
+    Localidad de la UPZ: 'CHAPINERO: Pardo Rubio + Chapinero' -> 'CHAPINERO'.
+    Sin prefijo ('Usaquén') se usa el valor completo en mayúsculas. Se calcula
+    una vez por valor distinto.
+    """
+    return mapear_unicos(upz, lambda unicos: unicos.str.split(":", n=1).str[0].str.strip().str.upper())
+
+
+def _escribir_particiones(df: pd.DataFrame, salida: Ruta, nombre_base: str) -> None:
+    """Agrega las filas limpias al dataset Parquet particionado (estilo Hive)."""
+    if len(df) == 0:
+        return
+    faltantes = [col for col in ("tipo", "upz") if col not in df.columns]
+    if faltantes:
+        raise ValueError(f"Faltan columnas para particionar: {', '.join(faltantes)}.")
+    df["localidad"] = localidad_upz(df["upz"])
+    pq.write_to_dataset(
+        a_tabla(df),
+        os.fspath(salida),
+        partition_cols=list(PARTICIONES),
+        basename_template=f"{nombre_base}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+    )
+
+
+# -------------------------------------------------
+# 2) Ajuste y limpieza de un archivo (en un proceso del pool)
+# -------------------------------------------------
+def _config_lote(config: LimpiezaConfigSchema) -> LimpiezaConfigSchema:
+    """Sin compacto: los dtypes reducidos de cada archivo no coincidirían entre partes del dataset."""
+    return config.model_copy(update={"compacto": False}) if config.compacto else config
+
+
+def _leer_csv_texto(ruta: str) -> pd.DataFrame:
+    return pd.read_csv(ruta, encoding="utf-8", dtype=str)
+
+
+def ajustar_archivo(ruta: str, config: LimpiezaConfigSchema, chunksize: int = 100_000) -> dict[str, Any]:
+    """
+    Pasada 1 de un archivo: sus estadísticas (AcumuladorLimpieza.a_dict), que se
+    combinan con las de los demás archivos en un solo estado. Sin muestreo: las
+    cotas de un archivo no se pueden sumar a las de otro.
+    """
+    config = _config_lote(config)
+    acumulador = AcumuladorLimpieza(config, inferir_tipos=True)
+    cleaner = DataCleaner(config)
+
+    if config.casi_duplicados is not None:
+        # Casi duplicados necesita todas las filas: el archivo completo, como texto
+        df = _leer_csv_texto(ruta)
+        df_work = _preparar_bloque(
+            df, IndiceHashes(), mapear_nombres_columnas(df.columns), columnas_texto=config.columnas_texto
+        )
+        cleaner._quitar_casi_duplicados(df_work)
+        acumulador.actualizar(df_work)
+    else:
+        cleaner.fit_chunked(lambda: _leer_csv_por_bloques(ruta, chunksize), chunksize, acumulador)
+    return acumulador.a_dict()
+
+
+def _estado_archivo(ruta: str, estado: LimpiezaEstadoSchema) -> LimpiezaEstadoSchema:
+    """El estado común con el mapeo de nombres de las columnas de este archivo."""
+    encabezado = pd.read_csv(ruta, encoding="utf-8", nrows=0).columns
+    return estado.model_copy(update={"columnas": mapear_nombres_columnas(encabezado)})
+
+
+def _publicar(parcial: Path, salida: Path) -> None:
+    """Mueve las partes escritas en 'parcial' a su partición en 'salida'."""
+    for parte in sorted(parcial.rglob("*.parquet")):
+        destino = salida / parte.relative_to(parcial)
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(parte, destino)
+    shutil.rmtree(parcial)
+
+
+def limpiar_archivo(
+    ruta: str,
+    config: LimpiezaConfigSchema,
+    salida: str,
+    estado: Optional[LimpiezaEstadoSchema] = None,
+    chunksize: int = 100_000,
+    preview_rows: int = 5,
+) -> LimpiezaReporteSchema:
+    """
+    Limpia un CSV con 'estado' (el ajuste común del lote; None = solo este archivo)
+    y agrega sus filas al dataset particionado.
+
+    Las partes se escriben en salida/_parcial-<archivo> y se mueven al dataset
+    solo si el archivo termina sin error. La memoria depende de 'chunksize'; con
+    casi_duplicados, que necesita todas las filas, el archivo se limpia completo en memoria.
+    """
+    requerir_pyarrow()
+    config = _config_lote(config)
+    if estado is None:
+        estado = AcumuladorLimpieza.desde_dict(config, ajustar_archivo(ruta, config, chunksize)).estado()
+    cleaner = DataCleaner(estado=_estado_archivo(ruta, estado))
+    nombre = Path(ruta).stem
+    parcial = Path(salida) / f"_parcial-{nombre}"
+    shutil.rmtree(parcial, ignore_errors=True)
+
+    try:
+        if config.casi_duplicados is not None:
+            df_limpio, reporte = cleaner.run_with_report(_leer_csv_texto(ruta), preview_rows)
+            _escribir_particiones(df_limpio, parcial, f"{nombre}-00000")
+            reporte.columnas = list(df_limpio.columns)
+        else:
+            reporte = _limpiar_por_bloques(cleaner, ruta, parcial, nombre, chunksize, preview_rows)
+    except BaseException:
+        shutil.rmtree(parcial, ignore_errors=True)
+        raise
+
+    if parcial.exists():
+        _publicar(parcial, Path(salida))
+    return reporte
+
+
+def _limpiar_por_bloques(
+    cleaner: DataCleaner, ruta: str, parcial: Path, nombre: str, chunksize: int, preview_rows: int
+) -> LimpiezaReporteSchema:
+    filas_entrada = 0
+
+    def bloques_contados() -> Iterator[pd.DataFrame]:
+        nonlocal filas_entrada
+        for bloque in _leer_csv_por_bloques(ruta, chunksize):
+            filas_entrada += len(bloque)
+            yield bloque
+
+    filas_salida = 0
+    columnas: list[str] = []
+    muestra: list[pd.DataFrame] = []
+    for i, bloque in enumerate(cleaner._transform_por_bloques(bloques_contados, chunksize)):
+        _escribir_particiones(bloque, parcial, f"{nombre}-{i:05d}")
+        filas_salida += len(bloque)
+        columnas = list(bloque.columns)
+        if sum(map(len, muestra)) < preview_rows:
+            muestra.append(bloque.head(preview_rows))
+
+    preview = pd.concat(muestra).head(preview_rows) if muestra else pd.DataFrame()
+    return LimpiezaReporteSchema(
+        n_filas_entrada=filas_entrada,
+        n_filas_salida=filas_salida,
+        columnas=columnas,
+        preview=construir_preview(preview),
+    )
+
+
+# -------------------------------------------------
+# 3) Ejecución en lote
+# -------------------------------------------------
+def expandir_entradas(patrones: Sequence[str]) -> list[str]:
+    """Rutas de los CSV que coinciden con los patrones glob (sin repetir, ordenadas)."""
+    rutas = {ruta for patron in patrones for ruta in glob.glob(patron, recursive=True) if Path(ruta).is_file()}
+    return sorted(rutas)
+
+
+def combinar_reportes(reportes: Sequence[LimpiezaReporteSchema], preview_rows: int = 5) -> LimpiezaReporteSchema:
+    """Un solo reporte: filas sumadas, columnas en orden de aparición y la preview de los primeros archivos."""
+    columnas = list(dict.fromkeys(col for reporte in reportes for col in reporte.columnas))
+    preview = [fila for reporte in reportes for fila in reporte.preview][:preview_rows]
+    return LimpiezaReporteSchema(
+        n_filas_entrada=sum(reporte.n_filas_entrada for reporte in reportes),
+        n_filas_salida=sum(reporte.n_filas_salida for reporte in reportes),
+        columnas=columnas,
+        preview=preview,
+    )
+
+
+def limpiar_lote(
+    rutas: Sequence[str],
+    config: LimpiezaConfigSchema,
+    salida: Ruta,
+    procesos: Optional[int] = None,
+    chunksize: int = 100_000,
+    preview_rows: int = 5,
+) -> tuple[LimpiezaReporteSchema, dict[str, LimpiezaReporteSchema | str]]:
+    """
+    Limpia los archivos en un pool de 'procesos' (None = todos los núcleos) y
+    escribe el dataset en 'salida'. La memoria pico es ~procesos x chunksize filas.
+
+    Dos rondas en el pool: primero las estadísticas de cada archivo, que se combinan
+    en un solo estado (mismas conversiones, rellenos y dtypes en todas las partes del
+    dataset); luego cada archivo se limpia con ese estado.
+
+    Retorna el reporte combinado (también en salida/_reporte.json: los lectores de
+    Parquet ignoran los archivos con "_") y, por archivo, su reporte o el mensaje
+    de error (un archivo con error no detiene a los demás ni deja partes en la salida).
+    """
+    salida = Path(salida)
+    salida.mkdir(parents=True, exist_ok=True)
+    procesos = max(1, min(procesos or os.cpu_count() or 1, len(rutas)))
+    config = _config_lote(config)
+
+    resultados: dict[str, LimpiezaReporteSchema | str] = {}
+    # "spawn": requerido por max_tasks_per_child; no se hereda el estado del proceso padre
+    with ProcessPoolExecutor(
+        max_workers=procesos,
+        mp_context=multiprocessing.get_context("spawn"),
+        max_tasks_per_child=ARCHIVOS_POR_PROCESO,
+    ) as pool:
+        futuros = {ruta: pool.submit(ajustar_archivo, ruta, config, chunksize) for ruta in rutas}
+        combinado: Optional[AcumuladorLimpieza] = None
+        for ruta, futuro in futuros.items():
+            try:
+                acumulador = AcumuladorLimpieza.desde_dict(config, futuro.result())
+                if combinado is None:
+                    combinado = acumulador
+                elif set(acumulador.columnas or []) != set(combinado.columnas or []):
+                    raise ValueError(
+                        f"columnas distintas a las del primer archivo ({', '.join(combinado.columnas or [])})."
+                    )
+                else:
+                    combinado.combinar(acumulador)
+            except Exception as error:
+                resultados[ruta] = f"{type(error).__name__}: {error}"
+
+        if combinado is not None:
+            estado = combinado.estado()
+            futuros = {
+                ruta: pool.submit(limpiar_archivo, ruta, config, os.fspath(salida), estado, chunksize, preview_rows)
+                for ruta in rutas
+                if ruta not in resultados
+            }
+            for ruta, futuro in futuros.items():
+                try:
+                    resultados[ruta] = futuro.result()
+                except Exception as error:
+                    resultados[ruta] = f"{type(error).__name__}: {error}"
+
+    resultados = {ruta: resultados[ruta] for ruta in rutas}
+    reporte = combinar_reportes(
+        [r for r in resultados.values() if isinstance(r, LimpiezaReporteSchema)], preview_rows
+    )
+    (salida / "_reporte.json").write_text(reporte.model_dump_json(indent=2), encoding="utf-8")
+    return reporte, resultados
+
+
+# -------------------------------------------------
+# 4) Línea de comandos
+# -------------------------------------------------
+def _argumentos(argv: Optional[Sequence[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m limpieza",
+        description="Limpia varios CSV en paralelo y escribe Parquet particionado por tipo y localidad.",
+    )
+    parser.add_argument("entradas", nargs="+", help="CSV o patrones glob (ej: 'exportaciones/*.csv').")
+    parser.add_argument("--config", help="JSON con la configuración (LimpiezaConfigSchema).")
+    parser.add_argument("--salida", required=True, help="Directorio del dataset Parquet.")
+    parser.add_argument("--procesos", type=int, default=None, help="Procesos en paralelo (por defecto, los núcleos).")
+    parser.add_argument("--chunksize", type=int, default=100_000, help="Filas por bloque dentro de cada archivo.")
+    parser.add_argument("--preview", type=int, default=5, help="Filas de muestra en el reporte.")
+    parser.add_argument("--sobrescribir", action="store_true", help="Borra la salida si ya existe.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = _argumentos(argv)
+
+    try:
+        texto = Path(args.config).read_text(encoding="utf-8") if args.config else "{}"
+        config = LimpiezaConfigSchema.model_validate_json(texto)
+    except (OSError, ValidationError) as error:
+        print(f"Configuración inválida: {error}", file=sys.stderr)
+        return 2
+
+    rutas = expandir_entradas(args.entradas)
+    if not rutas:
+        print("Ningún archivo coincide con las entradas.", file=sys.stderr)
+        return 2
+
+    salida = Path(args.salida)
+    if salida.exists() and any(salida.iterdir()):
+        if not args.sobrescribir:
+            print(f"'{salida}' no está vacío: use --sobrescribir.", file=sys.stderr)
+            return 2
+        shutil.rmtree(salida)
+
+    reporte, resultados = limpiar_lote(rutas, config, salida, args.procesos, args.chunksize, args.preview)
+
+    for ruta, resultado in resultados.items():
+        if isinstance(resultado, LimpiezaReporteSchema):
+            resumen = {"filas_entrada": resultado.n_filas_entrada, "filas_salida": resultado.n_filas_salida}
+        else:
+            resumen = {"error": resultado}
+        print(json.dumps({"archivo": ruta, **resumen}, ensure_ascii=False))
+    print(f"Total: {reporte.n_filas_entrada} filas leídas, {reporte.n_filas_salida} escritas en '{salida}'.")
+
+    return 1 if any(isinstance(r, str) for r in resultados.values()) else 0
@@ -0,0 +1,209 @@
+## Parser vectorizado de valores monetarios en formato colombiano ("$ 360.000.000").
+# Recorre los bytes UTF-8 de la columna una sola vez con NumPy, en lugar de
+# astype(str) + tres str.replace + pd.to_numeric (cuatro copias de la columna).
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from .arrow_io import como_arrow
+
+try:  # pyarrow es opcional: permite leer los buffers UTF-8 sin copiar
+    import pyarrow as pa
+except ImportError:  # pragma: no cover
+    pa = None
+
+
+## Potencias de 10 exactas en int64 (hasta 18 dígitos por valor).
+_POTENCIAS_10 = 10 ** np.arange(19, dtype=np.int64)
+_MAX_DIGITOS = 18
+_MAX_MANTISA_EXACTA = 2**53
+
+
+# -------------------------------------------------
+# 1) Ruta original (regex) - referencia y respaldo
+# -------------------------------------------------
+def _parsear_monetario_regex(serie: pd.Series, miles: str = ".", decimal: str = ",") -> pd.Series:
+    """
+    Implementación original basada en str.replace; se usa como respaldo
+    para separadores de más de un carácter o números de más de 18 dígitos.
+    """
+    s = serie.astype(str)
+
+    # Quitar todo lo que no sea dígito, signo negativo o separadores comunes
+    s = s.str.replace(r"[^\d\-\.,]", "", regex=True)
+
+    # Quitar separador de miles
+    if miles:
+        s = s.str.replace(miles, "", regex=False)
+
+    # Normalizar separador decimal a "."
+    if decimal and decimal != ".":
+        s = s.str.replace(decimal, ".", regex=False)
+
+    valores = pd.to_numeric(s, errors="coerce")
+    if isinstance(serie.dtype, pd.ArrowDtype):
+        return como_arrow(valores, serie)
+    return valores
+
+
+# -------------------------------------------------
+# 2) Buffers UTF-8 de una columna texto
+# -------------------------------------------------
+def _buffers_utf8(textos: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Retorna (datos, offsets): bytes UTF-8 concatenados y offsets int64 por fila.
+    Con pyarrow se reutilizan los buffers de la columna; sin pyarrow se codifica.
+    """
+    if pa is not None:
+        try:
+            arr = pa.array(textos, type=pa.large_string(), from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            arr = None
+
+        if arr is not None:
+            if isinstance(arr, pa.ChunkedArray):
+                arr = arr.combine_chunks()
+
+            _, buf_offsets, buf_datos = arr.buffers()
+            offsets = np.frombuffer(buf_offsets, dtype=np.int64)[arr.offset : arr.offset + len(arr) + 1]
+            datos = np.frombuffer(buf_datos, dtype=np.uint8) if buf_datos is not None else np.empty(0, np.uint8)
+            return datos, offsets
+
+    codificados = [t.encode("utf-8") if isinstance(t, str) else b"" for t in textos]
+    offsets = np.zeros(len(codificados) + 1, dtype=np.int64)
+    np.cumsum(np.fromiter(map(len, codificados), dtype=np.int64, count=len(codificados)), out=offsets[1:])
+    return np.frombuffer(b"".join(codificados), dtype=np.uint8), offsets
+
+
+## Clases de byte: lo que la limpieza original conserva después de quitar
+# símbolos, el separador de miles y normalizar el decimal.
+_IGNORADO, _DIGITO, _SIGNO, _PUNTO, _INVALIDO = range(5)
+
+
+def _tabla_clases(miles: str, decimal: str) -> np.ndarray:
+    tabla = np.full(256, _IGNORADO, dtype=np.uint8)
+    tabla[ord("0") : ord("9") + 1] = _DIGITO
+    tabla[ord("-")] = _SIGNO
+    tabla[ord(",")] = _INVALIDO
+    tabla[ord(".")] = _PUNTO
+    # Los separadores fuera de los caracteres conservados ya fueron descartados
+    if decimal and ord(decimal) < 128 and tabla[ord(decimal)] != _IGNORADO:
+        tabla[ord(decimal)] = _PUNTO
+    if miles and ord(miles) < 128:
+        tabla[ord(miles)] = _IGNORADO
+    return tabla
+
+
+def _conteo_por_fila(filas: np.ndarray, n: int) -> np.ndarray:
+    return np.bincount(filas, minlength=n)
+
+
+# -------------------------------------------------
+# 3) Kernel de parseo
+# -------------------------------------------------
+def parsear_monetario(
+    serie: pd.Series,
+    miles: str = ".",
+    decimal: str = ",",
+) -> tuple[pd.Series, np.ndarray]:
+    """
+    Convierte textos monetarios a int64/float64 en una sola pasada sobre los bytes.
+    Ej: "$ 360.000.000" -> 360000000, "-$ 1.500,5" -> -1500.5
+
+    Mismas reglas que la limpieza original:
+    - se ignora todo lo que no sea dígito, "-", "." o ","
+    - se elimina 'miles' y 'decimal' pasa a ser el punto decimal
+    - int64 si todas las filas son enteras y válidas; float64 si hay nulos o decimales
+
+    Retorna (valores, fallidas): 'fallidas' marca filas no nulas que no se pudieron parsear.
+    Las columnas que ya son numéricas se retornan sin cambios.
+    """
+    if pd.api.types.is_numeric_dtype(serie):
+        return serie, np.zeros(len(serie), dtype=bool)
+
+    nulos = serie.isna().to_numpy()
+    n = len(serie)
+
+    if n == 0 or len(miles) > 1 or len(decimal) > 1:
+        valores = _parsear_monetario_regex(serie, miles, decimal)
+        return valores, valores.isna().to_numpy() & ~nulos
+
+    serie_texto = serie if pd.api.types.is_string_dtype(serie) else serie.astype(str)
+    datos, offsets = _buffers_utf8(serie_texto)
+    datos = datos[offsets[0] : offsets[-1]]
+    longitudes = np.diff(offsets)
+
+    # Clase de cada byte con una tabla de 256 entradas (una sola lectura de los datos)
+    clases = _tabla_clases(miles, decimal)[datos]
+    posiciones = np.flatnonzero(clases)
+    tipo_fila = np.int32 if n < 2**31 else np.int64
+    fila = np.repeat(np.arange(n, dtype=tipo_fila), longitudes)[posiciones]
+    c = datos[posiciones]
+    clases = clases[posiciones]
+
+    es_digito = clases == _DIGITO
+    es_signo = clases == _SIGNO
+    es_punto = clases == _PUNTO
+    es_invalido = clases == _INVALIDO
+
+    # El signo solo es válido como primer carácter conservado de la fila
+    primero = np.ones(len(c), dtype=bool)
+    primero[1:] = fila[1:] != fila[:-1]
+
+    n_digitos = _conteo_por_fila(fila[es_digito], n)
+    n_puntos = _conteo_por_fila(fila[es_punto], n)
+    validas = (
+        ~nulos
+        & (n_digitos > 0)
+        & (n_puntos <= 1)
+        & (_conteo_por_fila(fila[es_signo], n) <= 1)
+        & (_conteo_por_fila(fila[es_signo & ~primero], n) == 0)
+        & (_conteo_por_fila(fila[es_invalido], n) == 0)
+    )
+
+    if (n_digitos[validas] > _MAX_DIGITOS).any():
+        valores = _parsear_monetario_regex(serie, miles, decimal)
+        return valores, valores.isna().to_numpy() & ~nulos
+
+    # Dígitos después del punto decimal (puntos previos dentro de la misma fila)
+    n_decimales = np.zeros(n, dtype=np.int64)
+    if n_puntos.any():
+        inicios = np.flatnonzero(primero)
+        puntos_previos = np.cumsum(es_punto) - es_punto
+        puntos_previos -= np.repeat(puntos_previos[inicios], np.diff(np.append(inicios, len(c))))
+        n_decimales = _conteo_por_fila(fila[es_digito & (puntos_previos > 0)], n)
+
+    # Mantisa entera: sum(dígito * 10^exponente) por fila
+    fila_digito = fila[es_digito]
+    digitos = c[es_digito].astype(np.int64) - 48
+    inicios_digito = np.flatnonzero(np.append(True, fila_digito[1:] != fila_digito[:-1]))
+    rango = np.arange(len(digitos)) - np.repeat(inicios_digito, np.diff(np.append(inicios_digito, len(digitos))))
+    exponentes = n_digitos[fila_digito] - rango - 1
+    exponentes[exponentes > _MAX_DIGITOS] = 0  # filas inválidas o con exceso de dígitos
+
+    mantisa = np.zeros(n, dtype=np.int64)
+    if len(digitos) > 0:
+        mantisa[fila_digito[inicios_digito]] = np.add.reduceat(digitos * _POTENCIAS_10[exponentes], inicios_digito)
+
+    negativo = _conteo_por_fila(fila[es_signo], n) > 0
+    con_punto = validas & (n_puntos > 0)
+
+    if validas.all() and not con_punto.any():
+        valores = np.where(negativo, -mantisa, mantisa)
+    else:
+        if (mantisa[con_punto] >= _MAX_MANTISA_EXACTA).any():
+            valores = _parsear_monetario_regex(serie, miles, decimal)
+            return valores, valores.isna().to_numpy() & ~nulos
+
+        # mantisa / 10^k con ambos exactos en float64 da el redondeo correcto
+        valores = mantisa / _POTENCIAS_10[np.minimum(n_decimales, _MAX_DIGITOS)].astype(np.float64)
+        valores = np.where(negativo, -valores, valores)
+        valores[~validas] = np.nan
+
+    if isinstance(serie.dtype, pd.ArrowDtype):
+        # Backend Arrow: NaN -> null y el resultado sigue siendo una columna Arrow
+        return como_arrow(valores, serie), ~validas & ~nulos
+
+    return pd.Series(valores, index=serie.index, name=serie.name), ~validas & ~nulos
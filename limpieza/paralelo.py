@@ -0,0 +1,158 @@
+## Ejecución del pipeline por fragmentos de filas en varios hilos (n_jobs).
+# Las etapas por fila (vacíos, parseo monetario, conteos y aplicación del estado)
+# corren por fragmento; los duplicados y la decisión de qué columnas no son
+# numéricas se toman sobre todas las filas, como en run(), y los valores de
+# relleno salen de combinar las estadísticas de cada fragmento, igual que en
+# el modo por bloques, por lo que el resultado coincide con la ejecución serial.
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .chunked import AcumuladorLimpieza, columnas_no_numericas
+from .dedup import IndiceDedup, descartar_vistos
+from .pipeline import (
+    aplicar_estado,
+    convertir_vacios_a_nan,
+    eliminar_casi_duplicados,
+    eliminar_duplicados,
+    estandarizar_nombres_columnas,
+    limpiar_columnas_monetarias,
+    mapear_nombres_columnas,
+    normalizar_texto,
+)
+from .schemas import LimpiezaConfigSchema, LimpiezaEstadoSchema
+
+## Por debajo de este tamaño de fragmento no compensa repartir el trabajo.
+FILAS_MINIMAS_POR_FRAGMENTO = 20_000
+
+
+def numero_de_workers(n_jobs: Optional[int], n_filas: int) -> int:
+    """
+    Hilos a usar: n_jobs (None = todos los núcleos), acotado para que cada
+    fragmento tenga al menos FILAS_MINIMAS_POR_FRAGMENTO filas.
+    """
+    solicitados = (os.cpu_count() or 1) if n_jobs is None else n_jobs
+    return max(1, min(solicitados, n_filas // FILAS_MINIMAS_POR_FRAGMENTO))
+
+
+def dividir_filas(df: pd.DataFrame, n: int) -> list[pd.DataFrame]:
+    """Parte df en n fragmentos contiguos de filas (en orden)."""
+    limites = np.linspace(0, len(df), n + 1).astype(int)
+    return [df.iloc[inicio:fin] for inicio, fin in zip(limites[:-1], limites[1:])]
+
+
+# -------------------------------------------------
+# 1) Etapas por fragmento
+# -------------------------------------------------
+def _preparar_fragmento(
+    fragmento: pd.DataFrame, mapeo: dict[str, str], columnas_texto: Optional[list[str]] = None
+) -> pd.DataFrame:
+    """Pasos 1-2 (nombres, vacíos y texto normalizado)."""
+    estandarizar_nombres_columnas(fragmento, mapeo)
+    convertir_vacios_a_nan(fragmento)
+    if columnas_texto:
+        normalizar_texto(fragmento, columnas_texto)
+    return fragmento
+
+
+def _acumular_fragmento(
+    fragmento: pd.DataFrame, config: LimpiezaConfigSchema, no_numericas: set[str]
+) -> AcumuladorLimpieza:
+    # Las columnas monetarias se parsean una sola vez: aplicar_estado las recibe ya numéricas
+    if config.columnas_monetarias:
+        limpiar_columnas_monetarias(fragmento, config.columnas_monetarias)
+
+    acumulador = AcumuladorLimpieza(config, inferir_tipos=False, no_numericas=no_numericas)
+    acumulador.actualizar(fragmento)
+    return acumulador
+
+
+def _aplicar_fragmento(fragmento: pd.DataFrame, estado: LimpiezaEstadoSchema) -> pd.DataFrame:
+    aplicar_estado(fragmento, estado)
+    return fragmento
+
+
+def _sin_duplicados(
+    preparados: list[pd.DataFrame],
+    config: LimpiezaConfigSchema,
+    indice_dedup: Optional[IndiceDedup] = None,
+    nuevos_dedup: Optional[list[np.ndarray]] = None,
+) -> pd.DataFrame:
+    """
+    Paso 3 sobre todas las filas (los grupos cruzan fragmentos): duplicados exactos
+    con drop_duplicates, filas de lotes anteriores si se pasa 'indice_dedup' y
+    casi duplicados si la config lo pide.
+    """
+    unido = pd.concat(preparados)
+    eliminar_duplicados(unido)
+    if indice_dedup is not None:
+        unido = descartar_vistos(unido, indice_dedup, nuevos=nuevos_dedup)
+    if config.casi_duplicados is not None:
+        eliminar_casi_duplicados(
+            unido, config.casi_duplicados, config.umbral_similitud, config.tolerancia_casi_duplicados
+        )
+    return unido
+
+
+# -------------------------------------------------
+# 2) Orquestación
+# -------------------------------------------------
+def limpiar_en_paralelo(
+    df: pd.DataFrame,
+    config: LimpiezaConfigSchema,
+    n_workers: int,
+    estado: Optional[LimpiezaEstadoSchema] = None,
+    indice_dedup: Optional[IndiceDedup] = None,
+    nuevos_dedup: Optional[list[np.ndarray]] = None,
+) -> tuple[pd.DataFrame, LimpiezaEstadoSchema]:
+    """
+    Limpia df (copia de trabajo) en n_workers hilos:
+
+    1. nombres y vacíos por fragmento; duplicados exactos, filas de lotes anteriores
+       (si se pasa 'indice_dedup') y casi duplicados sobre todas las filas
+    2. columnas no numéricas decididas por muestreo sobre todas las filas (como
+       en run()); estadísticas por fragmento (conteos, proporciones convertibles,
+       conteos para medianas/modas) combinadas en un solo estado (se omite si hay 'estado')
+    3. aplicación del estado por fragmento y concatenación en el orden original
+
+    Con 'nuevos_dedup' las filas nuevas no se registran en 'indice_dedup': sus
+    hashes quedan en la lista para que el llamador las registre al terminar.
+
+    Solo parte del trabajo libera el GIL (kernels de NumPy y pyarrow sobre columnas
+    numéricas o string[pyarrow]); pd.to_numeric y las operaciones sobre columnas
+    object lo retienen, así que la ganancia depende de los tipos y de los núcleos
+    libres. Se usan hilos para no copiar los fragmentos entre procesos.
+    """
+    mapeo = estado.columnas if estado is not None else mapear_nombres_columnas(df.columns)
+
+    with ThreadPoolExecutor(max_workers=n_workers) as pool:
+        preparados = list(
+            pool.map(
+                _preparar_fragmento,
+                dividir_filas(df, n_workers),
+                [mapeo] * n_workers,
+                [config.columnas_texto] * n_workers,
+            )
+        )
+        fragmentos = dividir_filas(_sin_duplicados(preparados, config, indice_dedup, nuevos_dedup), n_workers)
+
+        if estado is None:
+            # Misma decisión que run(): muestra de cada columna completa (no por fragmento)
+            no_numericas = columnas_no_numericas(fragmentos, config)
+            acumuladores = list(
+                pool.map(_acumular_fragmento, fragmentos, [config] * n_workers, [no_numericas] * n_workers)
+            )
+            acumulado = acumuladores[0]
+            for otro in acumuladores[1:]:
+                acumulado.combinar(otro)
+            estado = acumulado.estado(mapeo)
+
+        limpios = list(pool.map(_aplicar_fragmento, fragmentos, [estado] * n_workers))
+
+    return pd.concat(limpios), estado
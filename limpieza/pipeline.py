@@ -4,23 +4,40 @@
 from __future__ import annotations
 
 import unicodedata ## limpieza de texto (acentos)
-from typing import Iterable, Optional ## 
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Mapping, Optional ## 
 
 import numpy as np
 import pandas as pd
 
+from .arrow_io import como_arrow
+from .casi_duplicados import grupos_casi_duplicados
+from .inferencia import decidir_por_muestreo
+from .monetario import parsear_monetario
+from .schemas import LimpiezaEstadoSchema
+
 
 # -------------------------------------------------
 # 1) Estandarización de nombres de columnas
 # -------------------------------------------------
-def estandarizar_nombres_columnas(df: pd.DataFrame) -> None:
+def estandarizar_nombres_columnas(df: pd.DataFrame, mapeo: Optional[Mapping[str, str]] = None) -> None:
     """
     Normaliza nombres de columnas:
     - elimina espacios laterales
     - convierte a minúsculas
     - reemplaza espacios por "_"
     - elimina acentos
+
+    Si se pasa un mapeo ajustado (original -> estandarizado) se usa directamente
+    y solo se normalizan las columnas que no aparecen en él.
     """
+    if mapeo is not None:
+        pendientes = [col for col in df.columns if str(col) not in mapeo]
+        if pendientes:
+            mapeo = {**mapeo, **mapear_nombres_columnas(pendientes)}
+        df.columns = [mapeo[str(col)] for col in df.columns]
+        return
+
     columnas = (
         df.columns.astype(str)
         .str.strip()
@@ -28,13 +45,21 @@ def estandarizar_nombres_columnas(df: pd.DataFrame) -> None:
         .str.replace(" ", "_", regex=False)
     )
 
-    columnas = columnas.map(
-        lambda col: unicodedata.normalize("NFKD", col)
-        .encode("ascii", errors="ignore")
-        .decode("utf-8")
-    )
+    df.columns = columnas.map(_sin_acentos)
+
 
-    df.columns = columnas
+def _sin_acentos(texto: str) -> str:
+    return unicodedata.normalize("NFKD", texto).encode("ascii", errors="ignore").decode("utf-8")
+
+
+def mapear_nombres_columnas(columnas: Iterable[Any]) -> dict[str, str]:
+    """
+    Retorna el mapeo nombre original -> nombre estandarizado.
+    """
+    columnas = list(columnas)
+    normalizadas = pd.DataFrame(columns=columnas)
+    estandarizar_nombres_columnas(normalizadas)
+    return dict(zip(map(str, columnas), normalizadas.columns))
 
 
 # -------------------------------------------------
@@ -43,8 +68,87 @@ def estandarizar_nombres_columnas(df: pd.DataFrame) -> None:
 def convertir_vacios_a_nan(df: pd.DataFrame) -> None:
     """
     Convierte strings vacíos o con solo espacios en NaN.
+
+    Solo revisa columnas object/string (las numéricas no pueden tener vacíos)
+    y usa longitud + isspace en lugar de una regex sobre todo el DataFrame.
+    """
+    for col in df.select_dtypes(include=["object", "string"]).columns:
+        _anular_vacios(df, col)
+
+
+def _mascara_vacios(serie: pd.Series) -> np.ndarray:
+    """
+    True donde el valor es texto vacío o solo espacios (equivale a r"^\s*$").
+    Los valores que no son texto (nulos, números en columnas object) dan False.
+
+    En columnas object (métodos .str fila a fila en Python) se revisan solo los
+    valores distintos y la máscara se reparte con los códigos de pd.factorize.
+    """
+    if serie.dtype == object:
+        codigos, unicos = pd.factorize(serie, use_na_sentinel=True)
+        vacios_unicos = _mascara_vacios(pd.Series(unicos, dtype="str")) if len(unicos) else np.zeros(0, bool)
+        # El código -1 (nulo) toma el último elemento: False
+        return np.append(vacios_unicos & _son_texto(unicos), False)[codigos]
+
+    try:
+        texto = serie.str
+    except AttributeError:  # columna object sin ningún string
+        return np.zeros(len(serie), dtype=bool)
+
+    vacios = texto.len().eq(0) | texto.isspace().eq(True)
+    return vacios.to_numpy(dtype=bool, na_value=False)
+
+
+def _son_texto(valores: np.ndarray) -> np.ndarray:
+    return np.fromiter((isinstance(v, str) for v in valores), dtype=bool, count=len(valores))
+
+
+def _anular_vacios(df: pd.DataFrame, col: str) -> None:
+    vacios = _mascara_vacios(df[col])
+    if vacios.any():
+        df[col] = df[col].mask(vacios)
+
+
+# -------------------------------------------------
+# 2b) Normalización de valores de texto (opcional)
+# -------------------------------------------------
+def mapear_unicos(serie: pd.Series, funcion: Callable[[pd.Series], pd.Series]) -> pd.Series:
+    """
+    Aplica 'funcion' solo a los valores distintos de la serie (pd.factorize) y
+    reparte el resultado a las filas con los códigos: el costo depende de la
+    cardinalidad (cientos de barrios) y no del número de filas. Los nulos se conservan.
+    """
+    codigos, unicos = pd.factorize(serie, use_na_sentinel=True)
+    resultado = funcion(pd.Series(unicos, dtype=serie.dtype))
+    valores = pd.api.extensions.take(resultado.array, codigos, allow_fill=True)
+    return pd.Series(valores, index=serie.index, name=serie.name, dtype=resultado.dtype)
+
+
+@lru_cache(maxsize=65_536)
+def normalizar_valor_texto(texto: str) -> Optional[str]:
+    """
+    "  Chapinéro   Alto " -> "chapinero alto": espacios laterales y repetidos,
+    minúsculas (casefold) y sin acentos. Un resultado vacío pasa a None.
+    Memoizada: los mismos barrios/UPZ se repiten entre columnas, lotes y requests.
+    """
+    return " ".join(_sin_acentos(texto.casefold()).split()) or None
+
+
+def normalizar_texto(df: pd.DataFrame, columnas: Iterable[str]) -> None:
+    """
+    Normaliza los valores de las columnas de texto indicadas con normalizar_valor_texto,
+    una vez por valor distinto (mapear_unicos). Las columnas que no existen o no son
+    texto se omiten; los valores que no son texto (números en columnas object) no cambian.
     """
-    df.replace(r"^\s*$", np.nan, regex=True, inplace=True)
+    def normalizar(unicos: pd.Series) -> pd.Series:
+        normalizados = unicos.map(lambda v: normalizar_valor_texto(v) if isinstance(v, str) else v)
+        return normalizados.astype(unicos.dtype)
+
+    for col in columnas:
+        if col in df.columns and (
+            pd.api.types.is_object_dtype(df[col].dtype) or pd.api.types.is_string_dtype(df[col].dtype)
+        ):
+            df[col] = mapear_unicos(df[col], normalizar)
 
 
 # -------------------------------------------------
@@ -57,6 +161,41 @@ def eliminar_duplicados(df: pd.DataFrame) -> None:
     df.drop_duplicates(keep="first", inplace=True)
 
 
+def eliminar_casi_duplicados(
+    df: pd.DataFrame,
+    accion: str = "eliminar",
+    umbral: float = 0.8,
+    tolerancia: float = 0.05,
+) -> None:
+    """
+    Detecta avisos casi duplicados (descripción parecida, mismo barrio/UPZ y
+    valor/área casi iguales) con MinHash + LSH (ver casi_duplicados.py).
+
+    - accion="eliminar": conserva solo la primera fila de cada grupo
+    - accion="marcar": agrega 'casi_duplicado' (True en las repeticiones) y
+      'grupo_casi_duplicado' (número de grupo; -1 si la fila no tiene casi duplicados)
+    """
+    grupos = grupos_casi_duplicados(df, umbral=umbral, tolerancia=tolerancia)
+    repetidas = grupos != np.arange(len(df))
+
+    if accion == "eliminar":
+        if repetidas.any():
+            # Por posición: el índice puede tener etiquetas repetidas
+            indice = df.index
+            df.index = pd.RangeIndex(len(df))
+            df.drop(index=np.flatnonzero(repetidas), inplace=True)
+            df.index = indice[~repetidas]
+        return
+    if accion != "marcar":
+        raise ValueError(f"accion inválida: '{accion}' (use eliminar o marcar).")
+
+    # Grupos numerados en orden de primera aparición (la primera fila es la de menor posición)
+    representantes = np.unique(grupos[repetidas])
+    con_grupo = np.isin(grupos, representantes)
+    df["casi_duplicado"] = repetidas
+    df["grupo_casi_duplicado"] = np.where(con_grupo, np.searchsorted(representantes, grupos), -1).astype(np.int64)
+
+
 # -------------------------------------------------
 # 4) Limpieza de columnas monetarias (in-place)
 # -------------------------------------------------
@@ -65,6 +204,7 @@ def limpiar_columnas_monetarias(
     columnas: Iterable[str],
     miles: str = ".",
     decimal: str = ",",
+    fallidas: Optional[dict[str, pd.Index]] = None,
 ) -> None:
     """
     Limpia columnas monetarias / numéricas con símbolos.
@@ -73,30 +213,41 @@ def limpiar_columnas_monetarias(
     Supuestos:
     - 'miles' indica separador de miles (por defecto ".")
     - 'decimal' indica separador decimal (por defecto ",")
+
+    Usa el parser vectorizado de monetario.py (una pasada sobre los bytes).
+    Las columnas que ya son numéricas no se modifican.
+    Si se pasa 'fallidas', se guarda por columna el índice de las filas
+    no nulas que no se pudieron convertir.
     """
     for col in columnas:
         if col not in df.columns:
             continue
 
-        s = df[col].astype(str)
+        valores, errores = parsear_monetario(df[col], miles=miles, decimal=decimal)
+        df[col] = valores
 
-        # Quitar todo lo que no sea dígito, signo negativo o separadores comunes
-        s = s.str.replace(r"[^\d\-\.,]", "", regex=True)
-
-        # Quitar separador de miles
-        if miles:
-            s = s.str.replace(miles, "", regex=False)
-
-        # Normalizar separador decimal a "."
-        if decimal and decimal != ".":
-            s = s.str.replace(decimal, ".", regex=False)
-
-        df[col] = pd.to_numeric(s, errors="coerce")
+        if fallidas is not None:
+            fallidas[col] = df.index[errores]
 
 
 # -------------------------------------------------
 # 5) Conversión segura a numérico
 # -------------------------------------------------
+def a_numerico(serie: pd.Series) -> pd.Series:
+    """
+    pd.to_numeric(errors="coerce") que respeta el backend de la columna.
+    Con pd.ArrowDtype los textos no convertibles quedan como null.
+    """
+    if not isinstance(serie.dtype, pd.ArrowDtype):
+        return pd.to_numeric(serie, errors="coerce")
+
+    if pd.api.types.is_numeric_dtype(serie.dtype):
+        return serie
+
+    # pd.to_numeric sobre textos Arrow deja NaN (no null) en los inválidos
+    return como_arrow(pd.to_numeric(serie.astype(str), errors="coerce"), serie)
+
+
 def convertir_a_numerico_seguro(
     df: pd.DataFrame,
     columnas_objetivo: Optional[Iterable[str]] = None,
@@ -108,21 +259,27 @@ def convertir_a_numerico_seguro(
     Caso 1: columnas_objetivo especificadas → convierte solo esas.
     Caso 2: None → convierte columnas tipo texto si al menos
              el 85% de los valores se convierten correctamente.
+
+    En el caso 2 el tipo se infiere primero con una muestra estratificada
+    (inferencia.py): las columnas claramente no numéricas (ej: descripcion)
+    no se convierten completas. Una conversión solo se aplica si la proporción
+    sobre la columna completa supera el umbral.
     """
     if columnas_objetivo is not None:
-        for col in columnas_objetivo:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors="coerce")
+        objetivo = [col for col in columnas_objetivo if col in df.columns]
+        for col in objetivo:
+            df[col] = a_numerico(df[col])
         return
 
     candidatos = df.select_dtypes(include=["object", "string"]).columns
 
     for col in candidatos:
-        convertido = pd.to_numeric(df[col], errors="coerce")
-        ratio_ok = convertido.notna().mean()
+        decision = decidir_por_muestreo(df[col], umbral_conversion, a_numerico)
 
-        if ratio_ok >= umbral_conversion:
-            df[col] = convertido
+        if decision is not False:
+            convertido = a_numerico(df[col])
+            if convertido.notna().mean() >= umbral_conversion:
+                df[col] = convertido
 
 
 # -------------------------------------------------
@@ -142,8 +299,9 @@ def imputar_nulos(
     num_cols = df.select_dtypes(include=[np.number]).columns
 
     for col in num_cols:
-        valor = df[col].mean() if estrategia_num == "mean" else df[col].median()
-        df[col] = df[col].fillna(valor)
+        serie = _entero_con_nulos_a_float(df[col])
+        valor = serie.mean() if estrategia_num == "mean" else serie.median()
+        df[col] = serie.fillna(valor)
 
     # Categóricas
     cat_cols = df.select_dtypes(include=["object", "string", "category"]).columns
@@ -157,8 +315,149 @@ def imputar_nulos(
             df[col] = df[col].fillna(estrategia_cat)
 
 
+def _entero_con_nulos_a_float(serie: pd.Series) -> pd.Series:
+    """
+    Las columnas Arrow enteras admiten nulos; se pasan a float64 (como en NumPy,
+    donde un NaN obliga a float) para no truncar medianas/medias al imputar.
+    """
+    if isinstance(serie.dtype, pd.ArrowDtype) and pd.api.types.is_integer_dtype(serie.dtype) and serie.hasnans:
+        return serie.astype("float64[pyarrow]")
+    return serie
+
+
+# -------------------------------------------------
+# 7) Aplicación de un estado ajustado (sin estadísticas)
+# -------------------------------------------------
+## Textos que pd.read_csv lee como booleanos ("1"/"0" siguen siendo números)
+VERDADEROS = ("True", "TRUE", "true")
+FALSOS = ("False", "FALSE", "false")
+BOOLEANOS = {**dict.fromkeys(VERDADEROS, True), **dict.fromkeys(FALSOS, False)}
+
+
+def a_booleano(serie: pd.Series, con_nulos: bool = False) -> pd.Series:
+    """
+    Textos booleanos -> bool, como pd.read_csv: con nulos (en la columna o en el
+    ajuste, 'con_nulos') u otros valores queda object con True/False/NaN.
+    Se calcula una vez por valor distinto.
+    """
+    if pd.api.types.is_bool_dtype(serie.dtype):
+        return serie
+    booleana = mapear_unicos(serie, lambda unicos: unicos.map(lambda v: BOOLEANOS.get(v, v)).astype(object))
+    if con_nulos or not booleana.isin([True, False]).all():
+        return booleana
+    return booleana.astype(bool)
+
+
+def aplicar_estado(df: pd.DataFrame, estado: LimpiezaEstadoSchema) -> None:
+    """
+    Aplica los pasos 4-6 con decisiones ya ajustadas (DataCleaner.fit):
+    - monetarias y conversiones numéricas del estado
+    - columnas numéricas o booleanas en el ajuste que llegan como texto
+    - relleno con los valores guardados
+    - dtypes finales (int64 solo si no quedan nulos ni decimales)
+    """
+    for col in estado.inferidas:
+        if col in df.columns:
+            df[col] = a_numerico(df[col])
+
+    for col in estado.booleanas:
+        if col in df.columns:
+            df[col] = a_booleano(df[col], con_nulos=col in estado.rellenos)
+
+    if estado.config.columnas_monetarias:
+        limpiar_columnas_monetarias(df, estado.config.columnas_monetarias)
+
+    for col in estado.convertir:
+        if col in df.columns:
+            df[col] = a_numerico(df[col])
+
+    # Columnas numéricas en el ajuste que llegan como texto (ej: CSV leído como str)
+    for col in estado.tipos:
+        if col in df.columns and not pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = a_numerico(df[col])
+
+    for col, valor in estado.rellenos.items():
+        if col in df.columns and valor is not None:
+            df[col] = _entero_con_nulos_a_float(df[col]).fillna(valor)
+
+    for col, tipo in estado.tipos.items():
+        if col not in df.columns:
+            continue
+        if isinstance(df[col].dtype, pd.ArrowDtype):
+            tipo = f"{tipo}[pyarrow]"
+        if df[col].dtype == tipo:
+            continue
+        if tipo.startswith("int64"):
+            valores = df[col].to_numpy(dtype="float64", na_value=np.nan)
+            if np.isnan(valores).any() or (valores % 1 != 0).any():
+                tipo = tipo.replace("int64", "float64")
+        df[col] = df[col].astype(tipo)
+
+
+# -------------------------------------------------
+# 8) Compactación de tipos (opcional, al final)
+# -------------------------------------------------
+ENTEROS_COMPACTOS = ("int8", "int16", "int32", "int64")
+
+
+def compactar_tipos(
+    df: pd.DataFrame,
+    max_proporcion_unicos: float = 0.5,
+    memoria: Optional[dict[str, int]] = None,
+) -> None:
+    """
+    Reduce la memoria del DataFrame limpio sin perder información:
+    - enteros (y flotantes sin decimales ni nulos) al entero más angosto que
+      contiene su rango (ej: habitaciones -> int8)
+    - otros flotantes a float32 solo si todos los valores se representan exactos
+    - texto con pocos valores distintos (tipo, barrio, upz) a 'category':
+      cada valor se guarda una vez y las filas guardan un código
+
+    Si se pasa 'memoria', se guarda la memoria total (deep) antes y después.
+    """
+    if memoria is not None:
+        memoria["antes"] = int(df.memory_usage(deep=True).sum())
+
+    for col in df.columns:
+        serie = df[col]
+        if pd.api.types.is_bool_dtype(serie.dtype) or len(serie) == 0:
+            continue
+        if pd.api.types.is_numeric_dtype(serie.dtype):
+            tipo = _tipo_numerico_compacto(serie)
+            if tipo is not None:
+                df[col] = serie.astype(f"{tipo}[pyarrow]" if isinstance(serie.dtype, pd.ArrowDtype) else tipo)
+        elif pd.api.types.is_object_dtype(serie.dtype) or pd.api.types.is_string_dtype(serie.dtype):
+            if serie.nunique(dropna=True) <= max_proporcion_unicos * len(serie):
+                df[col] = serie.astype("category")
+
+    if memoria is not None:
+        memoria["despues"] = int(df.memory_usage(deep=True).sum())
+
+
+def _tipo_numerico_compacto(serie: pd.Series) -> Optional[str]:
+    """Dtype más angosto que representa exactamente la columna (None = dejarla igual)."""
+    valores = serie.to_numpy(dtype="float64", na_value=np.nan)
+    nulos = np.isnan(valores)
+    if nulos.all():
+        return None
+    nombre = serie.dtype.name.removesuffix("[pyarrow]")
+
+    # Un entero NumPy no admite nulos; uno Arrow sí
+    admite_entero = not nulos.any() or isinstance(serie.dtype, pd.ArrowDtype)
+    presentes = valores[~nulos]
+    if admite_entero and (pd.api.types.is_integer_dtype(serie.dtype) or (presentes % 1 == 0).all()):
+        minimo, maximo = presentes.min(), presentes.max()
+        for tipo in ENTEROS_COMPACTOS:
+            if np.iinfo(tipo).min <= minimo and maximo <= np.iinfo(tipo).max:
+                return None if tipo == nombre else tipo
+
+    if nombre == "float64" and np.array_equal(valores.astype(np.float32).astype(np.float64), valores, equal_nan=True):
+        return "float32"
+    return None
+
+
 # -------------------------------------------------
-# 7) Pipeline principal
+# 9) Pipeline principal
 # -------------------------------------------------
 def limpiar_dataframe(
     df: pd.DataFrame,
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from typing import Any, Optional
+from uuid import uuid4
 
 from pydantic import BaseModel, Field, ConfigDict
 
@@ -43,6 +44,24 @@ class LimpiezaConfigSchema(BaseModel):
         examples=["moda", "desconocido"],
     )
 
+    columnas_texto: Optional[list[str]] = Field(
+        default=None,
+        description=(
+            "Columnas de texto cuyos valores se normalizan antes de buscar duplicados: "
+            "sin espacios laterales ni repetidos, minúsculas y sin acentos."
+        ),
+        examples=[["tipo", "barrio", "upz"]],
+    )
+
+    columnas_lectura: Optional[list[str]] = Field(
+        default=None,
+        description=(
+            "Columnas que lee del CSV limpieza.carga.leer_csv_limpieza (nombres estandarizados, "
+            "ej: 'area' para 'Área'). None = todas."
+        ),
+        examples=[["tipo", "habitaciones", "banos", "area", "barrio", "upz", "valor"]],
+    )
+
     umbral_conversion: float = Field(
         default=0.85,
         description="Proporción mínima para convertir una columna texto a numérica.",
@@ -51,6 +70,145 @@ class LimpiezaConfigSchema(BaseModel):
         examples=[0.85],
     )
 
+    backend: str = Field(
+        default="numpy",
+        description=(
+            "Representación de las columnas durante la limpieza: 'numpy' (por defecto) "
+            "o 'arrow' (pd.ArrowDtype de principio a fin; requiere pyarrow)."
+        ),
+        pattern="^(numpy|arrow)$",
+        examples=["numpy", "arrow"],
+    )
+
+    n_jobs: Optional[int] = Field(
+        default=1,
+        description=(
+            "Hilos para limpiar por fragmentos de filas (1 = serial, None = todos los núcleos). "
+            "El resultado es el mismo que con la ejecución serial."
+        ),
+        ge=1,
+        examples=[1, 4],
+    )
+
+    dedup_entre_lotes: bool = Field(
+        default=False,
+        description=(
+            "Descarta filas ya vistas en lotes anteriores usando el índice persistente "
+            "de duplicados (en la API, el configurado con LIMPIEZA_DEDUP_INDICE)."
+        ),
+        examples=[False],
+    )
+
+    casi_duplicados: Optional[str] = Field(
+        default=None,
+        description=(
+            "Avisos casi duplicados (descripción parecida, mismo barrio/UPZ, valor y área casi iguales): "
+            "'eliminar' conserva la primera fila de cada grupo, 'marcar' agrega las columnas "
+            "'casi_duplicado' y 'grupo_casi_duplicado'. None = no se buscan."
+        ),
+        pattern="^(eliminar|marcar)$",
+        examples=["eliminar", "marcar"],
+    )
+
+    umbral_similitud: float = Field(
+        default=0.8,
+        description="Similitud de Jaccard mínima (shingles de 4 caracteres) entre descripciones casi duplicadas.",
+        gt=0.0,
+        le=1.0,
+        examples=[0.8],
+    )
+
+    tolerancia_casi_duplicados: float = Field(
+        default=0.05,
+        description="Diferencia relativa máxima de valor y área entre avisos casi duplicados.",
+        ge=0.0,
+        le=1.0,
+        examples=[0.05],
+    )
+
+    compacto: bool = Field(
+        default=False,
+        description=(
+            "Reduce la memoria del resultado: numéricas al tipo más angosto que las "
+            "representa exactas (ej: int8) y texto con pocos valores distintos a 'category'. "
+            "El reporte incluye la memoria antes y después."
+        ),
+        examples=[True],
+    )
+
+    estado_id: Optional[str] = Field(
+        default=None,
+        description=(
+            "Id de un estado ajustado (DataCleaner.fit) cargado en la API. "
+            "Si se indica, se limpia con ese estado y su configuración."
+        ),
+        examples=["inmuebles_2026"],
+    )
+
+
+## Estado ajustado con DataCleaner.fit; se serializa a JSON para reutilizarlo.
+class LimpiezaEstadoSchema(BaseModel):
+    """
+    Estado ajustado (fit) del pipeline de limpieza.
+
+    Guarda las decisiones que dependen de los datos para que transform()
+    no tenga que recalcular estadísticas:
+    - mapeo de nombres de columnas
+    - columnas que pasan a numérico
+    - valores de relleno y dtypes finales
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    id: str = Field(default_factory=lambda: uuid4().hex, description="Identificador del estado.")
+    config: LimpiezaConfigSchema = Field(..., description="Configuración usada en el ajuste.")
+    n_filas_ajuste: int = Field(..., ge=0, description="Filas (sin duplicados) usadas en el ajuste.")
+
+    columnas: dict[str, str] = Field(
+        default_factory=dict,
+        description="Mapeo nombre original -> nombre estandarizado.",
+    )
+    inferidas: list[str] = Field(
+        default_factory=list,
+        description="Columnas leídas como texto que se interpretan como numéricas (CSV por bloques).",
+    )
+    booleanas: list[str] = Field(
+        default_factory=list,
+        description="Columnas leídas como texto que se interpretan como booleanas (CSV por bloques).",
+    )
+    convertir: list[str] = Field(
+        default_factory=list,
+        description="Columnas que se convierten a numérico en el paso 5.",
+    )
+    rellenos: dict[str, Any] = Field(
+        default_factory=dict,
+        description="Valor de imputación por columna (None: sin valor disponible).",
+    )
+    tipos: dict[str, str] = Field(
+        default_factory=dict,
+        description="Dtype final de las columnas numéricas ('int64' o 'float64').",
+    )
+
+
+## Métricas de una etapa del pipeline (sección opcional 'etapas' del reporte).
+class EtapaReporteSchema(BaseModel):
+    """
+    Tiempo, filas y celdas afectadas por una etapa de la limpieza.
+    """
+
+    nombre: str = Field(..., description="Etapa del pipeline.", examples=["eliminar_duplicados"])
+    tiempo_s: float = Field(..., ge=0, description="Tiempo de pared en segundos.")
+    filas_entrada: int = Field(..., ge=0, description="Filas al comenzar la etapa.")
+    filas_salida: int = Field(..., ge=0, description="Filas al terminar la etapa.")
+    filas_eliminadas: int = Field(0, ge=0, description="Filas descartadas (duplicados, casi duplicados).")
+    celdas_a_nulo: int = Field(0, ge=0, description="Celdas que pasan a nulo (vacíos, conversiones fallidas).")
+    nulos_rellenados: int = Field(0, ge=0, description="Nulos rellenados por la imputación.")
+    memoria_pico_bytes: Optional[int] = Field(
+        default=None,
+        ge=0,
+        description="Pico de memoria asignada durante la etapa (tracemalloc); None si no se midió.",
+    )
+
 
 ## Estructura un reporte serializable para retornarlo en una API.
 class LimpiezaReporteSchema(BaseModel):
@@ -64,7 +222,70 @@ class LimpiezaReporteSchema(BaseModel):
     columnas: list[str] = Field(..., description="Lista final de columnas en el DataFrame limpio.")
 
     # Preview opcional (sirve para APIs; evita retornar todo el DF)
-    preview: list[dict[str, Any]] = Field(
+    preview: list[dict[str, Any]] | dict[str, Any] = Field(
         default_factory=list,
-        description="Muestra de filas limpias en formato JSON (records).",
-    )
\ No newline at end of file
+        description=(
+            "Muestra de filas limpias: lista de registros ('records'), "
+            "{'columns', 'data': {col: [...]}} ('columnar') o {'columns', 'data': [[...]]} ('split')."
+        ),
+    )
+
+    # Memoria del resultado (solo con config.compacto)
+    memoria_antes_bytes: Optional[int] = Field(
+        default=None, ge=0, description="Memoria (deep) del DataFrame limpio antes de compactar tipos."
+    )
+    memoria_despues_bytes: Optional[int] = Field(
+        default=None, ge=0, description="Memoria (deep) del DataFrame limpio después de compactar tipos."
+    )
+
+    # Métricas por etapa (solo si se piden: run_with_report(etapas=True))
+    etapas: Optional[list[EtapaReporteSchema]] = Field(
+        default=None,
+        description="Tiempo, filas y celdas afectadas por cada etapa del pipeline.",
+    )
+
+## Punto de control del modo incremental (limpieza/incremental.py); se guarda en JSON.
+class CheckpointIncrementalSchema(BaseModel):
+    """
+    Hasta dónde se limpió un CSV al que solo se agregan filas y lo necesario para
+    seguir: estado en uso, estadísticas acumuladas y salida escrita. El índice de
+    duplicados se guarda aparte (<checkpoint>.dedup).
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    encabezado: list[str] = Field(..., description="Columnas del CSV de entrada.")
+    offset_bytes: int = Field(..., ge=0, description="Byte siguiente a la última fila procesada.")
+    huella: str = Field(..., description="SHA-256 del primer MiB ya procesado (detecta archivos reescritos).")
+    filas_leidas: int = Field(..., ge=0, description="Filas del CSV procesadas en total.")
+    filas_escritas: int = Field(..., ge=0, description="Filas escritas en la salida en total.")
+    partes: int = Field(0, ge=0, description="Partes Parquet escritas (salida en un directorio).")
+    estado: LimpiezaEstadoSchema = Field(..., description="Estado con que se limpian las filas nuevas.")
+    estadisticas: dict[str, Any] = Field(
+        ..., description="Estadísticas acumuladas de todas las filas (AcumuladorLimpieza.a_dict())."
+    )
+
+
+## Resultado de una ejecución incremental.
+class IncrementalReporteSchema(BaseModel):
+    """
+    Filas nuevas procesadas en una ejecución incremental y si se reajustó el estado.
+    """
+
+    filas_leidas: int = Field(..., ge=0, description="Filas nuevas leídas en esta ejecución.")
+    filas_escritas: int = Field(..., ge=0, description="Filas agregadas a la salida (sin duplicados).")
+    filas_totales: int = Field(..., ge=0, description="Filas del CSV procesadas en total.")
+    offset_bytes: int = Field(..., ge=0, description="Nuevo punto de control en bytes.")
+    deriva: float = Field(
+        0.0,
+        ge=0,
+        description="Máxima deriva de los rellenos: cambio relativo (numéricos) o 1 si cambió una moda.",
+    )
+    reajustado: bool = Field(False, description="Si se recalcularon los rellenos y tipos del estado.")
+    motivo: Optional[str] = Field(
+        default=None,
+        description="Por qué se reajustó: primera ejecución, deriva sobre el umbral o cambio de tipos.",
+        pattern="^(inicial|deriva|tipos)$",
+        examples=["deriva"],
+    )
+    parte: Optional[str] = Field(default=None, description="Parte Parquet escrita en esta ejecución.")
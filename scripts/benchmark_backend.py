@@ -0,0 +1,74 @@
+## Compara tiempo y memoria pico del backend "numpy" (actual) contra "arrow"
+# en el flujo completo: leer CSV -> DataCleaner.run -> escribir Parquet.
+# Cada backend corre en un subproceso para medir su memoria pico por separado.
+#
+# Uso: python scripts/benchmark_backend.py [repeticiones_del_csv]
+
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from limpieza import DataCleaner
+from limpieza.arrow_io import escribir_parquet, leer_csv_arrow
+
+CONFIG = {"columnas_monetarias": ["valor"]}
+
+
+def ejecutar(backend: str, ruta_csv: str, ruta_salida: str) -> dict:
+    tiempos = {}
+
+    inicio = time.perf_counter()
+    if backend == "arrow":
+        df = leer_csv_arrow(ruta_csv)
+    else:
+        df = pd.read_csv(ruta_csv, encoding="utf-8")
+    tiempos["lectura"] = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    df_limpio = DataCleaner({**CONFIG, "backend": backend}).run(df)
+    tiempos["limpieza"] = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    if backend == "arrow":
+        escribir_parquet(df_limpio, ruta_salida)
+    else:
+        df_limpio.to_parquet(ruta_salida, index=False)
+    tiempos["escritura"] = time.perf_counter() - inicio
+
+    return {
+        "backend": backend,
+        "filas": len(df),
+        "tiempos_s": {etapa: round(t, 3) for etapa, t in tiempos.items()},
+        "total_s": round(sum(tiempos.values()), 3),
+        "rss_pico_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4:  # modo subproceso: backend ruta_csv ruta_salida
+        print(json.dumps(ejecutar(*sys.argv[1:])))
+        sys.exit(0)
+
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    base = pd.read_csv("inmuebles_bogota.csv", encoding="utf-8")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta_csv = str(Path(tmp) / "inmuebles_grande.csv")
+        # Copias distintas (descripción con sufijo) para que no se eliminen como duplicados
+        copias = [base.assign(Descripcion=base["Descripcion"] + f" #{k}") for k in range(repeticiones)]
+        pd.concat(copias, ignore_index=True).to_csv(ruta_csv, index=False)
+
+        for backend in ("numpy", "arrow"):
+            salida = subprocess.run(
+                [sys.executable, __file__, backend, ruta_csv, str(Path(tmp) / f"{backend}.parquet")],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            print(salida.stdout.strip())
@@ -0,0 +1,78 @@
+## Compara la carga del CSV de los scripts (pd.read_csv) con leer_csv_limpieza
+# (lector CSV de pyarrow por bloques con lectura anticipada, columnas y tipos según la configuración):
+# tiempo y RSS pico de la carga sola y de carga + DataCleaner.run. Cada medición
+# corre en su propio subproceso (ver benchmark_suite.py).
+#
+# Uso: python scripts/benchmark_carga.py [millones_de_filas]
+#      ej: python scripts/benchmark_carga.py 2
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from benchmark_suite import medir
+from generar_datos import escribir_inmuebles
+
+CONFIG = {"columnas_monetarias": ["valor"]}
+## Sin la descripción (texto largo que no usa el análisis)
+CONFIG_PODADA = {**CONFIG, "columnas_lectura": ["tipo", "habitaciones", "banos", "area", "barrio", "upz", "valor"]}
+
+
+def cargar(variante: str, ruta_csv: str) -> pd.DataFrame:
+    if variante == "pd.read_csv":
+        return pd.read_csv(ruta_csv, encoding="utf-8")
+    from limpieza.carga import leer_csv_limpieza
+
+    if variante == "leer_csv_limpieza":
+        return leer_csv_limpieza(ruta_csv, CONFIG)
+    if variante == "leer_csv_limpieza_podada":
+        return leer_csv_limpieza(ruta_csv, CONFIG_PODADA)
+    return leer_csv_limpieza(ruta_csv, CONFIG, backend="arrow")
+
+
+VARIANTES = ["pd.read_csv", "leer_csv_limpieza", "leer_csv_limpieza_podada", "leer_csv_limpieza_arrow"]
+
+
+def medir_variante(variante: str, ruta_csv: str, limpiar: bool) -> dict:
+    from limpieza import DataCleaner
+
+    filas = sum(1 for _ in open(ruta_csv, encoding="utf-8")) - 1
+    config = {**CONFIG, "backend": "arrow"} if variante.endswith("arrow") else CONFIG
+
+    def ejecutar() -> None:
+        df = cargar(variante, ruta_csv)
+        if limpiar:
+            DataCleaner(config).run(df)
+
+    nombre = f"{variante}{' + run' if limpiar else ''}"
+    return medir(nombre, ejecutar, filas)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 5 and sys.argv[1] == "--medir":  # modo subproceso: variante ruta_csv limpiar
+        print(json.dumps(medir_variante(sys.argv[2], sys.argv[3], sys.argv[4] == "1")))
+        sys.exit(0)
+
+    millones = float(sys.argv[1]) if len(sys.argv) > 1 else 1
+    raiz = str(Path(__file__).resolve().parent.parent)
+    entorno = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [raiz, os.environ.get("PYTHONPATH")]))}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta_csv = str(Path(tmp) / "inmuebles.csv")
+        escribir_inmuebles(ruta_csv, int(millones * 1_000_000))
+        for limpiar in ("0", "1"):
+            for variante in VARIANTES:
+                salida = subprocess.run(
+                    [sys.executable, __file__, "--medir", variante, ruta_csv, limpiar],
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                    cwd=raiz,
+                    env=entorno,
+                )
+                print(salida.stdout.strip())
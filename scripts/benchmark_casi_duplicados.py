@@ -0,0 +1,87 @@
+## Mide la etapa de casi duplicados (MinHash + LSH) sobre inmuebles_bogota.csv
+# escalado con copias y avisos republicados sintéticos (descripción con un cambio
+# pequeño, valor +-2% y área +-1), y reporta la exhaustividad sobre esos avisos.
+#
+# Uso: python scripts/benchmark_casi_duplicados.py [copias,...] [proporcion_republicados]
+
+import json
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from limpieza import DataCleaner
+from limpieza.pipeline import convertir_vacios_a_nan, eliminar_casi_duplicados, estandarizar_nombres_columnas
+
+CONFIG = {"columnas_monetarias": ["valor"]}
+
+## Cambios pequeños de texto al republicar (la normalización ignora mayúsculas y espacios)
+EDICIONES = [
+    lambda t: t + "!",
+    lambda t: t + " ya",
+    lambda t: t.upper(),
+    lambda t: t.replace(" en ", "  en ", 1),
+]
+
+
+def escalar(base: pd.DataFrame, copias: int, proporcion: float, semilla: int = 0) -> pd.DataFrame:
+    """
+    'copias' del CSV en barrios distintos (no son casi duplicados entre sí) más una
+    fracción de avisos republicados con la columna 'republicado' = posición del original.
+    """
+    rng = np.random.default_rng(semilla)
+    partes = [base.assign(Barrio=base["Barrio"] + f" {k}") for k in range(copias)]
+    df = pd.concat(partes, ignore_index=True)
+    df["republicado"] = -1
+
+    origen = rng.choice(len(df), size=int(proporcion * len(df)), replace=False)
+    reposts = df.iloc[origen].copy()
+    edicion = rng.integers(len(EDICIONES), size=len(reposts))
+    reposts["Descripcion"] = [EDICIONES[e](t) for e, t in zip(edicion, reposts["Descripcion"])]
+
+    valor = pd.to_numeric(reposts["Valor"].str.replace(r"\D", "", regex=True), errors="coerce")
+    valor = (valor * rng.uniform(0.98, 1.02, size=len(reposts))).round(-6)
+    reposts["Valor"] = valor.map(lambda v: f"$ {v:,.0f}".replace(",", "."), na_action="ignore")
+    reposts["Área"] = reposts["Área"] + rng.integers(-1, 2, size=len(reposts))
+    reposts["republicado"] = origen
+
+    return pd.concat([df, reposts], ignore_index=True)
+
+
+def medir(df: pd.DataFrame) -> dict:
+    datos = df.drop(columns="republicado")
+
+    # Solo la etapa, sobre el DataFrame con nombres y vacíos ya normalizados
+    preparado = datos.copy()
+    estandarizar_nombres_columnas(preparado)
+    convertir_vacios_a_nan(preparado)
+    inicio = time.perf_counter()
+    eliminar_casi_duplicados(preparado, accion="marcar")
+    t_etapa = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    limpio = DataCleaner({**CONFIG, "casi_duplicados": "marcar"}).run(datos)
+    t_run = time.perf_counter() - inicio
+
+    # Exhaustividad: avisos republicados marcados (o descartados como duplicado exacto)
+    es_repost = df["republicado"].to_numpy() >= 0
+    marcado = limpio["casi_duplicado"].reindex(df.index, fill_value=True).to_numpy()
+    return {
+        "filas": len(df),
+        "republicados": int(es_repost.sum()),
+        "exhaustividad": round(float(marcado[es_repost].mean()), 4),
+        "marcadas": int(limpio["casi_duplicado"].sum()),
+        "tiempo_etapa_s": round(t_etapa, 3),
+        "filas_por_s_etapa": int(len(df) / t_etapa),
+        "tiempo_run_s": round(t_run, 3),
+    }
+
+
+if __name__ == "__main__":
+    niveles = [int(c) for c in sys.argv[1].split(",")] if len(sys.argv) > 1 else [1, 5, 20]
+    proporcion = float(sys.argv[2]) if len(sys.argv) > 2 else 0.1
+
+    base = pd.read_csv("inmuebles_bogota.csv", encoding="utf-8")
+    for copias in niveles:
+        print(json.dumps({"copias": copias, **medir(escalar(base, copias, proporcion))}))
@@ -0,0 +1,52 @@
+## Compara el parser monetario vectorizado con la ruta original (regex)
+# sobre una columna 'valor' sintética de varios millones de filas.
+#
+# Uso: python scripts/benchmark_monetario.py [n_filas]
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from limpieza.monetario import _parsear_monetario_regex, parsear_monetario
+
+
+def generar_valores(n: int, seed: int = 0) -> pd.Series:
+    """Genera valores tipo "$ 360.000.000" con nulos, negativos y textos inválidos."""
+    rng = np.random.default_rng(seed)
+    millones = rng.integers(50, 5_000, size=n) * 1_000_000
+    textos = pd.Series(millones).map(lambda v: f"$ {v:,}".replace(",", "."))
+
+    textos[rng.random(n) < 0.02] = None
+    textos[rng.random(n) < 0.01] = "Consultar"
+    negativos = rng.random(n) < 0.01
+    textos[negativos] = "-" + textos[negativos]
+
+    return textos.astype("str")
+
+
+def medir(funcion, serie: pd.Series, repeticiones: int = 3) -> tuple[float, pd.Series]:
+    mejor = float("inf")
+    resultado = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion(serie)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor, resultado
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 3_000_000
+    serie = generar_valores(n)
+
+    t_regex, esperado = medir(_parsear_monetario_regex, serie)
+    t_kernel, (obtenido, fallidas) = medir(parsear_monetario, serie)
+
+    pd.testing.assert_series_equal(obtenido, esperado)
+
+    print(f"Filas: {n:,} (dtype {serie.dtype})")
+    print(f"regex (astype + 3x replace + to_numeric): {t_regex:.3f} s")
+    print(f"parsear_monetario (una pasada):            {t_kernel:.3f} s")
+    print(f"Aceleración: {t_regex / t_kernel:.1f}x")
+    print(f"Filas no convertibles reportadas: {int(fallidas.sum()):,}")
@@ -0,0 +1,61 @@
+## Mide el escalamiento de DataCleaner.run con n_jobs = 1, 2, 4, ... hasta los
+# núcleos disponibles, y verifica que el resultado sea igual al de la ejecución serial.
+#
+# Uso: python scripts/benchmark_paralelo.py [repeticiones_del_csv] [backend] [n_jobs,...]
+
+import json
+import os
+import sys
+import time
+
+import pandas as pd
+
+from limpieza import DataCleaner
+
+CONFIG = {"columnas_monetarias": ["valor"]}
+
+
+def medir(df: pd.DataFrame, config: dict, repeticiones: int = 3) -> tuple[float, pd.DataFrame]:
+    mejor = float("inf")
+    resultado = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = DataCleaner(config).run(df)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor, resultado
+
+
+if __name__ == "__main__":
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    backend = sys.argv[2] if len(sys.argv) > 2 else "numpy"
+
+    base = pd.read_csv("inmuebles_bogota.csv", encoding="utf-8")
+    # Copias distintas (descripción con sufijo) para que no se eliminen como duplicados
+    copias = [base.assign(Descripcion=base["Descripcion"] + f" #{k}") for k in range(repeticiones)]
+    df = pd.concat(copias, ignore_index=True)
+
+    nucleos = os.cpu_count() or 1
+    if len(sys.argv) > 3:
+        niveles = sorted({1, *map(int, sys.argv[3].split(","))})
+    else:
+        niveles = sorted({1, *(2**k for k in range(1, nucleos.bit_length())), nucleos})
+
+    t_serial, esperado = medir(df, {**CONFIG, "backend": backend})
+    for n_jobs in niveles:
+        if n_jobs == 1:
+            tiempo, obtenido = t_serial, esperado
+        else:
+            tiempo, obtenido = medir(df, {**CONFIG, "backend": backend, "n_jobs": n_jobs})
+            pd.testing.assert_frame_equal(obtenido, esperado)
+
+        print(
+            json.dumps(
+                {
+                    "backend": backend,
+                    "filas": len(df),
+                    "n_jobs": n_jobs,
+                    "tiempo_s": round(tiempo, 3),
+                    "aceleracion": round(t_serial / tiempo, 2),
+                }
+            )
+        )
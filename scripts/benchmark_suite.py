@@ -0,0 +1,221 @@
+## Suite de benchmarks del paquete limpieza sobre datos sintéticos (generar_datos.py):
+# tiempo, RSS pico y filas por segundo de cada etapa del pipeline, de DataCleaner.run
+# y de POST /limpiar (cliente ASGI en el mismo proceso). Cada medición corre en un
+# subproceso para que su RSS pico no dependa de las anteriores. El resultado se
+# guarda en JSON para comparar corridas.
+#
+# Uso: python scripts/benchmark_suite.py [tamaños] [salida.json]
+#      ej: python scripts/benchmark_suite.py 100000,1000000,10000000 resultados.json
+#      python scripts/benchmark_suite.py --comparar antes.json despues.json
+
+import asyncio
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from generar_datos import escribir_inmuebles
+
+CONFIG = {"columnas_monetarias": ["valor"]}
+TAMANOS = [100_000, 1_000_000]
+## /limpiar recibe el payload JSON completo: por encima de este tamaño se omite
+MAX_FILAS_API = 1_000_000
+
+
+# -------------------------------------------------
+# 1) Medición de memoria
+# -------------------------------------------------
+def _reiniciar_pico_rss() -> bool:
+    """Reinicia VmHWM (Linux); si no se puede, el pico es el del proceso completo."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _pico_rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for linea in f:
+                if linea.startswith("VmHWM:"):
+                    return round(int(linea.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def medir(nombre: str, funcion, filas: int) -> dict:
+    _reiniciar_pico_rss()
+    inicio = time.perf_counter()
+    funcion()
+    tiempo = time.perf_counter() - inicio
+    return {
+        "medicion": nombre,
+        "filas": filas,
+        "tiempo_s": round(tiempo, 4),
+        "rss_pico_mb": _pico_rss_mb(),
+        "filas_por_s": int(filas / tiempo) if tiempo > 0 else None,
+    }
+
+
+# -------------------------------------------------
+# 2) Mediciones (cada una en su subproceso)
+# -------------------------------------------------
+def medir_etapas(df: pd.DataFrame) -> list[dict]:
+    """Cada etapa del pipeline en orden, sobre la misma copia de trabajo (como run)."""
+    from limpieza.pipeline import (
+        convertir_a_numerico_seguro,
+        convertir_vacios_a_nan,
+        eliminar_duplicados,
+        estandarizar_nombres_columnas,
+        imputar_nulos,
+        limpiar_columnas_monetarias,
+    )
+
+    trabajo = df.copy()
+    etapas = [
+        ("estandarizar_nombres_columnas", lambda: estandarizar_nombres_columnas(trabajo)),
+        ("convertir_vacios_a_nan", lambda: convertir_vacios_a_nan(trabajo)),
+        ("eliminar_duplicados", lambda: eliminar_duplicados(trabajo)),
+        ("limpiar_columnas_monetarias", lambda: limpiar_columnas_monetarias(trabajo, CONFIG["columnas_monetarias"])),
+        ("convertir_a_numerico_seguro", lambda: convertir_a_numerico_seguro(trabajo)),
+        ("imputar_nulos", lambda: imputar_nulos(trabajo)),
+    ]
+    # Las filas de cada etapa son las que recibe (después de duplicados son menos)
+    resultados = []
+    for nombre, funcion in etapas:
+        resultados.append(medir(f"etapa.{nombre}", funcion, len(trabajo)))
+    return resultados
+
+
+def medir_run(df: pd.DataFrame) -> list[dict]:
+    from limpieza import DataCleaner
+
+    return [medir("DataCleaner.run", lambda: DataCleaner(CONFIG).run(df), len(df))]
+
+
+def medir_api(df: pd.DataFrame) -> list[dict]:
+    os.environ["LIMPIEZA_CACHE_MB"] = "0"  # sin caché: se mide la limpieza
+    import httpx
+
+    from api.main import app
+
+    # Formato columnar: el payload más compacto que acepta /limpiar
+    columnas = ",".join(
+        f"{json.dumps(col)}:{df[col].to_json(orient='values', force_ascii=False)}" for col in df.columns
+    )
+    cuerpo = f'{{"config":{json.dumps(CONFIG)},"data":{{{columnas}}}}}'.encode("utf-8")
+
+    async def enviar() -> None:
+        transporte = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transporte, base_url="http://bench", timeout=None) as cliente:
+            respuesta = await cliente.post("/limpiar", content=cuerpo, headers={"Content-Type": "application/json"})
+            respuesta.raise_for_status()
+
+    resultado = medir("POST /limpiar", lambda: asyncio.run(enviar()), len(df))
+    resultado["payload_mb"] = round(len(cuerpo) / 1024**2, 1)
+    return [resultado]
+
+
+MEDICIONES = {"etapas": medir_etapas, "run": medir_run, "api": medir_api}
+
+
+# -------------------------------------------------
+# 3) Orquestación y comparación
+# -------------------------------------------------
+def ejecutar_subproceso(medicion: str, ruta_csv: str) -> list[dict]:
+    raiz = str(Path(__file__).resolve().parent.parent)
+    entorno = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [raiz, os.environ.get("PYTHONPATH")]))}
+    salida = subprocess.run(
+        [sys.executable, __file__, "--medir", medicion, ruta_csv],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=raiz,
+        env=entorno,
+    )
+    return json.loads(salida.stdout)
+
+
+def metadatos() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "nucleos": os.cpu_count(),
+    }
+
+
+def comparar(ruta_antes: str, ruta_despues: str) -> None:
+    """Imprime la razón de tiempos y memoria (después / antes) por medición y tamaño."""
+    cargar = lambda ruta: {
+        (r["tamano"], r["medicion"]): r for r in json.loads(Path(ruta).read_text(encoding="utf-8"))["resultados"]
+    }
+    antes, despues = cargar(ruta_antes), cargar(ruta_despues)
+    for clave in sorted(antes.keys() & despues.keys()):
+        a, d = antes[clave], despues[clave]
+        print(
+            json.dumps(
+                {
+                    "tamano": clave[0],
+                    "medicion": clave[1],
+                    "tiempo_s": [a["tiempo_s"], d["tiempo_s"]],
+                    "razon_tiempo": round(d["tiempo_s"] / a["tiempo_s"], 3) if a["tiempo_s"] else None,
+                    "razon_rss": round(d["rss_pico_mb"] / a["rss_pico_mb"], 3) if a["rss_pico_mb"] else None,
+                }
+            )
+        )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--medir":  # modo subproceso: medicion ruta_csv
+        df = pd.read_csv(sys.argv[3], encoding="utf-8")
+        print(json.dumps(MEDICIONES[sys.argv[2]](df)))
+        sys.exit(0)
+
+    if len(sys.argv) == 4 and sys.argv[1] == "--comparar":
+        comparar(sys.argv[2], sys.argv[3])
+        sys.exit(0)
+
+    tamanos = [int(float(t)) for t in sys.argv[1].split(",")] if len(sys.argv) > 1 else TAMANOS
+    ruta_salida = sys.argv[2] if len(sys.argv) > 2 else "benchmark_resultados.json"
+
+    resultados = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for tamano in tamanos:
+            ruta_csv = str(Path(tmp) / f"inmuebles_{tamano}.csv")
+            escribir_inmuebles(ruta_csv, tamano)
+
+            for medicion in MEDICIONES:
+                if medicion == "api" and tamano > MAX_FILAS_API:
+                    continue
+                for resultado in ejecutar_subproceso(medicion, ruta_csv):
+                    resultado = {"tamano": tamano, **resultado}
+                    print(json.dumps(resultado))
+                    resultados.append(resultado)
+
+            Path(ruta_csv).unlink()
+
+    Path(ruta_salida).write_text(
+        json.dumps({"metadatos": metadatos(), "resultados": resultados}, indent=2), encoding="utf-8"
+    )
+    print(f"Resultados en {ruta_salida}")
@@ -1,19 +1,37 @@
-import pandas as pd
+## Limpia inmuebles_bogota.csv y guarda data_limpia.csv.
+# Uso: python scripts/ejecutar_pipeline.py                 (archivo completo)
+#      python scripts/ejecutar_pipeline.py --incremental   (solo las filas agregadas
+#      desde la última ejecución; con una salida sin '.csv' escribe partes Parquet)
+#      ej: python scripts/ejecutar_pipeline.py --incremental data_limpia_partes
+
+import sys
+
 from limpieza import DataCleaner
+from limpieza.carga import leer_csv_limpieza
+from limpieza.incremental import limpiar_incremental
+
+CONFIG = {
+    "columnas_monetarias": ["valor"],
+    "estrategia_num": "median",
+    "estrategia_cat": "moda",
+    "umbral_conversion": 0.85,
+}
+
+if len(sys.argv) > 1 and sys.argv[1] == "--incremental":
+    salida = sys.argv[2] if len(sys.argv) > 2 else "data_limpia.csv"
+    reporte = limpiar_incremental(
+        "inmuebles_bogota.csv", salida, f"{salida.rstrip('/')}.checkpoint.json", config=CONFIG
+    )
+    print("Filas nuevas limpiadas correctamente.")
+    print("Reporte (dict):", reporte.model_dump())
+    sys.exit(0)
 
-df = pd.read_csv("inmuebles_bogota.csv", encoding="utf-8")
+df = leer_csv_limpieza("inmuebles_bogota.csv", CONFIG)
 
-cleaner = DataCleaner(
-    config={
-        "columnas_monetarias": ["valor"],
-        "estrategia_num": "median",
-        "estrategia_cat": "moda",
-        "umbral_conversion": 0.85,
-    }
-)
+cleaner = DataCleaner(config=CONFIG)
 
 df_limpio, reporte = cleaner.run_with_report(df, preview_rows=3)
 
 df_limpio.to_csv("data_limpia.csv", index=False)
 print("Base limpia guardada correctamente.")
-print("Reporte (dict):", reporte.model_dump())
\ No newline at end of file
+print("Reporte (dict):", reporte.model_dump())
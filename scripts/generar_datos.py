@@ -0,0 +1,79 @@
+## Generador de datos sintéticos a partir de inmuebles_bogota.csv para benchmarks.
+# Remuestrea filas reales (conserva la distribución conjunta de Tipo, Barrio, UPZ,
+# habitaciones, baños, área y valor), perturba valor y área, y agrega vacíos y
+# duplicados en proporciones controladas. Escribe el CSV por bloques, así que
+# sirve para 10M de filas sin tenerlas todas en memoria.
+#
+# Uso: python scripts/generar_datos.py n_filas salida.csv [semilla]
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+RUTA_BASE = "inmuebles_bogota.csv"
+FILAS_POR_BLOQUE = 1_000_000
+
+
+def _formato_monetario(valores: np.ndarray) -> np.ndarray:
+    """Enteros -> "$ 360.000.000" (se formatea cada valor distinto una sola vez)."""
+    unicos, inverso = np.unique(valores, return_inverse=True)
+    textos = np.array([f"$ {v:,}".replace(",", ".") for v in unicos.tolist()], dtype=object)
+    return textos[inverso]
+
+
+def generar_inmuebles(
+    n_filas: int,
+    semilla: int = 0,
+    proporcion_duplicados: float = 0.05,
+    proporcion_vacios: float = 0.02,
+    base: pd.DataFrame | None = None,
+) -> pd.DataFrame:
+    """
+    DataFrame con las columnas originales del CSV (nombres sin estandarizar):
+
+    - filas remuestreadas del CSV real, con Valor x lognormal(0, 0.1) redondeado
+      a millones y Área +-10%, como texto monetario "$ 360.000.000"
+    - 'proporcion_vacios' de celdas vacías ("" o espacios) en Descripcion, Barrio, UPZ y Valor
+    - 'proporcion_duplicados' de filas copiadas de otras filas del mismo bloque, además de
+      las repeticiones propias del remuestreo (~20%; el CSV original tiene ~37%)
+    """
+    if base is None:
+        base = pd.read_csv(RUTA_BASE, encoding="utf-8")
+    rng = np.random.default_rng(semilla)
+
+    df = base.iloc[rng.integers(len(base), size=n_filas)].reset_index(drop=True)
+
+    valor = df["Valor"].str.replace(r"\D", "", regex=True).astype("int64").to_numpy() * rng.lognormal(0, 0.1, n_filas)
+    df["Valor"] = _formato_monetario(np.maximum(np.round(valor, -6), 1_000_000).astype(np.int64))
+    df["Área"] = np.maximum((df["Área"].to_numpy() * rng.uniform(0.9, 1.1, n_filas)).round(), 1).astype(np.int64)
+
+    for col in ("Descripcion", "Barrio", "UPZ", "Valor"):
+        vacios = rng.random(n_filas) < proporcion_vacios
+        df[col] = df[col].astype(object)
+        df.loc[vacios, col] = rng.choice(["", " ", "   "], size=int(vacios.sum()))
+
+    duplicadas = np.flatnonzero(rng.random(n_filas) < proporcion_duplicados)
+    if len(duplicadas):
+        df.iloc[duplicadas] = df.iloc[rng.integers(n_filas, size=len(duplicadas))].to_numpy()
+
+    return df
+
+
+def escribir_inmuebles(ruta: str, n_filas: int, semilla: int = 0, **opciones) -> None:
+    """Escribe generar_inmuebles(n_filas) en un CSV, por bloques de FILAS_POR_BLOQUE."""
+    base = pd.read_csv(RUTA_BASE, encoding="utf-8")
+    escritas = 0
+    bloque = 0
+    while escritas < n_filas:
+        n = min(FILAS_POR_BLOQUE, n_filas - escritas)
+        df = generar_inmuebles(n, semilla=semilla + bloque, base=base, **opciones)
+        df.to_csv(ruta, mode="w" if bloque == 0 else "a", header=bloque == 0, index=False)
+        escritas += n
+        bloque += 1
+
+
+if __name__ == "__main__":
+    n = int(float(sys.argv[1]))
+    semilla = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    escribir_inmuebles(sys.argv[2], n, semilla)
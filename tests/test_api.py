@@ -0,0 +1,50 @@
+## API: /jobs limpia igual que /limpiar.
+
+import io
+import time
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+from fastapi.testclient import TestClient
+
+from api.main import app
+
+CUERPO = {
+    "config": {"estrategia_num": "median"},
+    "data": {
+        "barrio": ["Chapinero", "Suba", "Usaquén", "Suba", "Bosa", "Kennedy"],
+        # Tipos mezclados desde JSON: números, textos y nulos en la misma columna
+        "habitaciones": [3, "3", None, "n/d", 2, 4.0],
+        "area": [60, 45.5, None, 80, 52, 70],
+    },
+}
+
+
+def esperar(cliente: TestClient, id_trabajo: str, limite_s: float = 60) -> dict:
+    fin = time.monotonic() + limite_s
+    while time.monotonic() < fin:
+        trabajo = cliente.get(f"/jobs/{id_trabajo}").json()
+        if trabajo["estado"] != "pendiente":
+            return trabajo
+        time.sleep(0.05)
+    raise TimeoutError(id_trabajo)
+
+
+def test_jobs_igual_a_limpiar_con_columnas_mezcladas():
+    with TestClient(app) as cliente:
+        directo = cliente.post("/limpiar", params={"formato": "parquet"}, json=CUERPO)
+        reporte = cliente.post("/limpiar", json=CUERPO).json()
+
+        trabajo = esperar(cliente, cliente.post("/jobs", json=CUERPO).json()["id"])
+        assert trabajo["estado"] == "completado", trabajo["error"]
+        asincrono = cliente.get(f"/jobs/{trabajo['id']}/result", params={"formato": "parquet"})
+
+    esperado = pd.read_parquet(io.BytesIO(directo.content))
+    obtenido = pd.read_parquet(io.BytesIO(asincrono.content))
+    # El resultado de /jobs se relee de Arrow IPC: texto como large_string
+    pd.testing.assert_frame_equal(obtenido, esperado, check_dtype=False)
+    numericas = [pd.api.types.is_numeric_dtype(d) for d in esperado.dtypes]
+    assert [pd.api.types.is_numeric_dtype(d) for d in obtenido.dtypes] == numericas
+    assert trabajo["reporte"]["preview"] == reporte["preview"]
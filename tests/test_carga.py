@@ -0,0 +1,55 @@
+## leer_csv_limpieza lee lo mismo que pd.read_csv (tipos, nulos y valores), también
+# cuando una fila de un bloque posterior no cabe en el tipo inferido del primero.
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from limpieza import carga
+from limpieza.carga import leer_csv_limpieza
+
+pytest.importorskip("pyarrow")
+
+
+def escribir_csv(ruta, n: int = 2000, tardio: bool = False) -> str:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "ID": np.arange(n).astype(str),
+            "Area": rng.integers(30, 300, n).astype(str),
+            "Valor": [f"$ {v:,}" for v in rng.integers(100, 900, n) * 1_000_000],
+            "Latitud": np.round(rng.uniform(4.5, 4.8, n), 6),
+            "Piscina": rng.choice(["True", "False", ""], n),
+            "Publicado": pd.date_range("2024-01-01", periods=n, freq="h").strftime("%Y-%m-%d"),
+            "Descripcion": rng.choice(["Apto con balcón", "Casa", "NA", "None", ""], n),
+            "Vacia": [""] * n,
+        }
+    )
+    if tardio:
+        df.loc[n - 1, "Area"] = "3.5"
+        df.loc[n - 2, "ID"] = "n/d"
+    df.to_csv(ruta, index=False)
+    return str(ruta)
+
+
+@pytest.mark.parametrize("tardio", [False, True])
+@pytest.mark.parametrize("usar_hilos", [False, True])
+def test_igual_que_read_csv(tmp_path, monkeypatch, tardio, usar_hilos):
+    # Bloques pequeños: el tipo se fija con las primeras filas y el valor tardío obliga a releer
+    monkeypatch.setattr(carga, "TAMANO_BLOQUE", 4 << 10)
+    ruta = escribir_csv(tmp_path / "avisos.csv", tardio=tardio)
+
+    leido = leer_csv_limpieza(ruta, {"columnas_monetarias": ["valor"]}, usar_hilos=usar_hilos)
+    esperado = pd.read_csv(ruta, encoding="utf-8", dtype={"Valor": str})
+
+    pd.testing.assert_frame_equal(leido, esperado)
+
+
+def test_columnas_lectura(tmp_path):
+    ruta = escribir_csv(tmp_path / "avisos.csv", n=50)
+
+    leido = leer_csv_limpieza(ruta, {"columnas_lectura": ["area", "latitud"]})
+
+    pd.testing.assert_frame_equal(leido, pd.read_csv(ruta, usecols=["Area", "Latitud"]))
+    with pytest.raises(ValueError, match="precio"):
+        leer_csv_limpieza(ruta, {"columnas_lectura": ["precio"]})
@@ -0,0 +1,75 @@
+## Limpieza por bloques: mismo resultado que run() y un ajuste por fuente.
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from limpieza import DataCleaner
+
+
+def escribir_csv(ruta, n: int = 600, semilla: int = 0) -> str:
+    rng = np.random.default_rng(semilla)
+    df = pd.DataFrame(
+        {
+            "id": np.arange(n),
+            "activo": rng.choice(["True", "False", "true", "FALSE"], n),
+            "destacado": rng.choice(["True", "False", ""], n, p=[0.6, 0.3, 0.1]),
+            "tardio": [""] * (n // 2) + list(rng.choice(["True", "False"], n - n // 2)),
+            "valor": rng.integers(0, 100, n).astype(str),
+            "barrio": rng.choice(["Chapinero", "Usaquén", ""], n),
+        }
+    )
+    df.to_csv(ruta, index=False)
+    return str(ruta)
+
+
+@pytest.mark.parametrize("chunksize", [100, 1_000])
+def test_run_chunked_igual_a_run_con_booleanas(tmp_path, chunksize):
+    ruta = escribir_csv(tmp_path / "datos.csv")
+
+    esperado = DataCleaner().run(pd.read_csv(ruta))
+    por_bloques = pd.concat(DataCleaner().run_chunked(ruta, chunksize=chunksize))
+
+    assert esperado["activo"].dtype == bool
+    pd.testing.assert_frame_equal(por_bloques, esperado)
+
+
+def test_run_chunked_ajusta_cada_fuente(tmp_path):
+    primera = escribir_csv(tmp_path / "primera.csv", semilla=1)
+    segunda = tmp_path / "segunda.csv"
+    pd.DataFrame({"id": [1, 2, 3], "valor": ["1000", "", "3000"]}).to_csv(segunda, index=False)
+
+    cleaner = DataCleaner()
+    pd.concat(cleaner.run_chunked(primera, chunksize=100))
+    resultado = pd.concat(cleaner.run_chunked(segunda, chunksize=100))
+
+    assert cleaner.estado is None
+    pd.testing.assert_frame_equal(resultado, pd.concat(DataCleaner().run_chunked(segunda, chunksize=100)))
+    assert resultado["valor"].tolist() == [1000, 2000, 3000]
+
+
+def test_run_chunked_usa_el_estado_indicado(tmp_path):
+    primera = escribir_csv(tmp_path / "primera.csv", semilla=1)
+    segunda = tmp_path / "segunda.csv"
+    pd.DataFrame({"id": [1, 2, 3], "valor": ["1000", "", "3000"]}).to_csv(segunda, index=False)
+
+    estado = DataCleaner().fit_chunked(primera, chunksize=100)
+    resultado = pd.concat(DataCleaner(estado=estado).run_chunked(segunda, chunksize=100))
+
+    assert resultado["valor"].iloc[1] == estado.rellenos["valor"]
+
+
+def test_fit_chunked_mide_columnas_descartadas_por_muestreo(tmp_path):
+    # El bloque del medio es casi todo texto (el muestreo lo descarta), pero en total
+    # la columna supera el umbral: una pasada extra mide la conversión completa
+    n = 1_000
+    valores = [str(i) for i in range(6 * n)] + ["sin dato"] * n + [str(i) for i in range(6 * n)]
+    ruta = tmp_path / "datos.csv"
+    pd.DataFrame({"id": range(len(valores)), "valor": valores}).to_csv(ruta, index=False)
+
+    estado = DataCleaner().fit_chunked(ruta, chunksize=n)
+
+    assert "valor" in estado.convertir
+    pd.testing.assert_frame_equal(
+        pd.concat(DataCleaner().run_chunked(ruta, chunksize=n)), DataCleaner().run(pd.read_csv(ruta))
+    )
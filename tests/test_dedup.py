@@ -0,0 +1,59 @@
+## Índice de duplicados entre lotes: solo se registran los lotes que terminan bien.
+
+import pandas as pd
+import pytest
+
+from limpieza import DataCleaner, cleaner, paralelo
+from limpieza.dedup import IndiceDedup
+
+
+def lote(inicio: int, n: int = 1_200) -> pd.DataFrame:
+    return pd.DataFrame({"id": range(inicio, inicio + n), "barrio": ["Chapinero", "Suba", None] * (n // 3)})
+
+
+def falla(*args, **kwargs):
+    raise MemoryError("sin memoria")
+
+
+@pytest.fixture
+def indice(tmp_path):
+    return IndiceDedup(tmp_path / "dedup.idx")
+
+
+@pytest.fixture(autouse=True)
+def fragmentos_pequenos(monkeypatch):
+    monkeypatch.setattr(paralelo, "FILAS_MINIMAS_POR_FRAGMENTO", 500)
+
+
+def test_lote_repetido_se_descarta(indice):
+    DataCleaner(indice_dedup=indice).run(lote(0))
+
+    assert len(DataCleaner(indice_dedup=indice).run(lote(0))) == 0
+    assert len(DataCleaner(indice_dedup=indice).run(lote(600))) == 600
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_run_fallido_no_registra_filas(indice, monkeypatch, n_jobs):
+    config = {"n_jobs": n_jobs, "compacto": True}
+
+    with monkeypatch.context() as m:
+        # La última etapa (después de descartar vistos) falla
+        m.setattr(cleaner, "compactar_tipos", falla)
+        with pytest.raises(MemoryError):
+            DataCleaner(config, indice_dedup=indice).run(lote(0))
+
+    assert len(indice) == 0
+    assert len(DataCleaner(config, indice_dedup=indice).run(lote(0))) == 1_200
+    assert len(indice) == 1_200
+
+
+def test_transform_fallido_no_registra_filas(indice, monkeypatch):
+    ajustado = DataCleaner(indice_dedup=indice)
+    ajustado.fit(lote(0))
+
+    with monkeypatch.context() as m:
+        m.setattr(cleaner, "aplicar_estado", falla)
+        with pytest.raises(MemoryError):
+            ajustado.transform(lote(0))
+
+    assert len(ajustado.transform(lote(0))) == 1_200
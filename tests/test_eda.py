@@ -0,0 +1,73 @@
+## EDA por bloques: las mismas cifras que ejecutar_eda sobre el DataFrame completo
+# (exactas o, con columnas de muchos valores distintos, dentro del error del sketch).
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from eda.eda import calcular_histograma, ejecutar_eda_por_bloques, resumir_csv
+
+
+def escribir_csv(ruta, n: int = 20_000) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    area = np.round(rng.lognormal(4.5, 0.6, n), 2)
+    df = pd.DataFrame(
+        {
+            "habitaciones": rng.integers(1, 6, n),
+            "area": area,
+            "valor": np.round(area * rng.normal(5e6, 5e5, n), -3),
+            "barrio": rng.choice(["Chapinero", "Usaquén", "Suba", "Kennedy"], n, p=[0.4, 0.3, 0.2, 0.1]),
+        }
+    )
+    df.loc[rng.choice(n, 500, replace=False), "area"] = np.nan
+    df.loc[rng.choice(n, 300, replace=False), "barrio"] = np.nan
+    df.to_csv(ruta, index=False)
+    return pd.read_csv(ruta)
+
+
+def test_resumen_igual_que_pandas(tmp_path):
+    df = escribir_csv(tmp_path / "avisos.csv")
+
+    resumen = resumir_csv(tmp_path / "avisos.csv", chunksize=3000)
+
+    assert resumen.n_filas == len(df)
+    pd.testing.assert_series_equal(resumen.dtypes, df.dtypes)
+    pd.testing.assert_series_equal(resumen.nulos, df.isna().sum())
+    for col in resumen.numericas:
+        pd.testing.assert_series_equal(resumen.describir(col), df[col].describe(), rtol=1e-9)
+        # Menos de 100.000 valores distintos: el histograma p1–p99 es el mismo
+        conteos, bordes = resumen.histograma(col)
+        esperado_conteos, esperado_bordes = calcular_histograma(df[col])
+        np.testing.assert_array_equal(conteos, esperado_conteos)
+        np.testing.assert_allclose(bordes, esperado_bordes)
+    pd.testing.assert_series_equal(resumen.valores_frecuentes("barrio"), df["barrio"].value_counts(dropna=False))
+    pd.testing.assert_frame_equal(resumen.correlacion(), df[resumen.numericas].corr(), rtol=1e-9)
+
+
+def test_histograma_con_sketch_cerca_del_exacto(tmp_path):
+    df = escribir_csv(tmp_path / "avisos.csv", n=100_000)
+    area = df["area"].dropna().to_numpy()
+
+    # Con pocos valores exactos, cuartiles del sketch KLL e histograma de bins finos
+    resumen = resumir_csv(tmp_path / "avisos.csv", chunksize=7000, max_exactos=1000)
+
+    q25, q50, q75 = resumen.describir("area")[["25%", "50%", "75%"]]
+    for q, valor in zip([0.25, 0.5, 0.75], [q25, q50, q75]):
+        assert abs(np.mean(area <= valor) - q) < 0.01
+
+    conteos, bordes = resumen.histograma("area")
+    bajo, alto = bordes[0], bordes[-1]
+    esperado, _ = np.histogram(area[(area >= bajo) & (area <= alto)], bins=bordes)
+    assert conteos.sum() == pytest.approx(esperado.sum(), rel=1e-3)
+    np.testing.assert_allclose(conteos, esperado, rtol=0.03, atol=5)
+
+
+def test_ejecutar_eda_por_bloques_imprime_el_reporte(tmp_path, capsys):
+    escribir_csv(tmp_path / "avisos.csv", n=2000)
+
+    resumen = ejecutar_eda_por_bloques(str(tmp_path / "avisos.csv"), graficar=False, chunksize=500)
+
+    salida = capsys.readouterr().out
+    assert resumen.n_filas == 2000
+    for seccion in ["INFORMACIÓN GENERAL", "VALORES NULOS", "VARIABLES NUMÉRICAS", "MATRIZ DE CORRELACIÓN"]:
+        assert seccion in salida
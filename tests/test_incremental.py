@@ -0,0 +1,56 @@
+## Limpieza incremental: una ejecución fallida no deja filas registradas como vistas.
+
+import pandas as pd
+import pytest
+
+from limpieza import incremental
+from limpieza.incremental import limpiar_incremental
+
+
+def escribir(ruta, inicio: int, n: int, modo: str = "w") -> None:
+    df = pd.DataFrame(
+        {
+            "id": range(inicio, inicio + n),
+            "barrio": ["Chapinero", "Usaquén", "Suba"] * (n // 3) + ["Suba"] * (n % 3),
+            "area": [str(40 + i % 50) for i in range(n)],
+        }
+    )
+    df.to_csv(ruta, mode=modo, header=modo == "w", index=False)
+
+
+@pytest.mark.parametrize("salida", ["limpio.csv", "partes"])
+def test_reintento_despues_de_un_fallo_no_pierde_filas(tmp_path, monkeypatch, salida):
+    ruta = tmp_path / "avisos.csv"
+    salida = tmp_path / salida
+    checkpoint = tmp_path / "avisos.checkpoint.json"
+
+    escribir(ruta, 0, 300)
+    limpiar_incremental(ruta, salida, checkpoint, chunksize=100)
+    escribir(ruta, 300, 300, modo="a")
+
+    # La salida falla después de limpiar (y escribir) el primer bloque de la cola
+    original = pd.DataFrame.to_csv if salida.suffix == ".csv" else incremental.a_tabla
+    llamadas = {"n": 0}
+
+    def falla_en_el_segundo(*args, **kwargs):
+        llamadas["n"] += 1
+        if llamadas["n"] == 2:
+            raise OSError("disco lleno")
+        return original(*args, **kwargs)
+
+    with monkeypatch.context() as m:
+        if salida.suffix == ".csv":
+            m.setattr(pd.DataFrame, "to_csv", falla_en_el_segundo)
+        else:
+            m.setattr(incremental, "a_tabla", falla_en_el_segundo)
+        with pytest.raises(OSError):
+            limpiar_incremental(ruta, salida, checkpoint, chunksize=100)
+
+    reporte = limpiar_incremental(ruta, salida, checkpoint, chunksize=100)
+
+    assert reporte.filas_escritas == 300
+    if salida.suffix == ".csv":
+        escritas = pd.read_csv(salida)
+    else:
+        escritas = pd.concat(pd.read_parquet(parte) for parte in sorted(salida.glob("parte-*.parquet")))
+    assert sorted(escritas["id"]) == list(range(600))
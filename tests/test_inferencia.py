@@ -0,0 +1,51 @@
+## Inferencia por muestreo: mismo resultado que medir cada columna completa.
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from limpieza.inferencia import decidir_por_muestreo
+from limpieza.pipeline import a_numerico, convertir_a_numerico_seguro
+
+UMBRAL = 0.85
+
+
+def lote_texto(n: int = 2_000) -> pd.DataFrame:
+    return pd.DataFrame({"x": [f"texto {i}" for i in range(n)]})
+
+
+def lote_con_proporcion(semilla: int, minimo: float, maximo: float, n: int = 2_000) -> pd.DataFrame:
+    """Columna 'x' con una proporción de valores numéricos entre minimo y maximo."""
+    rng = np.random.default_rng(semilla)
+    numericos = rng.random(n) < rng.uniform(minimo, maximo)
+    valores = np.where(numericos, rng.integers(0, 1_000, n).astype(str), "n/d")
+    return pd.DataFrame({"x": valores})
+
+
+def limpiar(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    convertir_a_numerico_seguro(df, umbral_conversion=UMBRAL)
+    return df
+
+
+def limpiar_sin_muestreo(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    convertido = a_numerico(df["x"])
+    if convertido.notna().mean() >= UMBRAL:
+        df["x"] = convertido
+    return df
+
+
+@pytest.mark.parametrize("semilla", range(20))
+@pytest.mark.parametrize("rango", [(0.0, 0.3), (0.8, 0.9), (0.95, 1.0)])
+def test_muestreo_igual_a_columna_completa(semilla, rango):
+    lote = lote_con_proporcion(semilla, *rango)
+    pd.testing.assert_frame_equal(limpiar(lote), limpiar_sin_muestreo(lote))
+
+
+def test_decisiones_claras_con_la_muestra():
+    assert decidir_por_muestreo(lote_texto()["x"], UMBRAL, a_numerico) is False
+    assert decidir_por_muestreo(pd.Series([str(i) for i in range(5_000)]), UMBRAL, a_numerico) is True
+    # Cerca del umbral o con pocas filas hay que medir la columna completa
+    assert decidir_por_muestreo(lote_con_proporcion(0, 0.86, 0.87)["x"], UMBRAL, a_numerico) is None
+    assert decidir_por_muestreo(lote_texto(100)["x"], UMBRAL, a_numerico) is None
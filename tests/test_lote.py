@@ -0,0 +1,82 @@
+## Limpieza en lote: un solo esquema en el dataset y ninguna parte de un archivo con error.
+
+import pandas as pd
+import pytest
+
+from limpieza import lote
+from limpieza.lote import limpiar_archivo, limpiar_lote
+from limpieza.schemas import LimpiezaConfigSchema
+
+pytest.importorskip("pyarrow")
+
+
+def escribir(ruta, areas: list[str]) -> str:
+    n = len(areas)
+    pd.DataFrame(
+        {
+            "Tipo": ["Casa", "Apartamento"] * (n // 2) + ["Casa"] * (n % 2),
+            "UPZ": ["CHAPINERO: Pardo Rubio", "Usaquén", "SUBA: Niza"] * (n // 3) + ["Usaquén"] * (n % 3),
+            "Area": areas,
+        }
+    ).to_csv(ruta, index=False)
+    return str(ruta)
+
+
+def partes(salida) -> list:
+    return sorted(p.relative_to(salida) for p in salida.rglob("*.parquet"))
+
+
+@pytest.mark.parametrize("casi_duplicados", [None, "marcar"])
+def test_archivos_con_tipos_distintos_dan_un_dataset_legible(tmp_path, casi_duplicados):
+    enteros = escribir(tmp_path / "enteros.csv", [str(40 + i) for i in range(300)])
+    decimales = escribir(tmp_path / "decimales.csv", [f"{40 + i}.5" for i in range(300)])
+    salida = tmp_path / "dataset"
+    config = LimpiezaConfigSchema(casi_duplicados=casi_duplicados)
+
+    reporte, resultados = limpiar_lote([enteros, decimales], config, salida, procesos=2, chunksize=100)
+
+    assert all(not isinstance(r, str) for r in resultados.values()), resultados
+    leido = pd.read_parquet(salida)
+    assert len(leido) == reporte.n_filas_salida == 600
+    assert sorted(leido["area"]) == sorted([40.0 + i for i in range(300)] + [40.5 + i for i in range(300)])
+    assert not list(salida.glob("_parcial-*"))
+
+
+def test_archivo_con_columnas_distintas_se_reporta_como_error(tmp_path):
+    bueno = escribir(tmp_path / "bueno.csv", [str(40 + i) for i in range(30)])
+    otro = tmp_path / "otro.csv"
+    pd.DataFrame({"Tipo": ["Casa"], "UPZ": ["Usaquén"], "Precio": ["1"]}).to_csv(otro, index=False)
+    salida = tmp_path / "dataset"
+
+    _, resultados = limpiar_lote([bueno, str(otro)], LimpiezaConfigSchema(), salida, procesos=1)
+
+    assert not isinstance(resultados[bueno], str)
+    assert "columnas distintas" in resultados[str(otro)]
+    assert len(pd.read_parquet(salida)) == 30
+
+
+def test_archivo_con_error_no_deja_partes(tmp_path, monkeypatch):
+    ruta = escribir(tmp_path / "avisos.csv", [str(40 + i) for i in range(300)])
+    salida = tmp_path / "dataset"
+    salida.mkdir()
+
+    original = lote._escribir_particiones
+    llamadas = {"n": 0}
+
+    def falla_en_el_segundo(*args, **kwargs):
+        llamadas["n"] += 1
+        if llamadas["n"] == 2:
+            raise OSError("disco lleno")
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(lote, "_escribir_particiones", falla_en_el_segundo)
+    with pytest.raises(OSError):
+        limpiar_archivo(ruta, LimpiezaConfigSchema(), str(salida), chunksize=100)
+    assert list(salida.iterdir()) == []
+
+    # Sin el fallo, el mismo archivo se publica completo
+    monkeypatch.setattr(lote, "_escribir_particiones", original)
+    limpiar_archivo(ruta, LimpiezaConfigSchema(), str(salida), chunksize=100)
+    assert len(pd.read_parquet(salida)) == 300
+    assert partes(salida)
+    assert not list(salida.glob("_parcial-*"))
@@ -0,0 +1,57 @@
+## Ejecución con n_jobs: mismo resultado que la ejecución serial.
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from limpieza import DataCleaner
+from limpieza import paralelo
+
+
+def datos(n: int = 3_000, semilla: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(semilla)
+    # 'mixta' queda justo sobre el umbral (0,85) y 'codigo' es texto con algunos números
+    mixta = np.where(rng.random(n) < 0.9, rng.integers(0, 50, n).astype(str), "n/d")
+    df = pd.DataFrame(
+        {
+            "Tipo": rng.choice(["Casa", "Apartamento", ""], n),
+            "Valor": [f"$ {v:,}".replace(",", ".") for v in rng.integers(100, 900, n) * 1_000],
+            "Mixta": mixta,
+            "Codigo": np.where(rng.random(n) < 0.2, "123", "ab-" + rng.integers(0, 9, n).astype(str)),
+            "Area": rng.integers(30, 200, n).astype(float),
+        }
+    )
+    df.loc[rng.random(n) < 0.05, "Area"] = np.nan
+    # Duplicados que cruzan fragmentos
+    return pd.concat([df, df.iloc[::7]], ignore_index=True)
+
+
+@pytest.fixture(autouse=True)
+def fragmentos_pequenos(monkeypatch):
+    monkeypatch.setattr(paralelo, "FILAS_MINIMAS_POR_FRAGMENTO", 500)
+
+
+@pytest.mark.parametrize("n_jobs", [2, 3])
+@pytest.mark.parametrize("backend", ["numpy", "arrow"])
+def test_run_con_n_jobs_igual_a_serial(n_jobs, backend):
+    df = datos()
+    config = {"columnas_monetarias": ["valor"], "backend": backend}
+
+    esperado = DataCleaner(config).run(df)
+    obtenido = DataCleaner({**config, "n_jobs": n_jobs}).run(df)
+
+    assert esperado["mixta"].dtype.kind == "f"
+    pd.testing.assert_frame_equal(obtenido, esperado)
+
+
+def test_fit_y_transform_con_n_jobs_igual_a_serial():
+    df = datos(semilla=1)
+    config = {"columnas_monetarias": ["valor"]}
+
+    serial = DataCleaner(config)
+    estado = serial.fit(df)
+    en_paralelo = DataCleaner({**config, "n_jobs": 2})
+
+    excluir = {"id", "config"}
+    assert en_paralelo.fit(df).model_dump(exclude=excluir) == estado.model_dump(exclude=excluir)
+    pd.testing.assert_frame_equal(en_paralelo.transform(df), serial.transform(df))